@@ -28,8 +28,6 @@ if __name__ == "__main__":
 	from utilities import errors
 	from utilities import audio_player
 	
-	mention_spammers = []
-	
 	@client.listen()
 	async def on_ready():
 		# data = await client.http.get(client.http.GATEWAY + "/bot")
@@ -69,35 +67,18 @@ if __name__ == "__main__":
 	async def on_guild_join(guild):
 		clients.create_folder(clients.data_path + "/server_data/{}".format(guild.id))
 		clients.create_file("server_data/{}/settings".format(guild.id), content = {"anti-spam": False, "respond_to_bots": False})
-		me = discord.utils.get(client.get_all_members(), id = clients.client.owner_id)
-		await client.send_embed(me, None, title = "Joined Server", timestamp = guild.created_at, thumbnail_url = guild.icon_url, fields = (("Name", guild.name), ("ID", guild.id), ("Owner", str(guild.owner)), ("Members", str(guild.member_count)), ("Server Region", str(guild.region))))
+		await client.send_embed(client.owner, None, title = "Joined Server", timestamp = guild.created_at, thumbnail_url = guild.icon_url, fields = (("Name", guild.name), ("ID", guild.id), ("Owner", str(guild.owner)), ("Members", str(guild.member_count)), ("Server Region", str(guild.region))))
 		clean_name = re.sub(r"[\|/\\:\?\*\"<>]", "", guild.name) # | / \ : ? * " < >
 		clients.create_file("server_data/{}/{}".format(guild.id, clean_name))
 	
 	@client.listen()
 	async def on_guild_remove(guild):
-		me = discord.utils.get(client.get_all_members(), id = clients.client.owner_id)
-		await client.send_embed(me, None, title = "Left Server", timestamp = guild.created_at, thumbnail_url = guild.icon_url, fields = (("Name", guild.name), ("ID", guild.id), ("Owner", str(guild.owner)), ("Members", str(guild.member_count)), ("Server Region", str(guild.region))))
+		await client.send_embed(client.owner, None, title = "Left Server", timestamp = guild.created_at, thumbnail_url = guild.icon_url, fields = (("Name", guild.name), ("ID", guild.id), ("Owner", str(guild.owner)), ("Members", str(guild.member_count)), ("Server Region", str(guild.region))))
 	
 	@client.listen()
 	async def on_command(ctx):
-		with open(clients.data_path + "/stats.json", 'r') as stats_file:
-			stats = json.load(stats_file)
-		stats["commands_executed"] += 1
-		stats["commands_usage"][ctx.command.name] = stats["commands_usage"].get(ctx.command.name, 0) + 1
-		with open(clients.data_path + "/stats.json", 'w') as stats_file:
-			json.dump(stats, stats_file, indent = 4)
-		clients.create_folder(clients.data_path + "/user_data/{}".format(ctx.author.id))
-		clients.create_file("user_data/{}/stats".format(ctx.author.id), content = {"commands_executed": 0, "points": 0, "respects_paid": 0})
+		client.stats.command_executed(ctx)
 		# TODO: Transfer respects paid data?
-		clean_name = re.sub(r"[\|/\\:\?\*\"<>]", "", ctx.author.name) # | / \ : ? * " < >
-		clients.create_file("user_data/{}/{}".format(ctx.author.id, clean_name))
-		with open(clients.data_path + "/user_data/{}/stats.json".format(ctx.author.id), "r") as stats_file:
-			stats = json.load(stats_file)
-		stats["commands_executed"] += 1
-		stats["points"] += 1
-		with open(clients.data_path + "/user_data/{}/stats.json".format(ctx.author.id), 'w') as stats_file:
-			json.dump(stats, stats_file, indent = 4)
 	
 	# TODO: log message edits
 	
@@ -105,29 +86,20 @@ if __name__ == "__main__":
 	async def on_message(message):
 		
 		# Log message
-		log_entry = "{0.created_at}: [{0.id}] {0.author.display_name} ({0.author}) ({0.author.id}) in ".format(message)
-		if isinstance(message.channel, discord.DMChannel):
-			log_entry += "Direct Message"
-		else:
-			log_entry += "#{0.channel.name} ({0.channel.id}) [{0.guild.name} ({0.guild.id})]".format(message)
-		log_entry += f": {message.content} {[embed.to_dict() for embed in message.embeds]}"
-		logging.chat_logger.info(log_entry)
+		logging.chat_logger.info(logging.chat_log_entry(message))
+		
+		# Skip plain chat before building a Context
+		if not client.message_filter.relevant(message):
+			return
 		
 		# Get Context
 		ctx = await client.get_context(message)
 		
 		# Server specific settings
 		if message.guild is not None:
-			try:
-				with open(clients.data_path + "/server_data/{}/settings.json".format(message.guild.id), 'r') as settings_file:
-					data = json.load(settings_file)
-			except FileNotFoundError:
-				# TODO: Handle/Fix, create new file with default settings
-				data = {}
-			if data.get("anti-spam") and len(message.mentions) > 10:
-				global mention_spammers
-				if message.author.id in mention_spammers:
-					# TODO: Handle across different servers
+			settings = client.guild_settings.get(message.guild.id)
+			if settings.anti_spam and len(message.mentions) > settings.mention_spam_threshold:
+				if client.mention_spam_tracker.offend(message.guild.id, message.author.id, settings.mention_spam_window):
 					if message.guild.me.permissions_in(message.channel).kick_members:
 						# TODO: Check hierarchy, if able to kick
 						await ctx.author.send("You were kicked from {} for spamming mentions".format(message.guild))
@@ -137,10 +109,7 @@ if __name__ == "__main__":
 						await ctx.send("I need permission to kick members from the server to enforce anti-spam")
 				else:
 					await ctx.embed_reply(":warning: You will be kicked if you continue spamming mentions")
-					mention_spammers.append(message.author.id)
-					await asyncio.sleep(3600)
-					mention_spammers.remove(message.author.id)
-			if not data.get("respond_to_bots") and message.author.bot:
+			if not settings.respond_to_bots and message.author.bot:
 				return
 		
 		# Invoke Commands
@@ -148,15 +117,7 @@ if __name__ == "__main__":
 		
 		# Forward DMs
 		if isinstance(message.channel, discord.DMChannel) and message.channel.recipient.id != ctx.bot.owner_id:
-			me = discord.utils.get(ctx.bot.get_all_members(), id = ctx.bot.owner_id)
-			if message.author == ctx.bot.user:
-				try:
-					await me.send("To {0.channel.recipient}: {0.content}".format(message), embed = message.embeds[0] if message.embeds else None)
-				except discord.HTTPException:
-					# TODO: use textwrap/paginate
-					await me.send("To {0.channel.recipient}: `DM too long to forward`".format(message))
-			else:
-				await me.send("From {0.author}: {0.content}".format(message), embed = message.embeds[0] if message.embeds else None)
+			ctx.bot.dm_forward_queue.put(message)
 		
 		# Ignore own and blank messages
 		if message.author == ctx.bot.user or not message.content:
@@ -190,7 +151,7 @@ if __name__ == "__main__":
 					await ctx.embed_reply(f"Units, {unit1} and/or {unit2}, not found\nSee the conversions command")
 					return
 				await ctx.embed_reply(f"{value} {unit1} = {converted_value} {unit2}")
-				
+		
 		# help or prefix/es DM or mention
 		elif (message.content.lower() in ("help", "prefix", "prefixes") and isinstance(message.channel, discord.DMChannel)) or ctx.me.mention in message.content and message.content.replace(ctx.me.mention, "").strip().lower() in ("help", "prefix", "prefixes"):
 			try:
@@ -207,9 +168,10 @@ if __name__ == "__main__":
 		# Chatbot
 		elif message.content.startswith(ctx.me.mention):
 			content = message.clean_content.replace('@' + ctx.me.display_name, "", 1).strip()
-			aiml_response = ctx.bot.aiml_kernel.respond(content, sessionID = message.author.id)
-			# TODO: Handle brain not loaded?
-			if aiml_response:
+			aiml_response = await ctx.bot.aiml_brain.respond(content, message.author.id)
+			if ctx.bot.aiml_brain.warming_up:
+				await ctx.embed_reply(":hourglass: I'm still warming up, try again in a moment", attempt_delete = False)
+			elif aiml_response:
 				await ctx.embed_reply(aiml_response, attempt_delete = False)
 			else:
 				games_cog = ctx.bot.get_cog("Games")
@@ -268,13 +230,18 @@ if __name__ == "__main__":
 			await ctx.embed_reply(":no_entry: You don't have permission to use that command here")
 		elif isinstance(error, commands.BadArgument):
 			await ctx.embed_reply(":no_entry: Error: Invalid Input: {}".format(error))
+		elif isinstance(error, errors.SDKTimeout):
+			await ctx.embed_reply(f":no_entry: Error: The request to {error} timed out")
+		elif isinstance(error, errors.ServiceUnavailable):
+			await ctx.embed_reply(f":no_entry: Error: {error} is unavailable right now")
 		elif isinstance(error, commands.CommandInvokeError) and isinstance(error.original, discord.HTTPException) and error.original.code == 50034:
 			await ctx.embed_reply(":no_entry: Error: You can only bulk delete messages that are under 14 days old")
 		# TODO: check embed links permission
 		elif isinstance(error, commands.CommandInvokeError) and isinstance(error.original, (discord.Forbidden)):
 			print("{0.bot.console_message_prefix}Missing Permissions for {0.command.name} in #{0.channel.name} in {0.guild.name}".format(ctx))
 		else:
-			ctx.bot.sentry_client.captureException(exc_info = (type(error), error, error.__traceback__))
+			if ctx.bot.sentry_client:
+				ctx.bot.sentry_client.captureException(exc_info = (type(error), error, error.__traceback__))
 			print("Ignoring exception in command {}".format(ctx.command), file = sys.stderr)
 			traceback.print_exception(type(error), error, error.__traceback__, file = sys.stderr)
 			logging.errors_logger.error("Uncaught exception\n", exc_info = (type(error), error, error.__traceback__))
@@ -309,7 +276,8 @@ if __name__ == "__main__":
 			discord.opus._lib = opus
 		# Start web server
 		client.loop.run_until_complete(client.aiohttp_app_runner.setup())
-		client.aiohttp_site = web.TCPSite(client.aiohttp_app_runner, port = 80)
+		## Each cluster on its own port
+		client.aiohttp_site = web.TCPSite(client.aiohttp_app_runner, port = 80 + client.cluster.id)
 		client.loop.run_until_complete(client.aiohttp_site.start())
 		# Can't bind to/open port 80 without being root on Linux
 		# Try port >1024? or sudo? for CI
@@ -3,14 +3,17 @@ import discord
 from discord.ext import commands
 
 import asyncio
+import concurrent.futures
 import datetime
+import functools
 import json
 import os
 import random
 import sys
+import threading
+import time
 from urllib import parse
 
-import aiml
 import aiohttp
 from aiohttp import web
 import asyncpg
@@ -26,9 +29,31 @@ import tweepy
 import wolframalpha
 from wordnik import swagger, WordApi, WordsApi
 
+from utilities.aiml_brain import AIMLBrain
+from utilities.audio_cache import AudioCache
+from utilities.audio_prefetcher import AudioPrefetcher
+from utilities.cog_loader import CogLoader
 from utilities.context import Context
+from utilities.database import Repository
+from utilities.document_store import DocumentStore
 from utilities import errors
+from utilities.executors import ExecutorGateway
 from utilities.help_formatter import CustomHelpFormatter
+from utilities.http_client import CachingHTTPClient
+from utilities.ipc import IPCClient
+from utilities.listing_stats import ListingStatsUpdater
+from utilities.loop_monitor import LoopMonitor
+from utilities.message_filter import MessageFilter
+from utilities.metrics import CommandMetrics
+from utilities.permissions import PermissionIndex
+from utilities.prefixes import PrefixResolver
+from utilities import rate_limiter
+from utilities.send_queue import SendQueue
+from utilities.settings import SettingsCache
+from utilities.sharding import Cluster, RemoteChannel
+from utilities.spam_tracker import MentionSpamTracker
+from utilities.stats import StatsAggregator
+from utilities.ytdl_resolver import YTDLResolver
 
 # TODO: Relocate as Bot variables
 beta = any("beta" in arg.lower() for arg in sys.argv)
@@ -39,6 +64,7 @@ wait_time = 15.0
 code_block = "```\n{}\n```"  # Moved, update all references to
 py_code_block = "```py\n{}\n```"  # Moved, update all references to
 online_time = datetime.datetime.utcnow()
+cluster = Cluster.from_environment()  # Set by launcher.py when sharded
 inflect_engine = inflect.engine()  # Moved, update all references to
 
 # TODO: Already moved to Bot constants, update all references to
@@ -48,7 +74,7 @@ bot_color = discord.Color.blurple()
 # TODO: Move to Harmonbot.py
 dotenv.load_dotenv()
 
-class Bot(commands.Bot):
+class Bot(commands.AutoShardedBot if cluster.sharded else commands.Bot):
 	
 	def __init__(self, command_prefix):
 		
@@ -72,8 +98,10 @@ class Bot(commands.Bot):
 		# Initialization
 		help_formatter = CustomHelpFormatter(self.bot_color)
 		activity = discord.Streaming(name = random.choice(self.game_statuses), url = self.stream_url)
+		sharding = {"shard_ids": cluster.shard_ids, "shard_count": cluster.shard_count} if cluster.sharded else {}
 		super().__init__(command_prefix = command_prefix, formatter = help_formatter, 
-							activity = activity, case_insensitive = True)
+							activity = activity, case_insensitive = True, **sharding)
+		self.cluster = cluster
 		
 		# Constants
 		## Custom
@@ -84,6 +112,8 @@ class Bot(commands.Bot):
 		self.changelog = "https://discord.gg/a2rbZPu"
 		self.console_line_limit = 167
 		self.console_message_prefix = "Discord Harmonbot: "
+		if self.cluster.sharded:
+			self.console_message_prefix = f"Discord Harmonbot (Cluster {self.cluster.id}): "
 		self.data_path = "data/beta" if beta else "data"
 		self.fake_ip = "nice try"
 		self.fake_location = "Fort Yukon, Alaska"
@@ -111,12 +141,72 @@ class Bot(commands.Bot):
 		self.cache_channel = None
 		self.listener_bot = None  # User object
 		self.listing_sites = {}
-		# TODO: Include owner variable for user object?
+		self.owner = None  # User object
+		
+		# DMs forwarded to the owner
+		self.dm_forward_queue = SendQueue(self.loop, self.forward_direct_message, name = "DM forward queue", 
+											console_message_prefix = self.console_message_prefix)
 		
 		# Variables
 		self.session_commands_executed = 0
 		self.session_commands_usage = {}
 		
+		# PostgreSQL database connection
+		self.db = self.database = self.database_connection_pool = None
+		self.connected_to_database = asyncio.Event()
+		self.connected_to_database.set()
+		self.loop.create_task(self.connect_to_database())
+		## Initialized, and prefixes, guild settings, and permissions loaded, on start
+		self.repository = Repository(self)
+		
+		# JSON document store
+		self.document_store = DocumentStore(self.loop)
+		
+		# Prefixes
+		self.prefix_resolver = PrefixResolver(self.repository)
+		self.message_filter = MessageFilter(self)
+		
+		# Guild settings
+		self.guild_settings = SettingsCache(self.repository)
+		self.mention_spam_tracker = MentionSpamTracker()
+		
+		# Inter-process communication with other clusters
+		self.ipc = None
+		if self.cluster.ipc_port:
+			self.ipc = IPCClient(self.loop, self.cluster.id, port = self.cluster.ipc_port, 
+									console_message_prefix = self.console_message_prefix)
+			self.ipc.handlers.update({"cog_action": self.ipc_cog_action, "counts": self.ipc_counts, 
+										"merge_stats": self.ipc_merge_stats, 
+										"schedule_listing_stats": self.ipc_schedule_listing_stats, 
+										"stats": self.ipc_stats})
+			self.ipc.start()
+		
+		# Stats
+		## Secondary clusters forward stats to the primary cluster
+		forward_stats = self.forward_stats if self.ipc and not self.cluster.primary else None
+		self.stats = StatsAggregator(self.loop, self.data_path, self.repository, forward = forward_stats)
+		
+		# Command metrics
+		self.command_metrics = CommandMetrics()
+		
+		# Outbound HTTP rate limits
+		self.rate_limiter = rate_limiter.RateLimiter(self.loop)
+		
+		# Audio cache shared by players, per cluster, as files missing from a cluster's index are removed
+		audio_cache_path = self.data_path + "/audio_cache"
+		if self.cluster.sharded:
+			audio_cache_path += f"/cluster_{self.cluster.id}"
+		self.audio_cache = AudioCache(self.loop, audio_cache_path, console_message_prefix = self.console_message_prefix)
+		# Audio prefetching for the next queued tracks
+		self.audio_prefetcher = AudioPrefetcher(self.loop, self.audio_cache.release, 
+												console_message_prefix = self.console_message_prefix)
+		
+		# Event loop lag monitor
+		self.loop_monitor = LoopMonitor(self.loop, console_message_prefix = self.console_message_prefix)
+		
+		# Permissions
+		self.permission_index = PermissionIndex(self.repository)
+		
 		# Credentials
 		for credential in ("BATTLE_NET_API_KEY", "BATTLERITE_API_KEY", 
 							"BING_SPELL_CHECK_API_SUBSCRIPTION_KEY", "CLARIFAI_API_KEY", "CLEVERBOT_API_KEY", 
@@ -138,38 +228,26 @@ class Bot(commands.Bot):
 			self.POSTGRES_HOST = "localhost"
 		self.DATABASE_HOST = self.POSTGRES_HOST
 		
+		# Executor pools for synchronous third-party SDK calls
+		self.executors = ExecutorGateway(self.loop)
+		
+		# youtube_dl metadata
+		self.ytdl_resolver = YTDLResolver(self.loop, self.executors["youtube_dl"])
+		
 		# External Clients
-		## Clarifai
-		try:
-			self.clarifai_app = clarifai.rest.ClarifaiApp(api_key = self.CLARIFAI_API_KEY)
-		except clarifai.errors.ApiError as e:
-			print(f"{self.console_message_prefix}Failed to initialize Clarifai App: "
-					f"{e.response.status_code} {e.response.reason}: {e.error_desc} ({e.error_details})")
-		## Imgur
-		try:
-			self.imgur_client = imgurpython.ImgurClient(self.IMGUR_CLIENT_ID, self.IMGUR_CLIENT_SECRET)
-		except imgurpython.helpers.error.ImgurClientError as e:
-			print(f"{self.console_message_prefix}Failed to initialize Imgur Client: {e}")
-		## Open Weather Map
-		self.owm_client = pyowm.OWM(self.OWM_API_KEY)
-		## Sentry (Raven)
-		self.sentry_client = self.raven_client = raven.Client(self.SENTRY_DSN)
-		## Twitter
-		self.twitter_auth = tweepy.OAuthHandler(self.TWITTER_CONSUMER_KEY, self.TWITTER_CONSUMER_SECRET)
-		self.twitter_auth.set_access_token(self.TWITTER_ACCESS_TOKEN, self.TWITTER_ACCESS_TOKEN_SECRET)
-		self.twitter_api = tweepy.API(self.twitter_auth)
-		## Wolfram Alpha
-		self.wolfram_alpha_client = wolframalpha.Client(self.WOLFRAM_ALPHA_APP_ID)
-		## Wordnik
-		try:
-			self.wordnik_client = swagger.ApiClient(self.WORDNIK_API_KEY, "http://api.wordnik.com/v4")
-			self.wordnik_word_api = WordApi.WordApi(self.wordnik_client)
-			self.wordnik_words_api = WordsApi.WordsApi(self.wordnik_client)
-		except Exception as e:
-			print(f"{self.console_message_prefix}Failed to initialize Wordnik Client: {e}")
+		## Initialized in parallel, as some make requests on initialization
+		## Clients that fail or time out are marked degraded instead of blocking startup
+		self.clarifai_app = self.imgur_client = self.owm_client = None
+		self.sentry_client = self.raven_client = None
+		self.twitter_auth = self.twitter_api = None
+		self.wolfram_alpha_client = None
+		self.wordnik_client = self.wordnik_word_api = self.wordnik_words_api = None
+		self.external_client_ready_times = {}
+		self.degraded_clients = {}  # Client name: reason
+		self.external_clients_lock = threading.Lock()
+		self.initialize_external_clients()
 		
 		# AIML Kernel
-		self.aiml_kernel = aiml.Kernel()
 		## https://code.google.com/archive/p/aiml-en-us-foundation-alice/wikis/BotProperties.wiki
 		self.aiml_predicates = {"age": '2', "baseballteam": "Ports", "birthday": "February 10, 2016", 
 								"birthplace": "Harmon's computer", "botmaster": "owner", "build": self.version, 
@@ -193,27 +271,19 @@ class Bot(commands.Bot):
 		### Add? arch, boyfriend, city, dailyclients, developers, email, favoriteartist, favoriteband, 
 		### favoritequestion, favoritesong, hair, hockeyteam, kindmusic, nclients, ndevelopers, 
 		### orientation, party, president, question, religion, state, totalclients
-		for predicate, value in self.aiml_predicates.items():
-			self.aiml_kernel.setBotPredicate(predicate, value)
-		if os.path.isfile(data_path + "/aiml/aiml_brain.brn"):
-			self.aiml_kernel.bootstrap(brainFile = data_path + "/aiml/aiml_brain.brn")
-		elif os.path.isfile(data_path + "/aiml/std-startup.xml"):
-			self.aiml_kernel.bootstrap(learnFiles = data_path + "/aiml/std-startup.xml", commands = "load aiml b")
-			self.aiml_kernel.saveBrain(data_path + "/aiml/aiml_brain.brn")
+		## Loaded in the background on ready
+		self.aiml_brain = AIMLBrain(self.loop, data_path + "/aiml", self.aiml_predicates, 
+										console_message_prefix = self.console_message_prefix)
+		self.aiml_kernel = self.aiml_brain.kernel
 		
 		# Inflect engine
 		self.inflect_engine = inflect.engine()
 		
-		# PostgreSQL database connection
-		self.db = self.database = self.database_connection_pool = None
-		self.connected_to_database = asyncio.Event()
-		self.connected_to_database.set()
-		self.loop.create_task(self.connect_to_database())
-		
 		# HTTP Web Server
 		self.aiohttp_web_app = web.Application()
 		self.aiohttp_web_app.add_routes([web.get('/', self.web_server_get_handler), 
-										web.post('/', self.web_server_post_handler)])
+										web.post('/', self.web_server_post_handler), 
+										web.get('/metrics', self.web_server_metrics_handler)])
 		self.aiohttp_app_runner = web.AppRunner(self.aiohttp_web_app)
 		self.aiohttp_site = None  # Initialized when starting web server
 		
@@ -228,17 +298,82 @@ class Bot(commands.Bot):
 		self.remove_command("help")
 		
 		# Load cogs
-		for file in sorted(os.listdir("cogs")):
-			if file.endswith(".py") and not file.startswith(("images", "info", "random", "reactions")):
-				self.load_extension("cogs." + file[:-3])
-		self.load_extension("cogs.images")
-		self.load_extension("cogs.info")
-		self.load_extension("cogs.random")
-		self.load_extension("cogs.reactions")
+		# In lazy mode, cogs in the manifest without listeners or background tasks are loaded on first use
+		self.cog_loader = CogLoader(self, self.data_path + "/cog_manifest.json", 
+									eager = ("cogs." + cog for cog in ("audio", "blobs", "images", "info", "location", 
+																		"meta", "random", "reactions", "resources", "search")))
+		extensions = ["cogs." + file[:-3] for file in sorted(os.listdir("cogs")) 
+						if file.endswith(".py") and not file.startswith(("images", "info", "random", "reactions"))]
+		extensions.extend(("cogs.images", "cogs.info", "cogs.random", "cogs.reactions"))
+		self.cog_loader.load_all(extensions, lazy = os.getenv("LAZY_COGS", "").lower() in ("1", "true"))
+		print(f"{self.console_message_prefix}{self.cog_loader.report()}")
 		# TODO: Document inter-cog dependencies/subcommands
-		# TODO: Catch exceptions on fail to load?
 		# TODO: Move all to on_ready?
 	
+	def initialize_external_clients(self, timeout = 10.0):
+		initializers = {"Clarifai": self.initialize_clarifai, "Imgur": self.initialize_imgur, 
+						"Open Weather Map": self.initialize_owm, "Sentry": self.initialize_sentry, 
+						"Twitter": self.initialize_twitter, "Wolfram Alpha": self.initialize_wolfram_alpha, 
+						"Wordnik": self.initialize_wordnik}
+		executor = concurrent.futures.ThreadPoolExecutor(max_workers = len(initializers), 
+															thread_name_prefix = "ExternalClient")
+		start = time.perf_counter()
+		futures = {}
+		for name, initializer in initializers.items():
+			future = futures[name] = executor.submit(initializer)
+			future.add_done_callback(functools.partial(self.external_client_initialized, name, start))
+		concurrent.futures.wait(futures.values(), timeout = timeout)
+		with self.external_clients_lock:
+			for name, future in futures.items():
+				if not future.done():
+					self.degraded_clients[name] = f"Timed out after {timeout}s"
+					print(f"{self.console_message_prefix}{name} client initialization timed out after {timeout}s")
+		# Timed out initializations finish in the background
+		executor.shutdown(wait = False)
+		print(f"{self.console_message_prefix}Initialized {len(initializers) - len(self.degraded_clients)}/"
+				f"{len(initializers)} external clients in {time.perf_counter() - start:.2f}s")
+	
+	def external_client_initialized(self, name, start, future):
+		with self.external_clients_lock:
+			self.external_client_ready_times[name] = time.perf_counter() - start
+			exception = future.exception()
+			if exception:
+				self.degraded_clients[name] = f"{type(exception).__name__}: {exception}"
+				print(f"{self.console_message_prefix}Failed to initialize {name} client: {exception}")
+			else:
+				self.degraded_clients.pop(name, None)
+	
+	def initialize_clarifai(self):
+		try:
+			self.clarifai_app = clarifai.rest.ClarifaiApp(api_key = self.CLARIFAI_API_KEY)
+		except clarifai.errors.ApiError as e:
+			raise RuntimeError(f"{e.response.status_code} {e.response.reason}: "
+								f"{e.error_desc} ({e.error_details})") from None
+	
+	def initialize_imgur(self):
+		self.imgur_client = imgurpython.ImgurClient(self.IMGUR_CLIENT_ID, self.IMGUR_CLIENT_SECRET)
+	
+	def initialize_owm(self):
+		self.owm_client = pyowm.OWM(self.OWM_API_KEY)
+	
+	def initialize_sentry(self):
+		self.sentry_client = self.raven_client = raven.Client(self.SENTRY_DSN)
+	
+	def initialize_twitter(self):
+		twitter_auth = tweepy.OAuthHandler(self.TWITTER_CONSUMER_KEY, self.TWITTER_CONSUMER_SECRET)
+		twitter_auth.set_access_token(self.TWITTER_ACCESS_TOKEN, self.TWITTER_ACCESS_TOKEN_SECRET)
+		self.twitter_api = tweepy.API(twitter_auth)
+		self.twitter_auth = twitter_auth
+	
+	def initialize_wolfram_alpha(self):
+		self.wolfram_alpha_client = wolframalpha.Client(self.WOLFRAM_ALPHA_APP_ID)
+	
+	def initialize_wordnik(self):
+		wordnik_client = swagger.ApiClient(self.WORDNIK_API_KEY, "http://api.wordnik.com/v4")
+		self.wordnik_word_api = WordApi.WordApi(wordnik_client)
+		self.wordnik_words_api = WordsApi.WordsApi(wordnik_client)
+		self.wordnik_client = wordnik_client
+	
 	async def connect_to_database(self):
 		if self.database_connection_pool:
 			return
@@ -252,6 +387,12 @@ class Bot(commands.Bot):
 		else:
 			await self.connected_to_database.wait()
 	
+	async def start(self, *args, **kwargs):
+		# Loaded before connecting, so no messages are handled without them
+		await self.repository.initialize_database()
+		await asyncio.gather(self.prefix_resolver.load(), self.guild_settings.load(), self.permission_index.load())
+		await super().start(*args, **kwargs)
+	
 	async def web_server_get_handler(self, request):
 		'''
 		async for line in request.content:
@@ -298,34 +439,62 @@ class Bot(commands.Bot):
 		else:
 			return web.Response(status = 400)  # Return 400 Bad Request
 	
+	async def web_server_metrics_handler(self, request):
+		metrics = (self.command_metrics.render() + self.rate_limiter.render() + self.audio_cache.render() + 
+					self.audio_prefetcher.render() + self.ytdl_resolver.render())
+		return web.Response(body = metrics.encode("UTF-8"), 
+							headers = {"Content-Type": "text/plain; version=0.0.4; charset=utf-8"})
+	
 	async def on_ready(self):
+		if not self.aiml_brain.ready:
+			self.loop.create_task(self.aiml_brain.load())
 		self.application_info_data = await self.application_info()
+		self.owner = self.get_user(self.application_info_data.owner.id) or self.application_info_data.owner
 		self.cache_channel = self.get_channel(self.cache_channel_id)
 		self.listener_bot = await self.get_user_info(self.listener_id)
+		# Counts: payload key: ListingStatsUpdater count
 		self.listing_sites = {"discord.bots.gg": {"name": "Discord Bots", "token": self.DISCORD_BOTS_GG_API_TOKEN, 
 													"url": f"https://discord.bots.gg/api/v1/bots/{self.user.id}/stats", 
-													"data": {"guildCount": len(self.guilds)}, 
-													"guild_count_name": "guildCount"}, 
+													"counts": {"guildCount": "guilds"}}, 
 								"discordbots.org": {"name": "Discord Bot List", "token": self.DISCORDBOTS_ORG_API_KEY, 
 													"url": f"https://discordbots.org/api/bots/{self.user.id}/stats", 
-													"data": {"server_count": len(self.guilds)}, 
-													"guild_count_name": "server_count"}, 
+													"counts": {"server_count": "guilds"}}, 
 								"discordbotlist.com": {"name": "Discord Bot List", 
 														"token": f"Bot {self.DISCORDBOTLIST_COM_API_TOKEN}", 
 														"url": f"https://discordbotlist.com/api/bots/{self.user.id}/stats", 
-														"data": {"guilds": len(self.guilds)}, 
-														"guild_count_name": "guilds"}}
-		# TODO: Add users and voice_connections for discordbotlist.com
-		await self.update_all_listing_stats()
+														"counts": {"guilds": "guilds", "users": "users", 
+																	"voice_connections": "voice_connections"}}}
+		self.listing_stats.schedule(delay = 0)
 	
 	async def on_resumed(self):
 		print(f"{self.console_message_prefix}resumed @ {datetime.datetime.now().time().isoformat()}")
 	
 	async def on_guild_join(self, guild):
-		await self.update_all_listing_stats()
+		self.listing_stats.schedule()
 	
 	async def on_guild_remove(self, guild):
-		await self.update_all_listing_stats()
+		self.listing_stats.schedule()
+		self.permission_index.invalidate(guild.id)
+	
+	async def on_member_update(self, before, after):
+		if before.roles != after.roles:
+			self.permission_index.invalidate_member(after.guild.id, after.id)
+		if after.id == self.owner_id:
+			self.owner = self.get_user(after.id) or self.owner
+	
+	async def on_user_update(self, before, after):
+		if after.id == self.owner_id:
+			self.owner = after
+	
+	async def on_member_remove(self, member):
+		self.permission_index.invalidate_member(member.guild.id, member.id)
+	
+	async def on_guild_role_update(self, before, after):
+		if before.position != after.position:
+			self.permission_index.invalidate_roles(after.guild.id)
+	
+	async def on_guild_role_delete(self, role):
+		self.permission_index.invalidate_roles(role.guild.id)
 	
 	# TODO: on_command_completion
 	# TODO: optimize
@@ -348,84 +517,165 @@ class Bot(commands.Bot):
 			embed.add_field(name = field_name, value = field_value)
 		return destination.send(embed = embed)
 	
+	def get_feed_channel(self, id):
+		'''
+		Channel for feed announcements, which may be in a guild on another cluster
+		When sharded, unknown IDs, including deleted channels, can't be told apart from channels on other clusters,
+		so sending to the channel can raise discord.NotFound
+		'''
+		channel = self.get_channel(id)
+		if channel is None and self.cluster.sharded:
+			return RemoteChannel(self, id)
+		return channel
+	
+	async def forward_stats(self, stats, users):
+		users = {user_id: [name, dict(deltas)] for user_id, (name, deltas) in users.items()}
+		# Raises if not connected, so the stats are merged back and retried on the next flush
+		await self.ipc.send("merge_stats", stats = stats, users = users)
+	
+	async def global_stats(self):
+		'''Stats, from the primary cluster if this is a secondary cluster'''
+		if self.ipc and not self.cluster.primary:
+			responses = await self.ipc.request("stats")
+			if 0 in responses:
+				return responses[0]
+		return self.stats.stats
+	
+	# IPC handlers
+	
+	async def ipc_cog_action(self, action, cog):
+		try:
+			self.run_cog_action(action, cog)
+		except Exception as e:
+			return f"{type(e).__name__}: {e}"
+	
+	async def ipc_counts(self):
+		return self.listing_stats.local_counts()
+	
+	async def ipc_merge_stats(self, stats, users):
+		if self.cluster.primary:
+			self.stats.merge(stats, users)
+	
+	async def ipc_schedule_listing_stats(self):
+		self.listing_stats.schedule()
+	
+	async def ipc_stats(self):
+		return self.stats.stats if self.cluster.primary else None
+	
+	async def forward_direct_message(self, message):
+		if not self.owner:
+			return
+		embed = message.embeds[0] if message.embeds else None
+		if message.author == self.user:
+			try:
+				await self.owner.send("To {0.channel.recipient}: {0.content}".format(message), embed = embed)
+			except discord.HTTPException:
+				# TODO: use textwrap/paginate
+				await self.owner.send("To {0.channel.recipient}: `DM too long to forward`".format(message))
+		else:
+			await self.owner.send("From {0.author}: {0.content}".format(message), embed = embed)
+	
 	async def attempt_delete_message(self, message):
 		try:
 			await message.delete()
 		except (discord.Forbidden, discord.NotFound):
 			pass
 	
+	def get_cog(self, name):
+		# Deferred cogs are loaded when looked up, e.g. by cogs adding subcommands to their commands
+		return super().get_cog(name) or self.cog_loader.deferred_cog(name)
+	
 	# Override Context class
 	async def get_context(self, message, *, cls = Context):
 		ctx = await super().get_context(message, cls = cls)
 		return ctx
 	
+	async def invoke(self, ctx):
+		# Same as commands.Bot.invoke, timing the command and recording its outcome
+		if ctx.command is None:
+			if ctx.invoked_with:
+				self.dispatch("command_error", ctx, commands.CommandNotFound(f"Command \"{ctx.invoked_with}\" is not found"))
+			return
+		self.dispatch("command", ctx)
+		# Outbound requests made by the command are queued per guild
+		rate_limiter.current_owner.set(ctx.guild.id if ctx.guild else ctx.channel.id)
+		measurement = self.command_metrics.start()
+		self.loop_monitor.command_started(ctx.command.qualified_name)
+		try:
+			if await self.can_run(ctx, call_once = True):
+				await ctx.command.invoke(ctx)
+				outcome = "success"
+			else:
+				outcome = "check_failure"
+		except commands.CommandError as e:
+			outcome = "check_failure" if isinstance(e, commands.CheckFailure) else "error"
+			self.command_metrics.finish(measurement, ctx.command, outcome)
+			await ctx.command.dispatch_error(ctx, e)
+		else:
+			self.command_metrics.finish(measurement, ctx.command, outcome)
+			self.dispatch("command_completion", ctx)
+		finally:
+			self.loop_monitor.command_finished()
+	
 	# TODO: Case-Insensitive subcommands (override Group)
 	
-	# Update stats on sites listing Discord bots
-	async def update_listing_stats(self, site):
-		site = self.listing_sites.get(site)
-		if not site:
-			# TODO: Print/log error
-			return "Site not found"
-		token = site["token"]
-		if not token:
-			# TODO: Print/log error
-			return "Site token not found"
-		url = site["url"]
-		headers = {"authorization": token, "content-type": "application/json"}
-		site["data"][site["guild_count_name"]] = len(self.guilds)
-		# TODO: Add users and voice_connections for discordbotlist.com
-		data = json.dumps(site["data"])
-		async with aiohttp_session.post(url, headers = headers, data = data) as resp:
-			if resp.status == 204:
-				return "204 No Content"
-			return await resp.text()
-	
-	# Update stats on all sites listing Discord bots
-	async def update_all_listing_stats(self):
-		for site in self.listing_sites:
-			await self.update_listing_stats(site)
+	def run_cog_action(self, action, cog):
+		'''Load, unload, or reload a cog in this process'''
+		if action in ("unload", "reload"):
+			self.cog_loader.unload("cogs." + cog)
+		if action in ("load", "reload"):
+			self.cog_loader.load("cogs." + cog)
+			self.cog_loader.write_manifest()
+	
+	async def run_cog_action_on_other_clusters(self, action, cog):
+		'''Returns a summary of the results, or an empty string if there are no other clusters'''
+		if not self.ipc:
+			return ""
+		responses = await self.ipc.request("cog_action", action = action, cog = cog)
+		failures = {cluster_id: error for cluster_id, error in responses.items() if error}
+		summary = f"\nOther clusters: {len(responses) - len(failures)}/{self.cluster.count - 1}"
+		for cluster_id, error in sorted(failures.items()):
+			summary += f"\nCluster {cluster_id}: {error}"
+		return summary
 	
 	@commands.group(invoke_without_command = True)
 	@commands.is_owner()
 	async def load(self, ctx, cog : str):
 		'''Load cog'''
 		try:
-			self.load_extension("cogs." + cog)
+			self.run_cog_action("load", cog)
 		except Exception as e:
 			await ctx.embed_reply(f":thumbsdown::skin-tone-2: Failed to load `{cog}` cog\n{type(e).__name__}: {e}")
 		else:
-			await ctx.embed_reply(f":thumbsup::skin-tone-2: Loaded `{cog}` cog :gear:")
+			clusters = await self.run_cog_action_on_other_clusters("load", cog)
+			await ctx.embed_reply(f":thumbsup::skin-tone-2: Loaded `{cog}` cog :gear:{clusters}")
 	
 	@commands.command(name = "aiml", aliases = ["brain"])
 	@commands.is_owner()
 	async def load_aiml(self, ctx):
 		'''Load AIML'''
-		for predicate, value in self.aiml_predicates.items():
-			self.aiml_kernel.setBotPredicate(predicate, value)
-		if os.path.isfile(data_path + "/aiml/aiml_brain.brn"):
-			self.aiml_kernel.bootstrap(brainFile = data_path + "/aiml/aiml_brain.brn")
-		elif os.path.isfile(data_path + "/aiml/std-startup.xml"):
-			self.aiml_kernel.bootstrap(learnFiles = data_path + "/aiml/std-startup.xml", commands = "load aiml b")
-			self.aiml_kernel.saveBrain(data_path + "/aiml/aiml_brain.brn")
-		await ctx.embed_reply(":ok_hand::skin-tone-2: Loaded AIML")
+		if await self.aiml_brain.load():
+			await ctx.embed_reply(":ok_hand::skin-tone-2: Loaded AIML")
+		else:
+			await ctx.embed_reply(":thumbsdown::skin-tone-2: Failed to load AIML\nSee the console for details")
 	
 	@commands.group(invoke_without_command = True)
 	@commands.is_owner()
 	async def unload(self, ctx, cog : str):
 		'''Unload cog'''
 		try:
-			self.unload_extension("cogs." + cog)
+			self.run_cog_action("unload", cog)
 		except Exception as e:
 			await ctx.embed_reply(f":thumbsdown::skin-tone-2: Failed to unload `{cog}` cog\n{type(e).__name__}: {e}")
 		else:
-			await ctx.embed_reply(f":ok_hand::skin-tone-2: Unloaded `{cog}` cog :gear:")
+			clusters = await self.run_cog_action_on_other_clusters("unload", cog)
+			await ctx.embed_reply(f":ok_hand::skin-tone-2: Unloaded `{cog}` cog :gear:{clusters}")
 	
 	@commands.command(name = "aiml", aliases = ["brain"])
 	@commands.is_owner()
 	async def unload_aiml(self, ctx):
 		'''Unload AIML'''
-		self.aiml_kernel.resetBrain()
+		await self.aiml_brain.unload()
 		await ctx.embed_reply(":ok_hand::skin-tone-2: Unloaded AIML")
 	
 	@commands.command()
@@ -433,18 +683,13 @@ class Bot(commands.Bot):
 	async def reload(self, ctx, cog : str):
 		'''Reload cog'''
 		try:
-			self.unload_extension("cogs." + cog)
-			self.load_extension("cogs." + cog)
+			self.run_cog_action("reload", cog)
 		except Exception as e:
 			await ctx.embed_reply(f":thumbsdown::skin-tone-2: Failed to reload `{cog}` cog\n{type(e).__name__}: {e}")
 		else:
-			# TODO: self.stats
-			with open(data_path + "/stats.json", 'r') as stats_file:
-				stats = json.load(stats_file)
-			stats["cogs_reloaded"] += 1
-			with open(data_path + "/stats.json", 'w') as stats_file:
-				json.dump(stats, stats_file, indent = 4)
-			await ctx.embed_reply(f":thumbsup::skin-tone-2: Reloaded `{cog}` cog :gear:")
+			self.stats.increment("cogs_reloaded")
+			clusters = await self.run_cog_action_on_other_clusters("reload", cog)
+			await ctx.embed_reply(f":thumbsup::skin-tone-2: Reloaded `{cog}` cog :gear:{clusters}")
 
 
 # Create folders
@@ -471,19 +716,20 @@ def create_file(filename, *, content = {}):
 create_file("prefixes")
 
 def get_prefix(bot, message):
-	with open(data_path + "/prefixes.json", 'r') as prefixes_file:
-		all_prefixes = json.load(prefixes_file)
 	if isinstance(message.channel, discord.DMChannel):
-		prefixes = all_prefixes.get(str(message.channel.id), None)
+		return bot.prefix_resolver.get(message.channel.id)
 	else:
-		prefixes = all_prefixes.get(str(message.guild.id), None)
-	return prefixes if prefixes else '!'
+		return bot.prefix_resolver.get(message.guild.id)
 
 
 # Initialize client + aiohttp client session
 
 client = Bot(command_prefix = get_prefix)
-aiohttp_session = aiohttp.ClientSession(loop = client.loop)
+aiohttp_session = aiohttp.ClientSession(loop = client.loop, trace_configs = [client.command_metrics.trace_config, 
+																client.rate_limiter.trace_config])
+http_client = client.http_client = CachingHTTPClient(aiohttp_session, database_path = data_path + "/http_cache.db", 
+														rate_limiter = client.rate_limiter)
+listing_stats = client.listing_stats = ListingStatsUpdater(client, aiohttp_session)
 # TODO: Move ^ to Bot
 
 
@@ -491,11 +737,7 @@ aiohttp_session = aiohttp.ClientSession(loop = client.loop)
 
 async def restart_tasks(channel_id):
 	# Increment restarts counter
-	with open(data_path + "/stats.json", 'r') as stats_file:
-		stats = json.load(stats_file)
-	stats["restarts"] += 1
-	with open(data_path + "/stats.json", 'w') as stats_file:
-		json.dump(stats, stats_file, indent = 4)
+	client.stats.increment("restarts")
 	# Save restart text channel + voice channels
 	audio_cog = client.get_cog("Audio")
 	voice_channels = audio_cog.save_voice_channels() if audio_cog else []
@@ -506,18 +748,32 @@ async def shutdown_tasks():
 	# Cancel audio tasks
 	audio_cog = client.get_cog("Audio")
 	if audio_cog: audio_cog.cancel_all_tasks()
+	# Stop forwarding DMs
+	client.dm_forward_queue.stop()
 	# Close aiohttp session
 	await aiohttp_session.close()
-	# Close database connection
-	await client.database_connection_pool.close()
 	# Stop web server
 	await client.aiohttp_app_runner.cleanup()
 	# Save uptime
-	with open(data_path + "/stats.json", 'r') as stats_file:
-		stats = json.load(stats_file)
-	now = datetime.datetime.utcnow()
-	uptime = now - online_time
-	stats["uptime"] += uptime.total_seconds()
-	with open(data_path + "/stats.json", 'w') as stats_file:
-		json.dump(stats, stats_file, indent = 4)
+	if client.cluster.primary:
+		now = datetime.datetime.utcnow()
+		uptime = now - online_time
+		client.stats.increment("uptime", uptime.total_seconds())
+	# Flush stats
+	try:
+		await client.stats.stop()
+	except Exception as e:
+		# e.g. not connected to the IPC broker or database, but the rest of shutdown should still run
+		print(f"{client.console_message_prefix}Failed to flush stats: {type(e).__name__}: {e}")
+	# Close database connection, after user stats are flushed to it
+	await client.database_connection_pool.close()
+	# Disconnect from other clusters
+	if client.ipc:
+		await client.ipc.stop()
+	# Flush JSON documents
+	client.document_store.task.cancel()
+	await client.document_store.flush_all()
+	# Write queued log records, as the log writer's atexit handler doesn't run with os._exit
+	from modules import logging
+	logging.stop()
 
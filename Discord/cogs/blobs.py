@@ -32,12 +32,8 @@ class Blobs:
 	
 	def __init__(self, bot):
 		self.bot = bot
-		clients.create_file("blobs", content = {})
-		clients.create_file("blob_stats", content = {})
-		with open(clients.data_path + "/blob_stats.json", 'r') as stats_file:
-			self.stats = json.load(stats_file)
-		with open(clients.data_path + "/blobs.json", 'r') as blobs_file:
-			self.data = json.load(blobs_file)
+		self.stats = self.bot.document_store.open(clients.data_path + "/blob_stats.json")
+		self.data = self.bot.document_store.open(clients.data_path + "/blobs.json")
 		self.generate_reference()
 	
 	def generate_reference(self):
@@ -64,8 +60,7 @@ class Blobs:
 		await ctx.embed_reply(None, title = blob, image_url = self.reference[blob])
 		if blob not in self.stats: self.stats[blob] = {}
 		self.stats[blob][str(ctx.author.id)] = self.stats[blob].get(str(ctx.author.id), 0) + 1
-		with open(clients.data_path + "/blob_stats.json", 'w') as stats_file:
-			json.dump(self.stats, stats_file, indent = 4)
+		self.stats.mark_dirty()
 	
 	@blobs.command(aliases = ["edit"])
 	@commands.is_owner()
@@ -73,8 +68,7 @@ class Blobs:
 		'''Add or edit a blob'''
 		self.data[name] = [image_url, aliases]
 		self.generate_reference()
-		with open(clients.data_path + "/blobs.json", 'w') as blobs_file:
-			json.dump(self.data, blobs_file, indent = 4)
+		self.data.mark_dirty()
 		await ctx.embed_reply("Blob added/edited")
 	
 	@blobs.command(aliases = ["details"])
@@ -95,8 +89,7 @@ class Blobs:
 		'''Remove a blob'''
 		del self.data[name]
 		self.generate_reference()
-		with open(clients.data_path + "/blobs.json", 'w') as blobs_file:
-			json.dump(self.data, blobs_file, indent = 4)
+		self.data.mark_dirty()
 		await ctx.embed_reply("Blob removed")
 	
 	@blobs.command(name = "stats")
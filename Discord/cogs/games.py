@@ -57,9 +57,7 @@ class Games:
 		# Necessary for maze generation
 		sys.setrecursionlimit(5000)
 		
-		clients.create_file("trivia_points")
-		with open(clients.data_path + "/trivia_points.json", 'r') as trivia_file:
-			self.trivia_stats = json.load(trivia_file)
+		self.trivia_stats = self.bot.document_store.open(clients.data_path + "/trivia_points.json")
 	
 	# Adventure
 	
@@ -1291,8 +1289,7 @@ class Games:
 						self.trivia_stats[str(trivia_player.id)][2] -= bets[trivia_player]
 						trivia_bets_output += trivia_player.display_name + " lost $" + utilities.add_commas(bets[trivia_player]) + " and now has $" + utilities.add_commas(self.trivia_stats[str(trivia_player.id)][2]) + ". "
 				trivia_bets_output = trivia_bets_output[:-1]
-			with open(clients.data_path + "/trivia_points.json", 'w') as trivia_file:
-				json.dump(self.trivia_stats, trivia_file, indent = 4)
+			self.trivia_stats.mark_dirty()
 			await ctx.embed_say("The answer was `{}`".format(BeautifulSoup(html.unescape(data["answer"]), "html.parser").get_text().replace("\\'", "'")), footer_text = correct_players_output)
 			if bet and trivia_bets_output:
 				await ctx.embed_say(trivia_bets_output)
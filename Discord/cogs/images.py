@@ -44,13 +44,15 @@ class Images:
 		await ctx.invoke(ctx.bot.get_command("help"), ctx.invoked_with)
 	
 	@image.command(name = "color", aliases = ["colour"])
+	@checks.external_client_available("Clarifai")
 	async def image_color(self, ctx, image_url : str):
 		'''
 		Image color density values
 		and the closest W3C color name for each identified color
 		'''
 		try:
-			response = self.bot.clarifai_app.public_models.color_model.predict_by_url(image_url)
+			response = await self.bot.executors.run("clarifai", self.bot.clarifai_app.public_models.color_model.predict_by_url, 
+													image_url)
 		except clarifai.rest.ApiError as e:
 			return await ctx.embed_reply(f":no_entry: Error: `{e.response.json()['outputs'][0]['status']['details']}`")
 		if response["status"]["description"] != "Ok":
@@ -81,10 +83,12 @@ class Images:
 		# TODO: handle 403 daily limit exceeded error
 	
 	@image.command(name = "recognition")
+	@checks.external_client_available("Clarifai")
 	async def image_recognition(self, ctx, image_url : str):
 		'''Image recognition'''
 		try:
-			response = self.bot.clarifai_app.public_models.general_model.predict_by_url(image_url)
+			response = await self.bot.executors.run("clarifai", self.bot.clarifai_app.public_models.general_model.predict_by_url, 
+													image_url)
 		except clarifai.rest.ApiError as e:
 			return await ctx.embed_reply(f":no_entry: Error: `{e.response.json()['outputs'][0]['status']['details']}`")
 		if response["status"]["description"] != "Ok":
@@ -123,6 +127,7 @@ class Images:
 		await ctx.invoke(self.bot.get_command("help"), ctx.invoked_with)
 	
 	@imgur.command(name = "upload")
+	@checks.external_client_available("Imgur")
 	async def imgur_upload(self, ctx, url : str = ""):
 		'''Upload images to Imgur'''
 		if not (url or ctx.message.attachments):
@@ -130,29 +135,32 @@ class Images:
 			return
 		image = url or ctx.message.attachments[0].url
 		try:
-			await ctx.embed_reply(self.bot.imgur_client.upload_from_url(image)["link"])
+			await ctx.embed_reply((await self.bot.executors.run("imgur", self.bot.imgur_client.upload_from_url, image))["link"])
 		except imgurpython.helpers.error.ImgurClientError as e:
 			await ctx.embed_reply(":no_entry: Error: {}".format(e))
 	
 	@imgur.command(name = "search")
+	@checks.external_client_available("Imgur")
 	async def imgur_search(self, ctx, *, search : str):
 		'''Search images on Imgur'''
-		result = self.bot.imgur_client.gallery_search(search, sort = "top")
+		result = await self.bot.executors.run("imgur", self.bot.imgur_client.gallery_search, search, sort = "top")
 		if not result:
 			await ctx.embed_reply(":no_entry: No results found")
 			return
 		result = result[0]
 		if result.is_album:
-			result = self.bot.imgur_client.get_album(result.id).images[0]
+			result = (await self.bot.executors.run("imgur", self.bot.imgur_client.get_album, result.id)).images[0]
 			await ctx.embed_reply(image_url = result["link"])
 		else:
 			await ctx.embed_reply(image_url = result.link)
 	
 	@commands.command()
+	@checks.external_client_available("Clarifai")
 	async def nsfw(self, ctx, image_url : str):
 		'''NSFW recognition'''
 		try:
-			response = self.bot.clarifai_app.public_models.nsfw_model.predict_by_url(image_url)
+			response = await self.bot.executors.run("clarifai", self.bot.clarifai_app.public_models.nsfw_model.predict_by_url, 
+													image_url)
 		except clarifai.rest.ApiError as e:
 			await ctx.embed_reply(":no_entry: Error: `{}`".format(e.response.json()["outputs"][0]["status"]["details"]))
 			return
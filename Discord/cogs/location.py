@@ -35,7 +35,7 @@ class Location:
 		'''Information about a country'''
 		# TODO: subcommands for other options to search by (e.g. capital)
 		url = "https://restcountries.eu/rest/v2/name/" + country
-		async with clients.aiohttp_session.get(url) as resp:
+		async with clients.http_client.get(url) as resp:
 			if resp.status == 400:
 				await ctx.embed_reply(":no_entry: Error")
 				return
@@ -149,7 +149,7 @@ class Location:
 		'''Convert geographic coordinates to addresses'''
 		url = "https://maps.googleapis.com/maps/api/geocode/json"
 		params = {"latlng": f"{latitude},{longitude}", "key": ctx.bot.GOOGLE_API_KEY}
-		async with clients.aiohttp_session.get(url, params = params) as resp:
+		async with clients.http_client.get(url, params = params) as resp:
 			data = await resp.json()
 		if data["status"] == "ZERO_RESULTS":
 			await ctx.embed_reply(":no_entry: Address/Location not found")
@@ -214,11 +214,12 @@ class Location:
 	
 	@commands.command()
 	@checks.not_forbidden()
+	@checks.external_client_available("Open Weather Map")
 	async def weather(self, ctx, *, location : str):
 		'''Weather'''
 		# wunderground?
 		try:
-			observation = self.bot.owm_client.weather_at_place(location)
+			observation = await self.bot.executors.run("owm", self.bot.owm_client.weather_at_place, location)
 		except (pyowm.exceptions.api_response_error.NotFoundError, 
 				pyowm.exceptions.api_call_error.BadGatewayError) as e:
 			# TODO: Catch base exceptions?
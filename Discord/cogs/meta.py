@@ -9,11 +9,11 @@ import copy
 import ctypes
 import difflib
 import inspect
-import json
 import os
 import random
 import subprocess
 import sys
+import timeit
 import traceback
 
 import git
@@ -21,8 +21,11 @@ import pkg_resources  # from setuptools
 import psutil
 
 import clients
+from modules import logging
 from modules import utilities
 from utilities import checks
+from utilities.message_filter import read_chat_log
+from utilities.settings import GuildSettings
 
 def setup(bot):
 	bot.add_cog(Meta(bot))
@@ -31,7 +34,6 @@ class Meta:
 	
 	def __init__(self, bot):
 		self.bot = bot
-		clients.create_file("stats", content = {"uptime" : 0, "restarts" : 0, "cogs_reloaded" : 0, "commands_executed" : 0, "commands_usage": {}, "reaction_responses": 0})
 		self.command_not_found = "No command called `{}` found"
 	
 	@commands.group(aliases = ["commands"], hidden = True, invoke_without_command = True)
@@ -46,7 +48,8 @@ class Meta:
 		if len(commands) == 0:
 			embed = discord.Embed(title = "Categories", color = ctx.bot.bot_color)
 			embed.set_author(name = ctx.author.display_name, icon_url = ctx.author.avatar_url)
-			embed.description = "  ".join("`{}`".format(category) for category in sorted(self.bot.cogs, key = str.lower))
+			categories = set(self.bot.cogs) | set(self.bot.cog_loader.deferred_cogs)
+			embed.description = "  ".join("`{}`".format(category) for category in sorted(categories, key = str.lower))
 			embed.add_field(name = "For more info:", value = "`{0}{1} [category]`\n`{0}{1} [command]`\n`{0}{1} [command] [subcommand]`".format(ctx.prefix, ctx.invoked_with))
 			embed.add_field(name = "Also see:", value = "`{0}about`\n`{0}{1} other`".format(ctx.prefix, ctx.invoked_with)) # stats?
 			embed.add_field(name = "For all commands:", value = "`{}{} all`".format(ctx.prefix, ctx.invoked_with), inline = False)
@@ -58,8 +61,8 @@ class Meta:
 		
 		if len(commands) == 1:
 			name = _mention_pattern.sub(repl, commands[0])
-			if name in self.bot.cogs:
-				command = self.bot.cogs[name]
+			if name in self.bot.cogs or name in self.bot.cog_loader.deferred_cogs:
+				command = self.bot.get_cog(name)
 			elif name.lower() in self.bot.all_commands:
 				command = self.bot.all_commands[name.lower()]
 			elif name.lower() in [cog.lower() for cog in self.bot.cogs.keys()]: # more efficient way?
@@ -138,7 +141,7 @@ class Meta:
 			_allcommands += name + ' '
 		await ctx.whisper(_allcommands[:-1])
 	
-	@commands.command()
+	@commands.group(invoke_without_command = True)
 	@commands.is_owner()
 	async def benchmark(self, ctx):
 		'''Benchmark'''
@@ -148,12 +151,182 @@ class Meta:
 		embed = discord.Embed(color = ctx.bot.bot_color)
 		embed.add_field(name = "RAM", value = "{:.2f} MiB".format(memory))
 		embed.add_field(name = "CPU", value = "Calculating CPU usage..")
+		loop_monitor = ctx.bot.loop_monitor
+		embed.add_field(name = "Event Loop Lag", value = f"p50: {loop_monitor.percentile(0.5) * 1000:,.2f} ms\n"
+																f"p99: {loop_monitor.percentile(0.99) * 1000:,.2f} ms")
+		embed.add_field(name = "Event Loop Stalls", value = f"{loop_monitor.stall_count:,}")
 		message = await ctx.send(embed = embed)
 		await asyncio.sleep(1)
 		cpu = process.cpu_percent() / psutil.cpu_count()
 		embed.set_field_at(1, name = "CPU", value = "{}%".format(cpu))
 		await message.edit(embed = embed)
 	
+	@benchmark.command(name = "clients", aliases = ["client"])
+	@commands.is_owner()
+	async def benchmark_clients(self, ctx):
+		'''External client initialization times'''
+		fields = []
+		for name, ready_time in sorted(ctx.bot.external_client_ready_times.items()):
+			fields.append((name, f"{ready_time * 1000:,.0f} ms"))
+		for name, reason in sorted(ctx.bot.degraded_clients.items()):
+			fields.append((f"{name} (Degraded)", reason))
+		await ctx.embed_reply(fields = fields)
+	
+	@benchmark.command(name = "commands", aliases = ["command"])
+	@commands.is_owner()
+	async def benchmark_commands(self, ctx, group_by : str = "command", limit : int = 10):
+		'''
+		Command latency summary
+		Group by command or cog, sorted by total time
+		'''
+		if group_by not in ("command", "cog"):
+			await ctx.embed_reply(":no_entry: Group by command or cog")
+			return
+		summary = sorted(ctx.bot.command_metrics.summary(group_by).items(), 
+							key = lambda item: item[1][0].sum, reverse = True)
+		fields = []
+		for name, (histogram, errors, http_requests) in summary[:limit]:
+			fields.append((name, f"Count: {histogram.count:,} ({errors:,} failed)\n"
+									f"Mean: {histogram.sum / histogram.count * 1000:,.0f} ms\n"
+									f"p50: {histogram.quantile(0.5) * 1000:,.0f} ms\n"
+									f"p99: {histogram.quantile(0.99) * 1000:,.0f} ms\n"
+									f"HTTP requests: {http_requests:,}"))
+		await ctx.embed_reply(None if fields else "No commands recorded yet", fields = fields)
+	
+	@benchmark.command(name = "cogs", aliases = ["cog"])
+	@commands.is_owner()
+	async def benchmark_cogs(self, ctx):
+		'''Cog load times'''
+		cog_loader = ctx.bot.cog_loader
+		load_times = sorted(cog_loader.load_times.items(), key = lambda item: item[1], reverse = True)
+		lines = [f"{extension[5:]}: {load_time * 1000:,.0f} ms" for extension, load_time in load_times]
+		lines.extend(f"{extension[5:]}: Deferred" for extension in sorted(cog_loader.deferred))
+		await ctx.embed_reply('\n'.join(lines), footer_text = f"Total: {sum(cog_loader.load_times.values()):.2f}s")
+	
+	@benchmark.command(name = "stalls", aliases = ["stall", "blocking"])
+	@commands.is_owner()
+	async def benchmark_stalls(self, ctx, number : int = 1):
+		'''
+		Recent event loop stalls
+		With the stack of the blocking call
+		'''
+		stalls = list(ctx.bot.loop_monitor.stalls)[-number:]
+		if not stalls:
+			await ctx.embed_reply("No event loop stalls recorded")
+			return
+		for stall in reversed(stalls):
+			duration = f"{stall.duration:.2f}s" if stall.duration is not None else "Ongoing"
+			# Most recent frames are last
+			stack = stall.stack[-(ctx.bot.EMBED_DESCRIPTION_CHARACTER_LIMIT - 10):]
+			await ctx.embed_reply(ctx.bot.PY_CODE_BLOCK.format(stack), 
+									fields = (("Command", stall.command or "None"), ("Duration", duration)))
+	
+	@benchmark.command(name = "executors", aliases = ["executor", "sdks"])
+	@commands.is_owner()
+	async def benchmark_executors(self, ctx):
+		'''Executor pools for third-party SDK calls'''
+		fields = []
+		for executor in ctx.bot.executors:
+			fields.append((executor.name, f"Active: {executor.active}/{executor.max_workers}\n"
+											f"Queued: {executor.queued} (max {executor.max_queued})\n"
+											f"Calls: {executor.calls:,}\n"
+											f"Failures: {executor.failures:,}\n"
+											f"Timeouts: {executor.timeouts:,}\n"
+											f"Average: {executor.average_time * 1000:,.0f} ms"))
+		await ctx.embed_reply(fields = fields)
+	
+	@benchmark.command(name = "ratelimits", aliases = ["ratelimit", "rate_limits", "rate_limit"])
+	@commands.is_owner()
+	async def benchmark_rate_limits(self, ctx):
+		'''Outbound HTTP rate limits'''
+		fields = []
+		for host, bucket in sorted(ctx.bot.rate_limiter.buckets.items(), key = lambda item: item[1].total_wait, 
+									reverse = True)[:25]:
+			average_wait = bucket.total_wait / bucket.waited if bucket.waited else 0.0
+			fields.append((host, f"Limit: {bucket.rate:g}/s (burst {bucket.burst})\n"
+									f"Requests: {bucket.requests:,}\n"
+									f"Waited: {bucket.waited:,}\n"
+									f"Average wait: {average_wait * 1000:,.0f} ms\n"
+									f"Max wait: {bucket.max_wait * 1000:,.0f} ms\n"
+									f"Queued: {sum(map(len, bucket.queues.values()))}\n"
+									f"429s: {bucket.rate_limited:,}"))
+		if not fields:
+			await ctx.embed_reply("No outbound HTTP requests made yet")
+			return
+		await ctx.embed_reply(fields = fields)
+	
+	@benchmark.command(name = "on_message", aliases = ["messages", "message_filter"])
+	@commands.is_owner()
+	async def benchmark_on_message(self, ctx, limit : int = 100000, *, path : str = None):
+		'''
+		Replay a chat log through the on_message pre-filter
+		Defaults to the current chat log
+		'''
+		path = path or logging.path + "chat/chat.log"
+		try:
+			entries = await ctx.bot.loop.run_in_executor(None, read_chat_log, path, limit)
+		except FileNotFoundError:
+			await ctx.embed_reply(":no_entry: Chat log not found")
+			return
+		if not entries:
+			await ctx.embed_reply(":no_entry: No messages found in chat log")
+			return
+		message_filter = ctx.bot.message_filter
+		relevant, elapsed = message_filter.replay(entries)
+		await ctx.embed_reply(fields = (("Replayed", f"{len(entries):,} messages"), 
+										("Skipped", f"{len(entries) - relevant:,} ({1 - relevant / len(entries):.2%})"), 
+										("Throughput", f"{len(entries) / elapsed:,.0f} messages/s" if elapsed else "N/A"), 
+										("Average", f"{elapsed / len(entries) * 10 ** 6:,.2f} \N{MICRO SIGN}s"), 
+										("Live", f"{message_filter.skipped:,}/{message_filter.checked:,} skipped")))
+	
+	@benchmark.command(name = "permissions", aliases = ["permission"])
+	@commands.is_owner()
+	@commands.guild_only()
+	async def benchmark_permissions(self, ctx, command : str = "help", iterations : int = 1000):
+		'''Benchmark permission checks, compiling the guild's permissions vs the compiled index'''
+		permission_index = ctx.bot.permission_index
+		def uncached():
+			permission_index.invalidate(ctx.guild.id)
+			permission_index.get(ctx.guild).get_user_permission(ctx.author, command)
+		def cached():
+			permission_index.get(ctx.guild).get_user_permission(ctx.author, command)
+		uncached_time = timeit.timeit(uncached, number = iterations) / iterations
+		cached_time = timeit.timeit(cached, number = iterations) / iterations
+		await ctx.embed_reply(f"{iterations:,} iterations of `{command}` for {ctx.author.mention}", 
+								fields = (("Compile", f"{uncached_time * 10 ** 6:,.2f} µs"), 
+											("Compiled Index", f"{cached_time * 10 ** 6:,.2f} µs"), 
+											("Speedup", f"{uncached_time / cached_time:,.0f}x")))
+	
+	@commands.group(hidden = True, invoke_without_command = True)
+	@commands.is_owner()
+	async def caches(self, ctx):
+		'''Cache sizes and hit rates'''
+		prefix_resolver = ctx.bot.prefix_resolver
+		guild_settings = ctx.bot.guild_settings
+		await ctx.embed_reply(fields = (("Prefixes", f"Size: {len(prefix_resolver):,}\n"
+													f"Hits: {prefix_resolver.hits:,}\n"
+													f"Misses: {prefix_resolver.misses:,}\n"
+													f"Hit rate: {prefix_resolver.hit_rate:.2%}"), 
+										("Server Settings", f"Size: {len(guild_settings):,}\n"
+															f"Hits: {guild_settings.hits:,}\n"
+															f"Misses: {guild_settings.misses:,}\n"
+															f"Hit rate: {guild_settings.hit_rate:.2%}")))
+	
+	@caches.command(name = "http")
+	@commands.is_owner()
+	async def caches_http(self, ctx):
+		'''HTTP response cache hit rates per host'''
+		http_client = ctx.bot.http_client
+		fields = []
+		for host, stats in sorted(http_client.stats.items(), key = lambda item: item[1].hits, reverse = True)[:20]:
+			fields.append((host, f"Hits: {stats.hits:,} (+{stats.disk_hits:,} disk, {stats.revalidated:,} revalidated)\n"
+									f"Misses: {stats.misses:,}\n"
+									f"Coalesced: {stats.coalesced:,}\n"
+									f"Uncached: {stats.uncached:,}\n"
+									f"Hit rate: {stats.hit_rate:.2%}"))
+		await ctx.embed_reply(f"{len(http_client.cache):,} responses, {http_client.size / 2 ** 20:,.2f} MiB in memory", 
+								fields = fields)
+	
 	@commands.command(aliases = ["category"])
 	@checks.not_forbidden()
 	async def cog(self, ctx, command):
@@ -180,23 +353,18 @@ class Meta:
 	@commands.command()
 	async def points(self, ctx):
 		'''WIP'''
-		with open(f"{clients.data_path}/user_data/{ctx.author.id}/stats.json", 'r') as stats_file:
-			stats = json.load(stats_file)
+		stats = await ctx.bot.stats.get_user_stats(ctx.author.id)
 		await ctx.embed_reply(f"You have {stats['points']} points")
 	
 	@commands.command(aliases = ["server_setting"])
 	@checks.is_server_owner()
 	async def server_settings(self, ctx, setting : str, on_off : bool):
 		'''WIP'''
-		with open(clients.data_path + "/server_data/{}/settings.json".format(ctx.guild.id), 'r') as settings_file:
-			data = json.load(settings_file)
-		if setting in data:
-			data[setting] = on_off
-		else:
+		# Only on/off settings can be set here
+		if not isinstance(GuildSettings.defaults.get(setting), bool):
 			await ctx.embed_reply("Setting not found")
 			return
-		with open(clients.data_path + "/server_data/{}/settings.json".format(ctx.guild.id), 'w') as settings_file:
-			json.dump(data, settings_file, indent = 4)
+		await ctx.bot.guild_settings.set(ctx.guild.id, setting, on_off)
 		await ctx.embed_reply("{} set to {}".format(setting, on_off))
 	
 	@commands.command()
@@ -225,14 +393,10 @@ class Meta:
 		'''
 		if not prefixes:
 			prefixes = ['!']
-		with open(clients.data_path + "/prefixes.json", 'r') as prefixes_file:
-			all_prefixes = json.load(prefixes_file)
 		if isinstance(ctx.channel, discord.DMChannel):
-			all_prefixes[ctx.channel.id] = prefixes
+			await ctx.bot.prefix_resolver.set(ctx.channel.id, prefixes)
 		else:
-			all_prefixes[ctx.guild.id] = prefixes
-		with open(clients.data_path + "/prefixes.json", 'w') as prefixes_file:
-			json.dump(all_prefixes, prefixes_file, indent = 4)
+			await ctx.bot.prefix_resolver.set(ctx.guild.id, prefixes)
 		await ctx.embed_reply("Prefix(es) set: {}".format(' '.join(['`"{}"`'.format(prefix) for prefix in prefixes])))
 	
 	@commands.command(aliases = ["typing"], hidden = True)
@@ -263,7 +427,7 @@ class Meta:
 		embed.add_field(name = "Created on:", value = "February 10th, 2016")
 		embed.add_field(name = "Version", value = self.bot.version)
 		embed.add_field(name = "Library", value = "[discord.py](https://github.com/Rapptz/discord.py) v{0}\n([Python](https://www.python.org/) v{1.major}.{1.minor}.{1.micro})".format(discord_py_version, sys.version_info))
-		owner = discord.utils.get(self.bot.get_all_members(), id = self.bot.owner_id)
+		owner = self.bot.owner
 		embed.set_footer(text = "Developer/Owner: {0} (Discord ID: {0.id})".format(owner), icon_url = owner.avatar_url)
 		await ctx.reply("", embed = embed)
 		await ctx.send("Changelog (Harmonbot Server): {}".format(self.bot.changelog))
@@ -287,8 +451,7 @@ class Meta:
 	@commands.command()
 	async def stats(self, ctx):
 		'''Bot stats'''
-		with open(clients.data_path + "/stats.json", 'r') as stats_file:
-			stats = json.load(stats_file)
+		stats = await self.bot.global_stats()
 		
 		now = datetime.datetime.utcnow()
 		uptime = now - clients.online_time
@@ -317,7 +480,9 @@ class Meta:
 		# since 2016-06-10 (cog commands)
 		embed.add_field(name = "Cogs Reloaded", value = "{:,}".format(stats["cogs_reloaded"])) ## since 2016-06-10 - implemented cog reloading
 		# TODO: cogs reloaded this session
-		embed.add_field(name = "Servers", value = len(self.bot.guilds))
+		guild_count = (await self.bot.listing_stats.counts())["guilds"]
+		embed.add_field(name = "Servers", value = guild_count if guild_count == len(self.bot.guilds) 
+												else f"{guild_count:,} ({len(self.bot.guilds):,} on this cluster)")
 		embed.add_field(name = "Channels", value = "{} text\n{} voice (playing in {}/{})".format(text_count, voice_count, playing_in_voice_count, in_voice_count))
 		embed.add_field(name = "Members", 
 			value = "{:,} total\n({:,} online)\n{:,} unique\n({:,} online)".format(total_members, total_members_online, len(unique_members), unique_members_online))
@@ -498,7 +663,7 @@ class Meta:
 		Discord Bot List (https://discordbotlist.com/)
 		'''
 		if site:
-			response = await ctx.bot.update_listing_stats(site)
+			response = await ctx.bot.listing_stats.update(site)
 			title = title_url = discord.Embed.Empty
 			if site in ctx.bot.listing_sites:
 				title = ctx.bot.listing_sites[site]["name"]
@@ -506,9 +671,11 @@ class Meta:
 			await ctx.embed_reply(f"`{response}`", title = title, title_url = title_url)
 		else:
 			output = []
+			responses = await ctx.bot.listing_stats.update_all()
 			for site, site_info in ctx.bot.listing_sites.items():
-				response = await ctx.bot.update_listing_stats(site)
-				output.append(f"{site_info['name']} (https://{site}/): `{response}`")
+				last_success = ctx.bot.listing_stats.last_success.get(site)
+				output.append(f"{site_info['name']} (https://{site}/): `{responses[site]}`\n"
+								f"Last success: {last_success.isoformat(timespec = 'seconds') if last_success else 'Never'}")
 			await ctx.embed_reply('\n'.join(output))
 	
 	# Restart/Shutdown
@@ -3,7 +3,6 @@ import discord
 from discord.ext import commands
 
 import asyncio
-import json
 
 from modules import utilities
 from utilities import checks
@@ -125,18 +124,12 @@ class Misc:
 		elif to_poke == self.bot.user:
 			await ctx.embed_reply("!poke {}".format(ctx.author.mention))
 		else:
-			clients.create_folder(clients.data_path + "/user_data/{}".format(ctx.author.id))
-			clients.create_file("user_data/{}/pokes".format(ctx.author.id))
-			with open(clients.data_path + "/user_data/{}/pokes.json".format(ctx.author.id), 'r') as pokes_file:
-				pokes_data = json.load(pokes_file)
-			pokes_data[str(to_poke.id)] = pokes_data.get(str(to_poke.id), 0) + 1
-			with open(clients.data_path + "/user_data/{}/pokes.json".format(ctx.author.id), 'w') as pokes_file:
-				json.dump(pokes_data, pokes_file, indent = 4)
+			pokes = await ctx.bot.repository.poke(ctx.author.id, to_poke.id)
 			embed = discord.Embed(color = ctx.bot.bot_color)
 			embed.set_author(name = ctx.author, icon_url = ctx.author.avatar_url)
-			embed.description = "Poked you for the {} time!".format(clients.inflect_engine.ordinal(pokes_data[str(to_poke.id)]))
+			embed.description = "Poked you for the {} time!".format(clients.inflect_engine.ordinal(pokes))
 			await to_poke.send(embed = embed)
-			await ctx.embed_reply("You have poked {} for the {} time!".format(to_poke.mention, clients.inflect_engine.ordinal(pokes_data[str(to_poke.id)])), footer_text = "In response to: {}".format(ctx.message.clean_content))
+			await ctx.embed_reply("You have poked {} for the {} time!".format(to_poke.mention, clients.inflect_engine.ordinal(pokes)), footer_text = "In response to: {}".format(ctx.message.clean_content))
 	
 	@commands.command()
 	@checks.not_forbidden()
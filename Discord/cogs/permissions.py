@@ -2,9 +2,6 @@
 import discord
 from discord.ext import commands
 
-import json
-
-import clients
 from modules import utilities
 from utilities import checks
 
@@ -28,12 +25,7 @@ class Permissions:
 	async def setpermission_everyone(self, ctx, permission : str, setting : bool = None):
 		if permission not in self.bot.all_commands: return (await ctx.embed_reply("Error: {} is not a command".format(permission)))
 		command = self.bot.all_commands[permission].name
-		with open(clients.data_path + "/permissions/{}.json".format(ctx.guild.id), 'r') as permissions_file:
-			permissions_data = json.load(permissions_file)
-		permissions_data.setdefault("everyone", {})
-		permissions_data["everyone"][command] = setting
-		with open(clients.data_path + "/permissions/{}.json".format(ctx.guild.id), 'w') as permissions_file:
-			json.dump(permissions_data, permissions_file, indent = 4)		
+		await ctx.bot.permission_index.set(ctx.guild, command, setting)
 		await ctx.embed_reply("Permission updated\n{} set to {} for everyone".format(permission, setting))
 	
 	@setpermission.command(name = "role")
@@ -46,13 +38,7 @@ class Permissions:
 		if len(matches) > 1: return (await ctx.embed_reply("Error: multiple roles with the name, {}".format(role)))
 		elif len(matches) == 0: return (await ctx.embed_reply('Error: role with name, "{}", not found'.format(role)))
 		else: _role = matches[0]
-		with open(clients.data_path + "/permissions/{}.json".format(ctx.guild.id), 'r') as permissions_file:
-			permissions_data = json.load(permissions_file)
-		permissions_data.setdefault("roles", {})
-		permissions_data["roles"].setdefault(str(_role.id), {"name" : _role.name})
-		permissions_data["roles"][str(_role.id)][command] = setting
-		with open(clients.data_path + "/permissions/{}.json".format(ctx.guild.id), 'w') as permissions_file:
-			json.dump(permissions_data, permissions_file, indent = 4)		
+		await ctx.bot.permission_index.set(ctx.guild, command, setting, type = "roles", object = _role)
 		await ctx.embed_reply("Permission updated\n{} set to {} for the {} role".format(permission, setting, _role.name))
 	
 	@setpermission.command(name = "user")
@@ -63,13 +49,7 @@ class Permissions:
 		command = self.bot.all_commands[permission].name
 		_user = await utilities.get_user(ctx, user)
 		if not _user: return (await ctx.embed_reply("Error: user not found"))
-		with open(clients.data_path + "/permissions/{}.json".format(ctx.guild.id), 'r') as permissions_file:
-			permissions_data = json.load(permissions_file)
-		permissions_data.setdefault("users", {})
-		permissions_data["users"].setdefault(str(_user.id), {"name" : _user.name})
-		permissions_data["users"][str(_user.id)][command] = setting
-		with open(clients.data_path + "/permissions/{}.json".format(ctx.guild.id), 'w') as permissions_file:
-			json.dump(permissions_data, permissions_file, indent = 4)
+		await ctx.bot.permission_index.set(ctx.guild, command, setting, type = "users", object = _user)
 		await ctx.embed_reply("Permission updated\n{} set to {} for {}".format(permission, setting, _user))
 	
 	@commands.group(invoke_without_command = True)
@@ -129,8 +109,7 @@ class Permissions:
 	@commands.guild_only()
 	@checks.is_permitted()
 	async def getpermissions_everyone(self, ctx):
-		with open(clients.data_path + "/permissions/{}.json".format(ctx.guild.id), 'r') as permissions_file:
-			permissions_data = json.load(permissions_file)
+		permissions_data = await ctx.bot.repository.get_permissions(ctx.guild.id)
 		everyone_settings = permissions_data.get("everyone", {})
 		output = "__Permissions for everyone__\n"
 		for permission, setting in everyone_settings.items():
@@ -145,11 +124,9 @@ class Permissions:
 		if len(matches) > 1: return (await ctx.embed_reply("Error: multiple roles with the name, {}".format(role)))
 		elif len(matches) == 0: return (await ctx.embed_reply('Error: role with name, "{}", not found'.format(role)))
 		else: _role = matches[0]
-		with open(clients.data_path + "/permissions/{}.json".format(ctx.guild.id), 'r') as permissions_file:
-			permissions_data = json.load(permissions_file)
+		permissions_data = await ctx.bot.repository.get_permissions(ctx.guild.id)
 		role_settings = permissions_data.get("roles", {}).get(str(_role.id), {})
 		output = "__Permissions for {}__\n".format(_role.name)
-		role_settings.pop("name", None)
 		for permission, setting in role_settings.items():
 			output += "{}: {}\n".format(permission, str(setting))
 		await ctx.send(output)
@@ -160,11 +137,9 @@ class Permissions:
 	async def getpermissions_user(self, ctx, user : str):
 		_user = await utilities.get_user(ctx, user)
 		if not _user: return (await ctx.embed_reply("Error: user not found"))
-		with open(clients.data_path + "/permissions/{}.json".format(ctx.guild.id), 'r') as permissions_file:
-			permissions_data = json.load(permissions_file)
+		permissions_data = await ctx.bot.repository.get_permissions(ctx.guild.id)
 		user_settings = permissions_data.get("users", {}).get(str(_user.id), {})
 		output = "__Permissions for {}__\n".format(_user.name)
-		user_settings.pop("name", None)
 		for permission, setting in user_settings.items():
 			output += "{}: {}\n".format(permission, str(setting))
 		await ctx.send(output)
@@ -174,16 +149,17 @@ class Permissions:
 	@checks.is_permitted()
 	async def getpermissions_command(self, ctx, command : str):
 		if command not in self.bot.all_commands: return (await ctx.embed_reply("Error: {} is not a command".format(command)))
-		with open(clients.data_path + "/permissions/{}.json".format(ctx.guild.id), 'r') as permissions_file:
-			permissions_data = json.load(permissions_file)
+		permissions_data = await ctx.bot.repository.get_permissions(ctx.guild.id)
 		output = "__Permissions for {}__\n".format(command)
-		permissions_data.pop("name", None)
-		if command in permissions_data.get("everyone", {}):
-			output += "**Everyone**: {}\n".format(permissions_data.pop("everyone")[command])
+		everyone_settings = permissions_data.pop("everyone", {})
+		if command in everyone_settings:
+			output += "**Everyone**: {}\n".format(everyone_settings[command])
 		for type, objects in permissions_data.items():
 			output += "**{}**\n".format(type.capitalize())
+			get_object = ctx.guild.get_role if type == "roles" else ctx.guild.get_member
 			for id, settings in objects.items():
 				if command in settings:
-					output += "{}: {}\n".format(settings["name"], str(settings[command]))
+					object = get_object(int(id))
+					output += "{}: {}\n".format(object.name if object else id, str(settings[command]))
 		await ctx.send(output)
 
@@ -63,7 +63,7 @@ class Resources:
 	
 	async def process_color(self, ctx, url, params = {}):
 		params["format"] = "json"
-		async with clients.aiohttp_session.get(url, params = params) as resp:
+		async with clients.http_client.get(url, params = params) as resp:
 			data = await resp.json()
 		if not data:
 			await ctx.embed_reply(":no_entry: Error")
@@ -82,7 +82,7 @@ class Resources:
 			id = "cve" + id
 		elif not id.startswith("cve"):
 			id = "cve-" + id
-		async with clients.aiohttp_session.get("http://cve.circl.lu/api/cve/{}".format(id)) as resp:
+		async with clients.http_client.get("http://cve.circl.lu/api/cve/{}".format(id)) as resp:
 			data = await resp.json()
 		if not data:
 			await ctx.embed_reply(":no_entry: Error: Not found")
@@ -98,7 +98,7 @@ class Resources:
 		except ValueError:
 			url = "http://api.steampowered.com/ISteamUser/ResolveVanityURL/v0001/"
 			params = {"key": ctx.bot.STEAM_WEB_API_KEY, "vanityurl": account}
-			async with clients.aiohttp_session.get(url, params = params) as resp:
+			async with clients.http_client.get(url, params = params) as resp:
 				data = await resp.json()
 			url = f"https://www.dotabuff.com/players/{int(data['response']['steamid']) - 76561197960265728}"
 		await ctx.embed_reply(title = f"{account}'s Dotabuff profile", title_url = url)
@@ -109,7 +109,7 @@ class Resources:
 		'''Gender of a name'''
 		# TODO: add localization options?
 		url = "https://api.genderize.io/"
-		async with clients.aiohttp_session.get(url, params = {"name": name}) as resp:
+		async with clients.http_client.get(url, params = {"name": name}) as resp:
 			# TODO: check status code
 			data = await resp.json()
 		if not data["gender"]:
@@ -134,7 +134,7 @@ class Resources:
 	async def haveibeenpwned(self, ctx, name : str):
 		'''Check if your account has been breached'''
 		url = "https://haveibeenpwned.com/api/v2/breachedaccount/" + name
-		async with clients.aiohttp_session.get(url, params = {"truncateResponse": "true"}) as resp:
+		async with clients.http_client.get(url, params = {"truncateResponse": "true"}) as resp:
 			status = resp.status
 			if status in (400, 404):
 				breachedaccounts = "None"
@@ -142,7 +142,7 @@ class Resources:
 				data = await resp.json()
 				breachedaccounts = ", ".join(acc["Name"] for acc in data)
 		url = "https://haveibeenpwned.com/api/v2/pasteaccount/" + name
-		async with clients.aiohttp_session.get(url) as resp:
+		async with clients.http_client.get(url) as resp:
 			status = resp.status
 			if status in (400, 404):
 				pastedaccounts = "None"
@@ -161,7 +161,7 @@ class Resources:
 	@checks.not_forbidden()
 	async def horoscope_signs(self, ctx):
 		'''Sun signs'''
-		async with clients.aiohttp_session.get("http://sandipbgt.com/theastrologer/api/sunsigns") as resp:
+		async with clients.http_client.get("http://sandipbgt.com/theastrologer/api/sunsigns") as resp:
 			data = await resp.json()
 		await ctx.embed_reply(", ".join(data))
 	
@@ -187,7 +187,7 @@ class Resources:
 		if len(sign) == 1:
 			sign = unicodedata.name(sign).lower()
 		url = f"http://sandipbgt.com/theastrologer/api/horoscope/{sign}/{day}/"
-		async with clients.aiohttp_session.get(url) as resp:
+		async with clients.http_client.get(url) as resp:
 			if resp.status == 404:
 				await ctx.embed_reply(":no_entry: Error")
 				return
@@ -205,7 +205,7 @@ class Resources:
 		'''IMDb Information'''
 		url = "http://www.omdbapi.com/"
 		params = {'t': search, "plot": "short", "apikey": ctx.bot.OMDB_API_KEY}
-		async with clients.aiohttp_session.get(url, params = params) as resp:
+		async with clients.http_client.get(url, params = params) as resp:
 			data = await resp.json()
 		if data["Response"] == "False":
 			return await ctx.embed_reply(f":no_entry: Error: {data['Error']}")
@@ -230,7 +230,7 @@ class Resources:
 		'''Expand a short goo.gl url'''
 		url = "https://www.googleapis.com/urlshortener/v1/url"
 		params = {"shortUrl": url, "key": ctx.bot.GOOGLE_API_KEY}
-		async with clients.aiohttp_session.get(url, params = params) as resp:
+		async with clients.http_client.get(url, params = params) as resp:
 			if resp.status == 400:
 				await ctx.embed_reply(":no_entry: Error")
 				return
@@ -246,7 +246,7 @@ class Resources:
 		'''
 		url = "https://newsapi.org/v1/articles"
 		params = {"source": source, "apiKey": ctx.bot.NEWSAPI_ORG_API_KEY}
-		async with clients.aiohttp_session.get(url, params = params) as resp:
+		async with clients.http_client.get(url, params = params) as resp:
 			data = await resp.json()
 		if data["status"] != "ok":
 			return await ctx.embed_reply(f":no_entry: Error: {data['message']}")
@@ -288,7 +288,7 @@ class Resources:
 		News sources
 		https://newsapi.org/sources
 		'''
-		async with clients.aiohttp_session.get("https://newsapi.org/v1/sources") as resp:
+		async with clients.http_client.get("https://newsapi.org/v1/sources") as resp:
 			data = await resp.json()
 		if data["status"] != "ok":
 			await ctx.embed_reply(":no_entry: Error")
@@ -302,7 +302,7 @@ class Resources:
 		'''The On-Line Encyclopedia of Integer Sequences'''
 		url = "http://oeis.org/search"
 		params = {"fmt": "json", 'q': search.replace(' ', "")}
-		async with clients.aiohttp_session.get(url, params = params) as resp:
+		async with clients.http_client.get(url, params = params) as resp:
 			data = await resp.json()
 		if data["results"]:
 			await ctx.embed_reply(data["results"][0]["data"], title = data["results"][0]["name"])
@@ -317,7 +317,7 @@ class Resources:
 		'''Graphs from The On-Line Encyclopedia of Integer Sequences'''
 		url = "http://oeis.org/search"
 		params = {"fmt": "json", 'q': search.replace(' ', "")}
-		async with clients.aiohttp_session.get(url, params = params) as resp:
+		async with clients.http_client.get(url, params = params) as resp:
 			data = await resp.json()
 		if data["results"]:
 			# TODO: Handle no graph
@@ -331,7 +331,7 @@ class Resources:
 	@checks.not_forbidden()
 	async def phone(self, ctx, *, phone : str): # add reactions version
 		'''Get phone specifications'''
-		async with clients.aiohttp_session.get("https://fonoapi.freshpixl.com/v1/getdevice?device={}&position=0&token={}".format(phone.replace(' ', '+'), ctx.bot.FONO_API_TOKEN)) as resp:
+		async with clients.http_client.get("https://fonoapi.freshpixl.com/v1/getdevice?device={}&position=0&token={}".format(phone.replace(' ', '+'), ctx.bot.FONO_API_TOKEN)) as resp:
 			data = await resp.json()
 		if "status" in data and data["status"] == "error":
 			await ctx.embed_reply(":no_entry: Error: {}".format(data["message"]))
@@ -488,7 +488,7 @@ class Resources:
 	async def steam_appid(self, ctx, *, app : str):
 		'''Get the AppID'''
 		url = "http://api.steampowered.com/ISteamApps/GetAppList/v0002/"
-		async with clients.aiohttp_session.get(url) as resp:
+		async with clients.http_client.get(url) as resp:
 			data = await resp.json()
 		apps = data["applist"]["apps"]
 		appid = 0
@@ -504,12 +504,12 @@ class Resources:
 		'''Find how many games someone has'''
 		url = "http://api.steampowered.com/ISteamUser/ResolveVanityURL/v0001/"
 		params = {"key": ctx.bot.STEAM_WEB_API_KEY, "vanityurl": vanity_name}
-		async with clients.aiohttp_session.get(url, params = params) as resp:
+		async with clients.http_client.get(url, params = params) as resp:
 			data = await resp.json()
 		id = data["response"]["steamid"]
 		url = "http://api.steampowered.com/IPlayerService/GetOwnedGames/v0001/"
 		params = {"key": ctx.bot.STEAM_WEB_API_KEY, "steamid": id}
-		async with clients.aiohttp_session.get(url, params = params) as resp:
+		async with clients.http_client.get(url, params = params) as resp:
 			data = await resp.json()
 		gamecount = data["response"]["game_count"]
 		await ctx.embed_reply(f"{vanity_name} has {gamecount} games")
@@ -519,7 +519,7 @@ class Resources:
 	async def steam_gameinfo(self, ctx, *, game : str):
 		'''Information about a game'''
 		url = "http://api.steampowered.com/ISteamApps/GetAppList/v0002/"
-		async with clients.aiohttp_session.get(url) as resp:
+		async with clients.http_client.get(url) as resp:
 			data = await resp.json()
 		app = discord.utils.find(lambda app: app["name"].lower() == game.lower(), data["applist"]["apps"])
 		if not app:
@@ -527,7 +527,7 @@ class Resources:
 			return
 		appid = str(app["appid"])
 		url = "http://store.steampowered.com/api/appdetails/?appids={}".format(appid)
-		async with clients.aiohttp_session.get(url) as resp:
+		async with clients.http_client.get(url) as resp:
 			data = await resp.json()
 		data = data[appid]["data"]
 		await ctx.embed_reply(data["short_description"], title = data["name"], title_url = data["website"], fields = (("Release Date", data["release_date"]["date"]), ("Free", "Yes" if data["is_free"] else "No"), ("App ID", data["steam_appid"])), image_url = data["header_image"])
@@ -537,7 +537,7 @@ class Resources:
 	async def steam_run(self, ctx, *, game : str):
 		'''Generate a steam link to launch a game'''
 		url = "http://api.steampowered.com/ISteamApps/GetAppList/v0002/"
-		async with clients.aiohttp_session.get(url) as resp:
+		async with clients.http_client.get(url) as resp:
 			data = await resp.json()
 		app = discord.utils.find(lambda app: app["name"].lower() == game.lower(), data["applist"]["apps"])
 		if not app:
@@ -562,7 +562,7 @@ class Resources:
 	async def urbandictionary(self, ctx, *, term : str):
 		'''Urban Dictionary'''
 		# TODO: Integrate into reactions system; Return first definition instead for non-reaction version?
-		async with clients.aiohttp_session.get("http://api.urbandictionary.com/v0/define?term={}".format(term.replace('+', ' '))) as resp:
+		async with clients.http_client.get("http://api.urbandictionary.com/v0/define?term={}".format(term.replace('+', ' '))) as resp:
 			data = await resp.json()
 		if not data or "list" not in data or not data["list"]:
 			await ctx.embed_reply(":no_entry: No results found")
@@ -597,7 +597,7 @@ class Resources:
 		params = {"p2i_url": url, "p2i_screen": "1280x1024", "p2i_size": "1280x0", 
 					"p2i_fullpage": 1, "p2i_key": ctx.bot.PAGE2IMAGES_REST_API_KEY}
 		while True:
-			async with clients.aiohttp_session.get(api_url, params = params) as resp:
+			async with clients.http_client.get(api_url, params = params) as resp:
 				data = await resp.json(content_type = "text/html")
 			if data["status"] == "processing":
 				wait_time = int(data["estimated_need_time"])
@@ -623,7 +623,7 @@ class Resources:
 			await ctx.embed_reply("What is what?")
 		else:
 			url = "https://kgsearch.googleapis.com/v1/entities:search?limit=1&query={}&key={}".format('+'.join(search), ctx.bot.GOOGLE_API_KEY)
-			async with clients.aiohttp_session.get(url) as resp:
+			async with clients.http_client.get(url) as resp:
 				data = await resp.json()
 			if data.get("itemListElement") and data["itemListElement"][0].get("result", {}).get("detailedDescription", {}).get("articleBody", {}):
 				await ctx.embed_reply(data["itemListElement"][0]["result"]["detailedDescription"]["articleBody"])
@@ -641,7 +641,7 @@ class Resources:
 		await self.process_xkcd(ctx, url)
 	
 	async def process_xkcd(self, ctx, url):
-		async with clients.aiohttp_session.get(url) as resp:
+		async with clients.http_client.get(url) as resp:
 			if resp.status == 404:
 				await ctx.embed_reply(":no_entry: Error")
 				return
@@ -7,7 +7,6 @@ import datetime
 import functools
 import html
 import io
-import json
 import re
 import sys
 import time
@@ -34,11 +33,8 @@ class RSS:
 	def __init__(self, bot):
 		self.bot = bot
 		self.feeds_ids = {}
-		clients.create_file("rss_feeds", content = {})
-		with open(clients.data_path + "/rss_feeds.json", 'r') as feeds_file:
-			self.feeds_following = json.load(feeds_file)
+		self.feeds_following = self.bot.document_store.open(clients.data_path + "/rss_feeds.json")
 		self.unique_feeds_following = set(feed for feeds in self.feeds_following.values() for feed in feeds)
-		self.new_unique_feeds_following = self.unique_feeds_following.copy()
 		
 		# Generate tzinfos
 		self.tzinfos = {}
@@ -65,9 +61,7 @@ class RSS:
 		'''Add a feed to a channel'''
 		# TODO: check if already following
 		self.feeds_following[str(ctx.channel.id)] = self.feeds_following.get(str(ctx.channel.id), []) + [url]
-		self.new_unique_feeds_following.add(url)
-		with open(clients.data_path + "/rss_feeds.json", 'w') as feeds_file:
-			json.dump(self.feeds_following, feeds_file, indent = 4)
+		self.feeds_following.mark_dirty()
 		# Add entry IDs
 		if url not in self.feeds_ids: self.feeds_ids[url] = set()
 		async with clients.aiohttp_session.get(url) as resp:
@@ -86,9 +80,7 @@ class RSS:
 			await ctx.embed_reply(":no_entry: This channel isn't following that feed")
 			return
 		self.feeds_following[str(ctx.channel.id)].remove(url)
-		self.new_unique_feeds_following = set(feed for feeds in self.feeds_following.values() for feed in feeds)
-		with open(clients.data_path + "/rss_feeds.json", 'w') as feeds_file:
-			json.dump(self.feeds_following, feeds_file, indent = 4)
+		self.feeds_following.mark_dirty()
 		await ctx.embed_reply("The feed, {}, has been removed from this channel".format(url))
 
 	@rss.command(aliases = ["feed"])
@@ -99,6 +91,8 @@ class RSS:
 	
 	async def check_rss_feeds(self):
 		await self.bot.wait_until_ready()
+		if not self.bot.cluster.feeds:
+			return
 		offset_aware_task_start_time = datetime.datetime.now(datetime.timezone.utc)
 		## offset_naive_task_start_time = datetime.datetime.utcnow()
 		feeds_failed_to_initialize = []
@@ -132,6 +126,10 @@ class RSS:
 						feed_text = await resp.text()
 					feed_info = await self.bot.loop.run_in_executor(None, functools.partial(feedparser.parse, io.BytesIO(feed_text.encode("UTF-8")), response_headers = {"Content-Location": feed}))
 					# Still necessary to run in executor?
+					if feed not in self.feeds_ids:
+						# Added on another cluster, so its existing entries haven't been seen yet
+						self.feeds_ids[feed] = set(entry.id for entry in feed_info.entries if "id" in entry)
+						continue
 					for entry in feed_info.entries:
 						if "id" not in entry or entry.id in self.feeds_ids[feed]:
 							continue
@@ -221,11 +219,11 @@ class RSS:
 						embed.set_footer(text = feed_info.feed.title, icon_url = footer_icon_url)
 						for text_channel_id, feeds in self.feeds_following.items():
 							if feed in feeds:
-								text_channel = self.bot.get_channel(int(text_channel_id))
+								text_channel = self.bot.get_feed_channel(int(text_channel_id))
 								if text_channel:
 									try:
 										await text_channel.send(embed = embed)
-									except discord.Forbidden:
+									except (discord.Forbidden, discord.NotFound):
 										pass
 								# TODO: Remove text channel data if now non-existent
 				except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError) as e:
@@ -250,5 +248,6 @@ class RSS:
 					logging.errors_logger.error("Uncaught RSS Task exception\n", exc_info = (type(e), e, e.__traceback__))
 					print(" (feed: {})".format(feed))
 					await asyncio.sleep(60)
-			self.unique_feeds_following = self.new_unique_feeds_following.copy()
+			# Includes feeds followed from other clusters
+			self.unique_feeds_following = set(feed for feeds in self.feeds_following.values() for feed in feeds)
 
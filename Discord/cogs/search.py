@@ -2,7 +2,6 @@
 import discord
 from discord.ext import commands
 
-import functools
 import inspect
 import re
 import youtube_dl
@@ -45,9 +44,7 @@ class Search:
 	@checks.not_forbidden()
 	async def youtube(self, ctx, *, search : str):
 		'''Find a Youtube video'''
-		ydl = youtube_dl.YoutubeDL({"default_search": "auto", "noplaylist": True, "quiet": True})
-		func = functools.partial(ydl.extract_info, search, download = False)
-		info = await self.bot.loop.run_in_executor(None, func)
+		info = await self.bot.ytdl_resolver.extract_info(search, {"default_search": "auto", "noplaylist": True, "quiet": True})
 		if "entries" in info: info = info["entries"][0]
 		await ctx.reply(info.get("webpage_url"))
 	
@@ -261,6 +258,7 @@ class Search:
 	
 	@commands.group(aliases = ["wa", "wolfram_alpha"], invoke_without_command = True)
 	@checks.not_forbidden()
+	@checks.external_client_available("Wolfram Alpha")
 	async def wolframalpha(self, ctx, *, search : str):
 		'''
 		Wolfram|Alpha
@@ -277,14 +275,16 @@ class Search:
 	async def _wolframalpha(self, ctx, search, location = None):
 		if not location: location = self.bot.fake_location
 		search = search.strip('`')
-		result = self.bot.wolfram_alpha_client.query(search, ip = self.bot.fake_ip, location = location) # options
+		result = await self.bot.executors.run("wolfram_alpha", self.bot.wolfram_alpha_client.query, search, 
+												ip = self.bot.fake_ip, location = location) # options
 		if not hasattr(result, "pods") and hasattr(result, "didyoumeans"):
 			if result.didyoumeans["@count"] == '1':
 				didyoumean = result.didyoumeans["didyoumean"]["#text"]
 			else:
 				didyoumean = result.didyoumeans["didyoumean"][0]["#text"]
 			await ctx.embed_reply("Using closest Wolfram|Alpha interpretation: `{}`".format(didyoumean))
-			result = self.bot.wolfram_alpha_client.query(didyoumean, ip = self.bot.fake_ip, location = location)
+			result = await self.bot.executors.run("wolfram_alpha", self.bot.wolfram_alpha_client.query, didyoumean, 
+													ip = self.bot.fake_ip, location = location)
 		if hasattr(result, "pods"):
 			for pod in result.pods:
 				images, text_output = [], []
@@ -14,6 +14,12 @@ class Server:
 	
 	# TODO: add commands
 	
+	async def toggle_setting(self, ctx, setting, on_off):
+		if on_off is None:
+			return await ctx.embed_reply(f"{setting} is set to {ctx.bot.guild_settings.get(ctx.guild.id)[setting]}")
+		await ctx.bot.guild_settings.set(ctx.guild.id, setting, on_off)
+		await ctx.embed_reply(f"{setting} set to {on_off}")
+	
 	@commands.group(aliases = ["guild"], invoke_without_command = True)
 	@checks.not_forbidden()
 	async def server(self, ctx):
@@ -65,6 +71,35 @@ class Server:
 		'''Server settings'''
 		...
 	
+	@settings.group(name = "mention_spam", aliases = ["mentions_spam", "mention-spam"], invoke_without_command = True)
+	@commands.guild_only()
+	@checks.is_permitted()
+	async def settings_mention_spam(self, ctx):
+		'''Mention spam, when anti-spam is on'''
+		settings = ctx.bot.guild_settings.get(ctx.guild.id)
+		await ctx.embed_reply(fields = (("Threshold", f"{settings.mention_spam_threshold} mentions"), 
+										("Window", f"{settings.mention_spam_window:g} seconds")))
+	
+	@settings_mention_spam.command(name = "threshold")
+	@commands.guild_only()
+	@checks.is_permitted()
+	async def settings_mention_spam_threshold(self, ctx, mentions : int):
+		'''Number of mentions in a message above which it's mention spam'''
+		if mentions < 1:
+			return await ctx.embed_reply(":no_entry: Threshold must be at least 1")
+		await ctx.bot.guild_settings.set(ctx.guild.id, "mention_spam_threshold", mentions)
+		await ctx.embed_reply(f"Mention spam threshold set to {mentions} mentions")
+	
+	@settings_mention_spam.command(name = "window")
+	@commands.guild_only()
+	@checks.is_permitted()
+	async def settings_mention_spam_window(self, ctx, seconds : int):
+		'''Seconds a mention spam warning lasts before it expires'''
+		if seconds < 1:
+			return await ctx.embed_reply(":no_entry: Window must be at least 1 second")
+		await ctx.bot.guild_settings.set(ctx.guild.id, "mention_spam_window", seconds)
+		await ctx.embed_reply(f"Mention spam window set to {seconds} seconds")
+	
 	@settings.group(name = "logs", aliases = ["log"])
 	@commands.guild_only()
 	@checks.is_permitted()
@@ -75,16 +110,20 @@ class Server:
 	@settings_logs.command(name = "channel")
 	@commands.guild_only()
 	@checks.is_permitted()
-	async def settings_logs_channel(self, ctx):
+	async def settings_logs_channel(self, ctx, channel : discord.TextChannel = None):
 		'''WIP'''
-		...
+		if not channel:
+			channel_id = ctx.bot.guild_settings.get(ctx.guild.id).logs_channel
+			return await ctx.embed_reply(f"Logs channel: {f'<#{channel_id}>' if channel_id else None}")
+		await ctx.bot.guild_settings.set(ctx.guild.id, "logs_channel", channel.id)
+		await ctx.embed_reply(f"Logs channel set to {channel.mention}")
 	
 	@settings_logs.command(name = "typing", aliases = ["type"])
 	@commands.guild_only()
 	@checks.is_permitted()
-	async def settings_logs_typing(self, ctx):
+	async def settings_logs_typing(self, ctx, setting : bool = None):
 		'''WIP'''
-		...
+		await self.toggle_setting(ctx, "logs_typing", setting)
 	
 	@settings_logs.group(name = "message", aliases = ["messages"])
 	@commands.guild_only()
@@ -96,23 +135,23 @@ class Server:
 	@settings_logs_message.command(name = "send")
 	@commands.guild_only()
 	@checks.is_permitted()
-	async def settings_logs_message_send(self, ctx):
+	async def settings_logs_message_send(self, ctx, setting : bool = None):
 		'''WIP'''
-		...
+		await self.toggle_setting(ctx, "logs_message_send", setting)
 	
 	@settings_logs_message.command(name = "delete")
 	@commands.guild_only()
 	@checks.is_permitted()
-	async def settings_logs_message_delete(self, ctx):
+	async def settings_logs_message_delete(self, ctx, setting : bool = None):
 		'''WIP'''
-		...
+		await self.toggle_setting(ctx, "logs_message_delete", setting)
 	
 	@settings_logs_message.command(name = "edit")
 	@commands.guild_only()
 	@checks.is_permitted()
-	async def settings_logs_message_edit(self, ctx):
+	async def settings_logs_message_edit(self, ctx, setting : bool = None):
 		'''WIP'''
-		...
+		await self.toggle_setting(ctx, "logs_message_edit", setting)
 	
 	@settings_logs.group(name = "reaction", aliases = ["reactions"])
 	@commands.guild_only()
@@ -124,14 +163,14 @@ class Server:
 	@settings_logs_reaction.command(name = "add")
 	@commands.guild_only()
 	@checks.is_permitted()
-	async def settings_logs_reaction_add(self, ctx):
+	async def settings_logs_reaction_add(self, ctx, setting : bool = None):
 		'''WIP'''
-		...
+		await self.toggle_setting(ctx, "logs_reaction_add", setting)
 	
 	@settings_logs_reaction.command(name = "remove")
 	@commands.guild_only()
 	@checks.is_permitted()
-	async def settings_logs_reaction_remove(self, ctx):
+	async def settings_logs_reaction_remove(self, ctx, setting : bool = None):
 		'''WIP'''
-		...
+		await self.toggle_setting(ctx, "logs_reaction_remove", setting)
 
@@ -5,7 +5,6 @@ from discord.ext import commands
 import asyncio
 import difflib
 import imageio
-import json
 import matplotlib
 import numexpr
 import numpy
@@ -15,7 +14,6 @@ import random
 import re
 import seaborn
 import textwrap
-import time
 
 import clients
 from clients import py_code_block
@@ -31,9 +29,6 @@ class Tools:
 	
 	def __init__(self, bot):
 		self.bot = bot
-		clients.create_file("tags", content = {"global": {}})
-		with open(clients.data_path + "/tags.json", 'r') as tags_file:
-			self.tags_data = json.load(tags_file)
 	
 	@commands.command(aliases = ["choice", "pick"])
 	@checks.not_forbidden()
@@ -161,15 +156,13 @@ class Tools:
 		if not tag:
 			await ctx.embed_reply("Add a tag with `{0}tag add [tag] [content]`\nUse `{0}tag [tag]` to trigger the tag you added\n`{0}tag edit [tag] [content]` to edit it and `{0}tag delete [tag]` to delete it".format(ctx.prefix))
 			return
-		if tag in self.tags_data.get(str(ctx.author.id), {}).get("tags", []):
-			await ctx.reply(self.tags_data[str(ctx.author.id)]["tags"][tag])
-		elif tag in self.tags_data["global"]:
-			await ctx.reply(self.tags_data["global"][tag]["response"])
-			self.tags_data["global"][tag]["usage_counter"] += 1
-			with open(clients.data_path + "/tags.json", 'w') as tags_file:
-				json.dump(self.tags_data, tags_file, indent = 4)
+		content = await ctx.bot.repository.get_tag(ctx.author.id, tag)
+		if content is None:
+			content = await ctx.bot.repository.use_global_tag(tag)
+		if content is not None:
+			await ctx.reply(content)
 		else:
-			close_matches = difflib.get_close_matches(tag, list(self.tags_data.get(str(ctx.author.id), {}).get("tags", {}).keys()) + list(self.tags_data["global"].keys()))
+			close_matches = difflib.get_close_matches(tag, await ctx.bot.repository.get_tags(ctx.author.id) + await ctx.bot.repository.get_global_tag_names())
 			close_matches = "\nDid you mean:\n{}".format('\n'.join(close_matches)) if close_matches else ""
 			await ctx.embed_reply("Tag not found{}".format(close_matches))
 	
@@ -178,7 +171,7 @@ class Tools:
 		'''List your tags'''
 		if (await self.check_no_tags(ctx)): return
 		tags_paginator = paginator.CustomPaginator(seperator = ", ")
-		for tag in sorted(self.tags_data[str(ctx.author.id)]["tags"].keys()):
+		for tag in await ctx.bot.repository.get_tags(ctx.author.id):
 			tags_paginator.add_section(tag)
 		# DM
 		for page in tags_paginator.pages:
@@ -187,15 +180,9 @@ class Tools:
 	@tag.command(name = "add", aliases = ["make", "new", "create"])
 	async def tag_add(self, ctx, tag : str, *, content : str):
 		'''Add a tag'''
-		if not str(ctx.author.id) in self.tags_data:
-			self.tags_data[str(ctx.author.id)] = {"name" : ctx.author.name, "tags" : {}}
-		tags = self.tags_data[str(ctx.author.id)]["tags"]
-		if tag in tags:
+		if not await ctx.bot.repository.add_tag(ctx.author.id, tag, utilities.clean_content(content)):
 			await ctx.embed_reply("You already have that tag\nUse `{}tag edit <tag> <content>` to edit it".format(ctx.prefix))
 			return
-		tags[tag] = utilities.clean_content(content)
-		with open(clients.data_path + "/tags.json", 'w') as tags_file:
-			json.dump(self.tags_data, tags_file, indent = 4)
 		await ctx.embed_reply(":thumbsup::skin-tone-2: Your tag has been added")
 	
 	@tag.command(name = "edit", aliases = ["update"])
@@ -203,9 +190,7 @@ class Tools:
 		'''Edit one of your tags'''
 		if (await self.check_no_tags(ctx)): return
 		if (await self.check_no_tag(ctx, tag)): return
-		self.tags_data[str(ctx.author.id)]["tags"][tag] = utilities.clean_content(content)
-		with open(clients.data_path + "/tags.json", 'w') as tags_file:
-			json.dump(self.tags_data, tags_file, indent = 4)
+		await ctx.bot.repository.set_tag(ctx.author.id, tag, utilities.clean_content(content))
 		await ctx.embed_reply(":ok_hand::skin-tone-2: Your tag has been edited")
 	
 	@tag.command(name = "delete", aliases = ["remove", "destroy"])
@@ -213,38 +198,30 @@ class Tools:
 		'''Delete one of your tags'''
 		if (await self.check_no_tags(ctx)): return
 		if (await self.check_no_tag(ctx, tag)): return
-		try:
-			del self.tags_data[str(ctx.author.id)]["tags"][tag]
-		except KeyError:
+		if not await ctx.bot.repository.delete_tag(ctx.author.id, tag):
 			await ctx.embed_reply(":no_entry: Tag not found")
 			return
-		with open(clients.data_path + "/tags.json", 'w') as tags_file:
-			json.dump(self.tags_data, tags_file, indent = 4)
 		await ctx.embed_reply(":ok_hand::skin-tone-2: Your tag has been deleted")
 	
 	@tag.command(name = "expunge")
 	@commands.is_owner()
 	async def tag_expunge(self, ctx, owner : discord.Member, tag : str):
 		'''Delete someone else's tags'''
-		try:
-			del self.tags_data[str(owner.id)]["tags"][tag]
-		except KeyError:
+		if not await ctx.bot.repository.delete_tag(owner.id, tag):
 			await ctx.embed_reply(":no_entry: Tag not found")
 			return
-		with open(clients.data_path + "/tags.json", 'w') as tags_file:
-			json.dump(self.tags_data, tags_file, indent = 4)
 		await ctx.embed_reply(":ok_hand::skin-tone-2: {}'s tag has been deleted".format(owner.mention))
 	
 	@tag.command(name = "search", aliases = ["contains", "find"])
 	async def tag_search(self, ctx, *, search : str):
 		'''Search your tags'''
 		if (await self.check_no_tags(ctx)): return
-		tags = self.tags_data[str(ctx.author.id)]["tags"]
-		results = [t for t in tags.keys() if search in t]
+		tags = await ctx.bot.repository.get_tags(ctx.author.id)
+		results = [t for t in tags if search in t]
 		if results:
 			await ctx.embed_reply("{} tags found: {}".format(len(results), ", ".join(results)))
 			return
-		close_matches = difflib.get_close_matches(search, tags.keys())
+		close_matches = difflib.get_close_matches(search, tags)
 		close_matches = "\nDid you mean:\n{}".format('\n'.join(close_matches)) if close_matches else ""
 		await ctx.embed_reply("No tags found{}".format(close_matches))
 	
@@ -253,13 +230,9 @@ class Tools:
 		'''Globalize a tag'''
 		if (await self.check_no_tags(ctx)): return
 		if (await self.check_no_tag(ctx, tag)): return
-		if tag in self.tags_data["global"]:
+		if not await ctx.bot.repository.globalize_tag(ctx.author.id, tag):
 			await ctx.embed_reply("That global tag already exists\nIf you own it, use `{}tag global edit <tag> <content>` to edit it".format(ctx.prefix))
 			return
-		self.tags_data["global"][tag] = {"response": self.tags_data[str(ctx.author.id)]["tags"][tag], "owner": str(ctx.author.id), "created_at": time.time(), "usage_counter": 0}
-		del self.tags_data[str(ctx.author.id)]["tags"][tag]
-		with open(clients.data_path + "/tags.json", 'w') as tags_file:
-			json.dump(self.tags_data, tags_file, indent = 4)
 		await ctx.embed_reply(":thumbsup::skin-tone-2: Your tag has been {}d".format(ctx.invoked_with))
 	
 	# TODO: rename, aliases
@@ -272,59 +245,49 @@ class Tools:
 	@tag_global.command(name = "add", aliases = ["make", "new", "create"])
 	async def tag_global_add(self, ctx, tag : str, *, content : str):
 		'''Add a global tag'''
-		tags = self.tags_data["global"]
-		if tag in tags:
+		if not await ctx.bot.repository.add_global_tag(tag, utilities.clean_content(content), ctx.author.id):
 			await ctx.embed_reply("That global tag already exists\nIf you own it, use `{}tag global edit <tag> <content>` to edit it".format(ctx.prefix))
 			return
-		tags[tag] = {"response": utilities.clean_content(content), "owner": str(ctx.author.id), "created_at": time.time(), "usage_counter": 0}
-		with open(clients.data_path + "/tags.json", 'w') as tags_file:
-			json.dump(self.tags_data, tags_file, indent = 4)
 		await ctx.embed_reply(":thumbsup::skin-tone-2: Your tag has been added")
 	
 	@tag_global.command(name = "edit", aliases = ["update"])
 	async def tag_global_edit(self, ctx, tag : str, *, content : str):
 		'''Edit one of your global tags'''
-		if tag not in self.tags_data["global"]:
-			await ctx.embed_reply(":no_entry: That global tag doesn't exist")
-			return
-		elif self.tags_data["global"][tag]["owner"] != str(ctx.author.id):
-			await ctx.embed_reply(":no_entry: You don't own that global tag")
-			return
-		self.tags_data["global"][tag]["response"] = utilities.clean_content(content)
-		with open(clients.data_path + "/tags.json", 'w') as tags_file:
-			json.dump(self.tags_data, tags_file, indent = 4)
+		if (await self.check_not_global_tag_owner(ctx, tag)): return
+		await ctx.bot.repository.set_global_tag(tag, utilities.clean_content(content))
 		await ctx.embed_reply(":ok_hand::skin-tone-2: Your tag has been edited")
 	
 	@tag_global.command(name = "delete", aliases = ["remove", "destroy"])
 	async def tag_global_delete(self, ctx, tag : str):
 		'''Delete one of your global tags'''
-		if tag not in self.tags_data["global"]:
-			await ctx.embed_reply(":no_entry: That global tag doesn't exist")
-			return
-		elif self.tags_data["global"][tag]["owner"] != str(ctx.author.id):
-			await ctx.embed_reply(":no_entry: You don't own that global tag")
-			return
-		del self.tags_data["global"][tag]
-		with open(clients.data_path + "/tags.json", 'w') as tags_file:
-			json.dump(self.tags_data, tags_file, indent = 4)
+		if (await self.check_not_global_tag_owner(ctx, tag)): return
+		await ctx.bot.repository.delete_global_tag(tag)
 		await ctx.embed_reply(":ok_hand::skin-tone-2: Your tag has been deleted")
 	
 	# TODO: global search, list?
 	
 	async def check_no_tags(self, ctx):
-		no_tags = str(ctx.author.id) not in self.tags_data or not self.tags_data[str(ctx.author.id)]["tags"]
+		no_tags = not await ctx.bot.repository.get_tags(ctx.author.id)
 		if no_tags:
 			await ctx.embed_reply("You don't have any tags :slight_frown:\nAdd one with `{}{} add <tag> <content>`".format(ctx.prefix, ctx.invoked_with))
 			# TODO: Fix invoked_with for subcommands
 		return no_tags
 	
 	async def check_no_tag(self, ctx, tag):
-		tags = self.tags_data[str(ctx.author.id)]["tags"]
-		if tag not in tags:
-			close_matches = difflib.get_close_matches(tag, tags.keys())
+		no_tag = await ctx.bot.repository.get_tag(ctx.author.id, tag) is None
+		if no_tag:
+			close_matches = difflib.get_close_matches(tag, await ctx.bot.repository.get_tags(ctx.author.id))
 			close_matches = "\nDid you mean:\n{}".format('\n'.join(close_matches)) if close_matches else ""
 			await ctx.embed_reply("You don't have that tag{}".format(close_matches))
-		return tag not in tags
+		return no_tag
+	
+	async def check_not_global_tag_owner(self, ctx, tag):
+		global_tag = await ctx.bot.repository.get_global_tag(tag)
+		if not global_tag:
+			await ctx.embed_reply(":no_entry: That global tag doesn't exist")
+		elif global_tag["owner"] != ctx.author.id:
+			await ctx.embed_reply(":no_entry: You don't own that global tag")
+		return not global_tag or global_tag["owner"] != ctx.author.id
 	
 	@commands.command()
 	@checks.not_forbidden()
@@ -24,9 +24,7 @@ class Twitch:
 		self.bot = bot
 		self.streams_announced = {}
 		self.old_streams_announced = {}
-		clients.create_file("twitch_streams", content = {"channels" : {}})
-		with open(clients.data_path + "/twitch_streams.json", 'r') as streams_file:
-			self.streams_info = json.load(streams_file)
+		self.streams_info = self.bot.document_store.open(clients.data_path + "/twitch_streams.json", default = {"channels": {}})
 		self.task = self.bot.loop.create_task(self.check_twitch_streams())
 	
 	def __unload(self):
@@ -54,8 +52,7 @@ class Twitch:
 			channel["filters"].append(string)
 		else:
 			self.streams_info["channels"][str(ctx.channel.id)] = {"name": ctx.channel.name, "filters": [string], "games": [], "keywords": [], "streams": []}
-		with open(clients.data_path + "/twitch_streams.json", 'w') as streams_file:
-			json.dump(self.streams_info, streams_file, indent = 4)
+		self.streams_info.mark_dirty()
 		await ctx.embed_reply("Added the filter, `{}`, to this text channel\n"
 		"I will now filter all streams for this string in the title".format(string))
 	
@@ -70,8 +67,7 @@ class Twitch:
 			channel["games"].append(game)
 		else:
 			self.streams_info["channels"][str(ctx.channel.id)] = {"name": ctx.channel.name, "filters": [], "games": [game], "keywords": [], "streams": []}
-		with open(clients.data_path + "/twitch_streams.json", 'w') as streams_file:
-			json.dump(self.streams_info, streams_file, indent = 4)
+		self.streams_info.mark_dirty()
 		await ctx.embed_reply("Added the game, [`{0}`](https://www.twitch.tv/directory/game/{0}), to this text channel\n"
 		"I will now announce here when Twitch streams playing this game go live".format(game))
 	
@@ -86,8 +82,7 @@ class Twitch:
 			channel["keywords"].append(keyword)
 		else:
 			self.streams_info["channels"][str(ctx.channel.id)] = {"name": ctx.channel.name, "filters": [], "games": [], "keywords": [keyword], "streams": []}
-		with open(clients.data_path + "/twitch_streams.json", 'w') as streams_file:
-			json.dump(self.streams_info, streams_file, indent = 4)
+		self.streams_info.mark_dirty()
 		await ctx.embed_reply("Added the keyword search, `{}`, to this text channel\n"
 		"I will now announce here when Twitch streams with this keyword go live".format(keyword))
 	
@@ -101,8 +96,7 @@ class Twitch:
 			channel["streams"].append(username)
 		else:
 			self.streams_info["channels"][str(ctx.channel.id)] = {"name": ctx.channel.name, "filters": [], "games": [], "keywords": [], "streams": [username]}
-		with open(clients.data_path + "/twitch_streams.json", 'w') as streams_file:
-			json.dump(self.streams_info, streams_file, indent = 4)
+		self.streams_info.mark_dirty()
 		await ctx.embed_reply("Added the Twitch channel, [`{0}`](https://www.twitch.tv/{0}), to this text channel\n"
 		"I will now announce here when this Twitch channel goes live".format(username))
 	
@@ -121,8 +115,7 @@ class Twitch:
 			await ctx.embed_reply(":no_entry: This text channel doesn't have that filter")
 			return
 		channel["filters"].remove(filter)
-		with open(clients.data_path + "/twitch_streams.json", 'w') as streams_file:
-			json.dump(self.streams_info, streams_file, indent = 4)
+		self.streams_info.mark_dirty()
 		await ctx.embed_reply("Removed the filter, `{}`, from this text channel".format(string))
 	
 	@twitch_remove.command(name = "game")
@@ -134,8 +127,7 @@ class Twitch:
 			await ctx.embed_reply(":no_entry: This text channel isn't following that game")
 			return
 		channel["games"].remove(game)
-		with open(clients.data_path + "/twitch_streams.json", 'w') as streams_file:
-			json.dump(self.streams_info, streams_file, indent = 4)
+		self.streams_info.mark_dirty()
 		await ctx.embed_reply("Removed the game, [`{0}`](https://www.twitch.tv/directory/game/{0}), from this text channel".format(game))
 	
 	@twitch_remove.command(name = "keyword", aliases = ["query", "search"])
@@ -147,8 +139,7 @@ class Twitch:
 			await ctx.embed_reply(":no_entry: This text channel isn't following that keyword")
 			return
 		channel["keywords"].remove(keyword)
-		with open(clients.data_path + "/twitch_streams.json", 'w') as streams_file:
-			json.dump(self.streams_info, streams_file, indent = 4)
+		self.streams_info.mark_dirty()
 		await ctx.embed_reply("Removed the Twitch keyword search, `{}`, from this text channel".format(keyword))
 	
 	@twitch_remove.command(name = "channel", aliases = ["stream"])
@@ -160,8 +151,7 @@ class Twitch:
 			await ctx.embed_reply(":no_entry: This text channel isn't following that Twitch channel")
 			return
 		channel["streams"].remove(username)
-		with open(clients.data_path + "/twitch_streams.json", 'w') as streams_file:
-			json.dump(self.streams_info, streams_file, indent = 4)
+		self.streams_info.mark_dirty()
 		await ctx.embed_reply("Removed the Twitch channel, [`{0}`](https://www.twitch.tv/{0}), from this text channel".format(username))
 	
 	@twitch.command(name = "filters")
@@ -190,6 +180,8 @@ class Twitch:
 	
 	async def check_twitch_streams(self):
 		await self.bot.wait_until_ready()
+		if not self.bot.cluster.feeds:
+			return
 		try:
 			if os.path.isfile(clients.data_path + "/temp/twitch_streams_announced.json"):
 				with open(clients.data_path + "/temp/twitch_streams_announced.json", 'r') as streams_file:
@@ -198,7 +190,7 @@ class Twitch:
 				self.streams_announced = {int(k): v for k, v in self.streams_announced.items()}
 				for announced_stream_id, announcements in self.streams_announced.items():
 					for announcement in announcements:
-						text_channel = self.bot.get_channel(int(announcement[2]))
+						text_channel = self.bot.get_feed_channel(int(announcement[2]))
 						# TODO: Handle text channel not existing anymore
 						try:
 							announcement[0] = await text_channel.get_message(announcement[0])
@@ -231,7 +223,6 @@ class Twitch:
 					streams = games_data.get("streams", [])
 					stream_ids += [stream["_id"] for stream in streams]
 					await self.process_twitch_streams(streams, "games", match = game)
-					await asyncio.sleep(1)
 				# Keywords
 				keywords = set(itertools.chain(*[channel["keywords"] for channel in self.streams_info["channels"].values()]))
 				for keyword in keywords:
@@ -240,7 +231,6 @@ class Twitch:
 					streams = keywords_data.get("streams", [])
 					stream_ids += [stream["_id"] for stream in streams]
 					await self.process_twitch_streams(streams, "keywords", match = keyword)
-					await asyncio.sleep(1)
 				# Streams
 				streams = set(itertools.chain(*[channel["streams"] for channel in self.streams_info["channels"].values()]))
 				async with clients.aiohttp_session.get("https://api.twitch.tv/kraken/streams?channel={}&client_id={}&limit=100".format(','.join(streams), self.bot.TWITCH_CLIENT_ID)) as resp:
@@ -300,10 +290,13 @@ class Twitch:
 						if stream["channel"]["logo"]: embed.set_thumbnail(url = stream["channel"]["logo"])
 						embed.add_field(name = "Followers", value = stream["channel"]["followers"])
 						embed.add_field(name = "Views", value = stream["channel"]["views"])
-						text_channel = self.bot.get_channel(int(channel_id))
+						text_channel = self.bot.get_feed_channel(int(channel_id))
 						if not text_channel:
 							# TODO: Remove text channel data if now non-existent
 							continue
-						message = await text_channel.send(embed = embed)
+						try:
+							message = await text_channel.send(embed = embed)
+						except discord.NotFound:
+							continue
 						self.streams_announced[stream["_id"]] = self.streams_announced.get(stream["_id"], []) + [[message, embed]]
 
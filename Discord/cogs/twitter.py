@@ -4,7 +4,6 @@ from discord.ext import commands
 
 import asyncio
 import html
-import json
 import sys
 import traceback
 import tweepy
@@ -12,6 +11,7 @@ import tweepy
 import clients
 from modules import logging
 from utilities import checks
+from utilities import errors
 
 def setup(bot):
 	bot.add_cog(Twitter(bot))
@@ -30,7 +30,8 @@ class TwitterStreamListener(tweepy.StreamListener):
 		self.reconnecting = False
 	
 	def __del__(self):
-		self.stream.disconnect()
+		if self.stream:
+			self.stream.disconnect()
 	
 	async def start_feeds(self, *, feeds = None):
 		if self.reconnecting:
@@ -50,14 +51,15 @@ class TwitterStreamListener(tweepy.StreamListener):
 		self.reconnecting = False
 	
 	async def add_feed(self, channel, handle):
-		id = self.bot.twitter_api.get_user(handle).id_str
+		id = (await self.bot.executors.run("tweepy", self.bot.twitter_api.get_user, handle)).id_str
 		self.feeds[str(channel.id)] = self.feeds.get(str(channel.id), []) + [id]
 		if id not in self.unique_feeds:
 			self.unique_feeds.add(id)
 			await self.start_feeds()
 	
 	async def remove_feed(self, channel, handle):
-		self.feeds[str(channel.id)].remove(self.bot.twitter_api.get_user(handle).id_str)
+		user = await self.bot.executors.run("tweepy", self.bot.twitter_api.get_user, handle)
+		self.feeds[str(channel.id)].remove(user.id_str)
 		self.unique_feeds = set(id for feeds in self.feeds.values() for id in feeds)
 		await self.start_feeds()  # Necessary?
 	
@@ -71,7 +73,7 @@ class TwitterStreamListener(tweepy.StreamListener):
 			# TODO: Settings for including replies, retweets, etc.
 			for channel_id, channel_feeds in self.feeds.items():
 				if status.user.id_str in channel_feeds:
-					channel = self.bot.get_channel(int(channel_id))
+					channel = self.bot.get_feed_channel(int(channel_id))
 					if channel:
 						if hasattr(status, "extended_tweet"):
 							text = status.extended_tweet["full_text"]
@@ -90,7 +92,13 @@ class TwitterStreamListener(tweepy.StreamListener):
 							embed.set_image(url = extended_entities["media"][0]["media_url_https"])
 							embed.description = embed.description.replace(extended_entities["media"][0]["url"], "")
 						embed.set_footer(text = "Twitter", icon_url = self.bot.twitter_icon_url)
-						self.bot.loop.create_task(channel.send(embed = embed))
+						self.bot.loop.create_task(self.send_status(channel, embed))
+	
+	async def send_status(self, channel, embed):
+		try:
+			await channel.send(embed = embed)
+		except (discord.Forbidden, discord.NotFound):
+			pass
 	
 	def on_error(self, status_code):
 		print(f"Twitter Error: {status_code}")
@@ -100,29 +108,46 @@ class Twitter:
 	
 	def __init__(self, bot):
 		self.bot = bot
-		clients.create_file("twitter_feeds", content = {"channels" : {}})
-		with open(clients.data_path + "/twitter_feeds.json", 'r') as feeds_file:
-			self.feeds_info = json.load(feeds_file)
+		self.feeds_info = self.bot.document_store.open(clients.data_path + "/twitter_feeds.json", default = {"channels": {}})
 		self.blacklisted_handles = []
-		try:
-			twitter_account = self.bot.twitter_api.verify_credentials()
-			if twitter_account.protected:
-				self.blacklisted_handles.append(twitter_account.screen_name.lower())
-			# TODO: Handle more than 5000 friends/following
-			twitter_friends = self.bot.twitter_api.friends_ids(screen_name = twitter_account.screen_name)
-			for interval in range(0, len(twitter_friends), 100):
-				some_friends = self.bot.twitter_api.lookup_users(twitter_friends[interval:interval + 100])
-				for friend in some_friends:
-					if friend.protected:
-						self.blacklisted_handles.append(friend.screen_name.lower())
-		except tweepy.error.TweepError as e:
-			print(f"{self.bot.console_message_prefix}Failed to initialize Twitter cog blacklist: {e}")
+		# Protected accounts can only be blacklisted with the client, so the cog is unavailable until reloaded with it
+		self.available = self.bot.twitter_api is not None
+		if not self.available:
+			print(f"{self.bot.console_message_prefix}Twitter client unavailable, disabling Twitter cog until reloaded")
+		else:
+			try:
+				twitter_account = self.bot.twitter_api.verify_credentials()
+				if twitter_account.protected:
+					self.blacklisted_handles.append(twitter_account.screen_name.lower())
+				# TODO: Handle more than 5000 friends/following
+				twitter_friends = self.bot.twitter_api.friends_ids(screen_name = twitter_account.screen_name)
+				for interval in range(0, len(twitter_friends), 100):
+					some_friends = self.bot.twitter_api.lookup_users(twitter_friends[interval:interval + 100])
+					for friend in some_friends:
+						if friend.protected:
+							self.blacklisted_handles.append(friend.screen_name.lower())
+			except tweepy.error.TweepError as e:
+				print(f"{self.bot.console_message_prefix}Failed to initialize Twitter cog blacklist: {e}")
 		self.stream_listener = TwitterStreamListener(bot, self.blacklisted_handles)
 		self.task = self.bot.loop.create_task(self.start_twitter_feeds())
+		if self.bot.cluster.feeds:
+			self.feeds_info.listeners.append(self.feeds_changed)
 	
 	def __unload(self):
-		self.stream_listener.stream.disconnect()
+		if self.stream_listener.stream:
+			self.stream_listener.stream.disconnect()
 		self.task.cancel()
+		if self.feeds_changed in self.feeds_info.listeners:
+			self.feeds_info.listeners.remove(self.feeds_changed)
+	
+	def feeds_changed(self, document):
+		# Handles added or removed on another cluster
+		self.task = self.bot.loop.create_task(self.start_twitter_feeds())
+	
+	def __local_check(self, ctx):
+		if not self.available:
+			raise errors.ServiceUnavailable("Twitter")
+		return True
 	
 	@commands.group(invoke_without_command = True)
 	@checks.is_permitted()
@@ -142,11 +167,10 @@ class Twitter:
 		if handle.lower().strip('@') in self.blacklisted_handles:
 			return await ctx.embed_reply(":no_entry: Error: Unauthorized")
 		try:
-			for status in tweepy.Cursor(self.bot.twitter_api.user_timeline, screen_name = handle, 
+			statuses = tweepy.Cursor(self.bot.twitter_api.user_timeline, screen_name = handle, 
 										exclude_replies = not replies, include_rts = retweets, 
-										tweet_mode = "extended", count = 200).items():
-				tweet = status
-				break
+										tweet_mode = "extended", count = 200).items()
+			tweet = await self.bot.executors.run("tweepy", next, statuses, None)
 		except tweepy.error.TweepError as e:
 			if e.api_code == 34:
 				return await ctx.embed_reply(f":no_entry: Error: @{handle} not found")
@@ -177,7 +201,11 @@ class Twitter:
 		message = await ctx.embed_reply(":hourglass: Please wait")
 		embed = message.embeds[0]
 		try:
-			await self.stream_listener.add_feed(ctx.channel, handle)
+			if self.bot.cluster.feeds:
+				await self.stream_listener.add_feed(ctx.channel, handle)
+			else:
+				# Only validated here, as the feed cluster streams it once it merges in the feeds file
+				await self.bot.executors.run("tweepy", self.bot.twitter_api.get_user, handle)
 		except tweepy.error.TweepError as e:
 			embed.description = ":no_entry: Error: {}".format(e)
 			await message.edit(embed = embed)
@@ -186,8 +214,7 @@ class Twitter:
 			self.feeds_info["channels"][str(ctx.channel.id)]["handles"].append(handle)
 		else:
 			self.feeds_info["channels"][str(ctx.channel.id)] = {"name" : ctx.channel.name, "handles" : [handle]}
-		with open(clients.data_path + "/twitter_feeds.json", 'w') as feeds_file:
-			json.dump(self.feeds_info, feeds_file, indent = 4)
+		self.feeds_info.mark_dirty()
 		embed.description = "Added the Twitter handle, [`{0}`](https://twitter.com/{0}), to this text channel".format(handle)
 		await message.edit(embed = embed)
 	
@@ -203,10 +230,10 @@ class Twitter:
 		except ValueError:
 			await ctx.embed_reply(":no_entry: This text channel isn't following that Twitter handle")
 		else:
-			with open(clients.data_path + "/twitter_feeds.json", 'w') as feeds_file:
-				json.dump(self.feeds_info, feeds_file, indent = 4)
+			self.feeds_info.mark_dirty()
 			message = await ctx.embed_reply(":hourglass: Please wait")
-			await self.stream_listener.remove_feed(ctx.channel, handle)
+			if self.bot.cluster.feeds:
+				await self.stream_listener.remove_feed(ctx.channel, handle)
 			embed = message.embeds[0]
 			embed.description = "Removed the Twitter handle, [`{0}`](https://twitter.com/{0}), from this text channel.".format(handle)
 			await message.edit(embed = embed)
@@ -239,12 +266,15 @@ class Twitter:
 	# TODO: move to on_ready
 	async def start_twitter_feeds(self):
 		await self.bot.wait_until_ready()
+		if not self.bot.cluster.feeds or not self.available:
+			return
 		feeds = {}
 		try:
 			for channel_id, channel_info in self.feeds_info["channels"].items():
 				for handle in channel_info["handles"]:
 					try:
-						feeds[channel_id] = feeds.get(channel_id, []) + [self.bot.twitter_api.get_user(handle).id_str]
+						user = await self.bot.executors.run("tweepy", self.bot.twitter_api.get_user, handle)
+						feeds[channel_id] = feeds.get(channel_id, []) + [user.id_str]
 					except tweepy.error.TweepError as e:
 						if e.api_code == 50:
 							# User not found
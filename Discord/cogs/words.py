@@ -14,19 +14,23 @@ class Words:
 	
 	@commands.command(aliases = ["antonyms"])
 	@checks.not_forbidden()
+	@checks.external_client_available("Wordnik")
 	async def antonym(self, ctx, word : str):
 		'''Antonyms of a word'''
-		antonyms = self.bot.wordnik_word_api.getRelatedWords(word, relationshipTypes = "antonym", 
-																useCanonical = "true", limitPerRelationshipType = 100)
+		antonyms = await self.bot.executors.run("wordnik", self.bot.wordnik_word_api.getRelatedWords, word, 
+												relationshipTypes = "antonym", useCanonical = "true", 
+												limitPerRelationshipType = 100)
 		if not antonyms:
 			return await ctx.embed_reply(":no_entry: Word or antonyms not found")
 		await ctx.embed_reply(", ".join(antonyms[0].words), title = f"Antonyms of {word.capitalize()}")
 	
 	@commands.command(aliases = ["dictionary"])
 	@checks.not_forbidden()
+	@checks.external_client_available("Wordnik")
 	async def define(self, ctx, word : str):
 		'''Define a word'''
-		definition = self.bot.wordnik_word_api.getDefinitions(word, limit = 1)  # useCanonical = True ?
+		definition = await self.bot.executors.run("wordnik", self.bot.wordnik_word_api.getDefinitions, word, 
+													limit = 1)  # useCanonical = True ?
 		if not definition:
 			return await ctx.embed_reply(":no_entry: Definition not found")
 		await ctx.embed_reply(definition[0].text, title = definition[0].word.capitalize(), 
@@ -34,11 +38,13 @@ class Words:
 	
 	@commands.command(aliases = ["audiodefine", "pronounce"])
 	@checks.not_forbidden()
+	@checks.external_client_available("Wordnik")
 	async def pronunciation(self, ctx, word : str):
 		'''Pronunciation of a word'''
-		pronunciation = self.bot.wordnik_word_api.getTextPronunciations(word, limit = 1)
+		pronunciation = await self.bot.executors.run("wordnik", self.bot.wordnik_word_api.getTextPronunciations, 
+														word, limit = 1)
 		description = pronunciation[0].raw.strip("()") if pronunciation else "Audio File Link"
-		audio_file = self.bot.wordnik_word_api.getAudio(word, limit = 1)
+		audio_file = await self.bot.executors.run("wordnik", self.bot.wordnik_word_api.getAudio, word, limit = 1)
 		if audio_file:
 			description = f"[{description}]({audio_file[0].fileUrl})"
 		elif not pronunciation:
@@ -47,10 +53,11 @@ class Words:
 	
 	@commands.command(aliases = ["rhymes"])
 	@checks.not_forbidden()
+	@checks.external_client_available("Wordnik")
 	async def rhyme(self, ctx, word : str):
 		'''Rhymes of a word'''
-		rhymes = self.bot.wordnik_word_api.getRelatedWords(word, relationshipTypes = "rhyme", 
-															limitPerRelationshipType = 100)
+		rhymes = await self.bot.executors.run("wordnik", self.bot.wordnik_word_api.getRelatedWords, word, 
+												relationshipTypes = "rhyme", limitPerRelationshipType = 100)
 		if not rhymes:
 			return await ctx.embed_reply(":no_entry: Word or rhymes not found")
 		await ctx.embed_reply(", ".join(rhymes[0].words), 
@@ -77,10 +84,12 @@ class Words:
 	
 	@commands.command(aliases = ["synonyms"])
 	@checks.not_forbidden()
+	@checks.external_client_available("Wordnik")
 	async def synonym(self, ctx, word : str):
 		'''Synonyms of a word'''
-		synonyms = self.bot.wordnik_word_api.getRelatedWords(word, relationshipTypes = "synonym", 
-																useCanonical = "true", limitPerRelationshipType = 100)
+		synonyms = await self.bot.executors.run("wordnik", self.bot.wordnik_word_api.getRelatedWords, word, 
+												relationshipTypes = "synonym", useCanonical = "true", 
+												limitPerRelationshipType = 100)
 		if not synonyms:
 			return await ctx.embed_reply(":no_entry: Word or synonyms not found")
 		await ctx.embed_reply(", ".join(synonyms[0].words), title = f"Synonyms of {word.capitalize()}")
@@ -45,14 +45,10 @@ class YouTube:
 		utilities.add_as_subcommand(self, self.youtube_streams, "Audio.audio", "streams", aliases = ["stream"])
 		utilities.add_as_subcommand(self, self.youtube_uploads, "Audio.audio", "uploads", aliases = ["videos"])
 		
-		clients.create_file("youtube_streams", content = {"channels" : {}})
-		with open(clients.data_path + "/youtube_streams.json", 'r') as streams_file:
-			self.streams_info = json.load(streams_file)
+		self.streams_info = self.bot.document_store.open(clients.data_path + "/youtube_streams.json", default = {"channels": {}})
 		self.streams_task = self.bot.loop.create_task(self.check_youtube_streams())
 		
-		clients.create_file("youtube_uploads", content = {"channels" : {}})
-		with open(clients.data_path + "/youtube_uploads.json", 'r') as uploads_file:
-			self.uploads_info = json.load(uploads_file)
+		self.uploads_info = self.bot.document_store.open(clients.data_path + "/youtube_uploads.json", default = {"channels": {}})
 		self.youtube_uploads_following = set(channel_id for channels in self.uploads_info["channels"].values() for channel_id in channels["yt_channel_ids"])
 		self.renew_uploads_task = self.bot.loop.create_task(self.renew_upload_supscriptions())
 	
@@ -68,6 +64,8 @@ class YouTube:
 	# TODO: use on_ready instead?
 	# TODO: renew after hub.lease_seconds?
 	async def renew_upload_supscriptions(self):
+		if not self.bot.cluster.feeds:
+			return
 		for channel_id in self.youtube_uploads_following:
 			url = "https://pubsubhubbub.appspot.com/"
 			headers = {"content-type": "application/x-www-form-urlencoded"}
@@ -101,8 +99,7 @@ class YouTube:
 			channel["channel_ids"].append(channel_id)
 		else:
 			self.streams_info["channels"][str(ctx.channel.id)] = {"name": ctx.channel.name, "channel_ids": [channel_id]}
-		with open(clients.data_path + "/youtube_streams.json", 'w') as streams_file:
-			json.dump(self.streams_info, streams_file, indent = 4)
+		self.streams_info.mark_dirty()
 		await ctx.embed_reply("Added the Youtube channel, [`{0}`](https://www.youtube.com/channel/{0}), to this text channel\n"
 		"I will now announce here when this Youtube channel goes live".format(channel_id))
 	
@@ -115,8 +112,7 @@ class YouTube:
 			await ctx.embed_reply(":no_entry: This text channel isn't following that Youtube channel")
 			return
 		channel["channel_ids"].remove(channel_id)
-		with open(clients.data_path + "/youtube_streams.json", 'w') as streams_file:
-			json.dump(self.streams_info, streams_file, indent = 4)
+		self.streams_info.mark_dirty()
 		await ctx.embed_reply("Removed the Youtube channel, [`{0}`](https://www.youtube.com/channel/{0}), from this text channel".format(channel_id))
 	
 	@youtube_streams.command(name = "channels", aliases = ["streams"])
@@ -127,17 +123,24 @@ class YouTube:
 	
 	async def check_youtube_streams(self):
 		await self.bot.wait_until_ready()
+		if not self.bot.cluster.feeds:
+			return
 		if os.path.isfile(clients.data_path + "/temp/youtube_streams_announced.json"):
 			with open(clients.data_path + "/temp/youtube_streams_announced.json", 'r') as streams_file:
 				self.streams_announced = json.load(streams_file)
 			for announced_video_id, announcements in self.streams_announced.items():
 				for announcement in announcements:
-					text_channel = self.bot.get_channel(int(announcement[2]))
+					text_channel = self.bot.get_feed_channel(int(announcement[2]))
 					# TODO: Handle text channel not existing anymore
-					announcement[0] = await text_channel.get_message(int(announcement[0]))
-					# TODO: Handle message deleted
+					try:
+						announcement[0] = await text_channel.get_message(int(announcement[0]))
+					except discord.NotFound:
+						# Announcement or channel was deleted
+						continue
 					announcement[1] = discord.Embed(title = announcement[1]["title"], description = announcement[1].get("description"), url = announcement[1]["url"], timestamp = dateutil.parser.parse(announcement[1]["timestamp"]), color = announcement[1]["color"]).set_thumbnail(url = announcement[1]["thumbnail"]["url"]).set_author(name = announcement[1]["author"]["name"], url = announcement[1]["author"]["url"], icon_url = announcement[1]["author"]["icon_url"])
 					del announcement[2]
+				# Remove deleted announcements
+				self.streams_announced[announced_video_id] = [announcement for announcement in announcements if len(announcement) == 2]
 		## os.remove(clients.data_path + "/temp/youtube_streams_announced.json")
 		while not self.bot.is_closed():
 			try:
@@ -161,7 +164,7 @@ class YouTube:
 						elif video_id not in self.streams_announced:
 							for text_channel_id, channel_info in self.streams_info["channels"].items():
 								if channel_id in channel_info["channel_ids"]:
-									text_channel = self.bot.get_channel(int(text_channel_id))
+									text_channel = self.bot.get_feed_channel(int(text_channel_id))
 									if not text_channel:
 										# TODO: Remove text channel data if now non-existent
 										continue
@@ -169,10 +172,12 @@ class YouTube:
 									embed.set_author(name = "{} is live now on Youtube".format(item_data["channelTitle"]), url = "https://www.youtube.com/channel/" + item_data["channelId"], icon_url = self.bot.youtube_icon_url)
 									# TODO: Add channel icon as author icon?
 									embed.set_thumbnail(url = item_data["thumbnails"]["high"]["url"])
-									message = await text_channel.send(embed = embed)
+									try:
+										message = await text_channel.send(embed = embed)
+									except discord.NotFound:
+										continue
 									self.streams_announced[video_id] = self.streams_announced.get(video_id, []) + [[message, embed]]
 						video_ids.append(video_id)
-					await asyncio.sleep(1)
 				for announced_video_id, announcements in self.streams_announced.copy().items():
 					if announced_video_id not in video_ids:
 						for announcement in announcements:
@@ -233,8 +238,7 @@ class YouTube:
 				self.uploads_info["channels"][str(ctx.channel.id)]["yt_channel_ids"].remove(channel_id)
 				return
 		self.youtube_uploads_following.add(channel_id)
-		with open(clients.data_path + "/youtube_uploads.json", 'w') as uploads_file:
-			json.dump(self.uploads_info, uploads_file, indent = 4)
+		self.uploads_info.mark_dirty()
 		await ctx.embed_reply(f"Added the Youtube channel, "
 								f"[`{channel_id}`](https://www.youtube.com/channel/{channel_id}), "
 								"to this text channel\n"
@@ -260,8 +264,7 @@ class YouTube:
 				self.uploads_info["channels"][str(ctx.channel.id)]["yt_channel_ids"].append(channel_id)
 				self.youtube_uploads_following.add(channel_id)
 				return
-		with open(clients.data_path + "/youtube_uploads.json", 'w') as uploads_file:
-			json.dump(self.uploads_info, uploads_file, indent = 4)
+		self.uploads_info.mark_dirty()
 		await ctx.embed_reply("Removed the Youtube channel, "
 								f"[`{channel_id}`](https://www.youtube.com/channel/{channel_id}), "
 								"from this text channel")
@@ -297,9 +300,12 @@ class YouTube:
 			if duration: embed.description += "\nLength: {}".format(utilities.secs_to_letter_format(isodate.parse_duration(duration).total_seconds()))
 			for text_channel_id, channel_info in self.uploads_info["channels"].items():
 				if channel_id in channel_info["yt_channel_ids"]:
-					text_channel = self.bot.get_channel(int(text_channel_id))
+					text_channel = self.bot.get_feed_channel(int(text_channel_id))
 					if text_channel:
-						await text_channel.send(embed = embed)
+						try:
+							await text_channel.send(embed = embed)
+						except discord.NotFound:
+							pass
 					# TODO: Remove text channel data if now non-existent
 	
 	# TODO: get to remove as well
@@ -0,0 +1,65 @@
+
+'''
+Runs Harmonbot as multiple cluster processes, each with an auto-sharded client for a range of shards
+Clusters communicate through an IPC broker run here
+Usage: launcher.py [clusters] [beta]
+Set SHARD_COUNT to override Discord's recommended number of shards
+'''
+
+import asyncio
+import os
+import sys
+
+import aiohttp
+import dotenv
+
+from utilities.ipc import IPCBroker
+
+async def recommended_shard_count(token):
+	async with aiohttp.ClientSession() as session:
+		async with session.get("https://discordapp.com/api/v7/gateway/bot",
+								headers = {"Authorization": f"Bot {token}"}) as resp:
+			data = await resp.json()
+	return data["shards"]
+
+async def run_cluster(cluster_id, cluster_count, shard_ids, shard_count, ipc_port, arguments, delay):
+	# Staggered, as shards can only identify once every 5 seconds
+	await asyncio.sleep(delay)
+	environment = dict(os.environ, CLUSTER_ID = str(cluster_id), CLUSTER_COUNT = str(cluster_count),
+						SHARD_IDS = ','.join(map(str, shard_ids)), SHARD_COUNT = str(shard_count),
+						IPC_PORT = str(ipc_port))
+	while True:
+		print(f"Starting cluster {cluster_id} (shards {shard_ids[0]}-{shard_ids[-1]} of {shard_count})")
+		process = await asyncio.create_subprocess_exec(sys.executable, "Harmonbot.py", *arguments,
+														env = environment)
+		return_code = await process.wait()
+		# Restarted when stopped, as by Harmonbot.bat
+		print(f"Cluster {cluster_id} exited with code {return_code}, restarting")
+		await asyncio.sleep(5)
+
+async def main():
+	dotenv.load_dotenv()
+	arguments = [argument for argument in sys.argv[1:] if not argument.isdigit()]
+	beta = any("beta" in argument.lower() for argument in arguments)
+	token = os.getenv("DISCORD_BETA_BOT_TOKEN" if beta else "DISCORD_BOT_TOKEN")
+	shard_count = int(os.getenv("SHARD_COUNT") or await recommended_shard_count(token))
+	cluster_count = next((int(argument) for argument in sys.argv[1:] if argument.isdigit()), os.cpu_count() or 1)
+	cluster_count = min(cluster_count, shard_count)
+	ipc_port = int(os.getenv("IPC_PORT", 8765))
+	broker = IPCBroker(port = ipc_port)
+	await broker.start()
+	# Consecutive shards, split as evenly as possible between clusters
+	size, remainder = divmod(shard_count, cluster_count)
+	clusters = []
+	start = 0
+	for cluster_id in range(cluster_count):
+		end = start + size + (cluster_id < remainder)
+		clusters.append(list(range(start, end)))
+		start = end
+	await asyncio.gather(*(run_cluster(cluster_id, cluster_count, shard_ids, shard_count, ipc_port, arguments, 
+										5 * shard_ids[0]) 
+							for cluster_id, shard_ids in enumerate(clusters)))
+
+if __name__ == "__main__":
+	asyncio.get_event_loop().run_until_complete(main())
+
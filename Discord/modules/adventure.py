@@ -1,6 +1,5 @@
 
 import math
-import json
 import random
 import time
 import types
@@ -44,14 +43,11 @@ class AdventurePlayer:
 		self.user_id = user_id
 		_initial_data = initial_data.copy()
 		_initial_data["time_started"] = time.time()
-		clients.create_folder(clients.data_path + "/adventure_players")
-		clients.create_file("adventure_players/{}".format(user_id), content = _initial_data)
-		with open(clients.data_path + "/adventure_players/{}.json".format(user_id), 'r') as player_file:
-			self.data = json.load(player_file)
+		self.data = clients.client.document_store.open(clients.data_path + "/adventure_players/{}.json".format(user_id), 
+															default = _initial_data)
 			
 	def write_data(self):
-		with open(clients.data_path + "/adventure_players/{}.json".format(self.user_id), 'w') as player_file:
-			json.dump(self.data, player_file, indent = 4)
+		self.data.mark_dirty()
 	
 	def wood_rate(self, wood_type):
 		return max(0, math.log10(self.woodcutting_lvl / wood_lvl(wood_type)) + 1)
@@ -1,11 +1,17 @@
 
 import logging
-import logging.handlers
 import sys
 
 import clients
 
+sys.path.insert(0, "..")
+from units import queued_logging
+sys.path.pop(0)
+
 path = clients.data_path + "/logs/"
+if clients.cluster.sharded:
+	# Per cluster, as each cluster's handlers rotate their files independently, removing existing archives
+	path += f"cluster_{clients.cluster.id}/"
 clients.create_folder(path + "aiohttp")
 clients.create_folder(path + "chat")
 clients.create_folder(path + "discord")
@@ -13,8 +19,8 @@ clients.create_folder(path + "discord")
 # console log
 console_logger = logging.getLogger("console")
 console_logger.setLevel(logging.DEBUG)
-console_logger_handler = logging.FileHandler(filename = path + "console.log", encoding = "utf-8", mode = 'a')
-console_logger_handler.setFormatter(logging.Formatter("%(asctime)s: %(message)s"))
+console_logger_handler = queued_logging.file_handler(path + "console.log", 
+														formatter = logging.Formatter("%(asctime)s: %(message)s"))
 console_logger.addHandler(console_logger_handler)
 
 class Logger(object):
@@ -42,10 +48,10 @@ sys.stdout = Logger(console_logger.info)
 ## rename to exceptions?
 errors_logger = logging.getLogger("errors")
 errors_logger.setLevel(logging.DEBUG)
-errors_logger_handler_1 = logging.FileHandler(filename = path + "errors.log", encoding = "utf-8", mode = 'a')
-errors_logger_handler_1.setFormatter(logging.Formatter("\n\n%(asctime)s\n%(message)s"))
-errors_logger_handler_2 = logging.FileHandler(filename = path + "unresolved_errors.log", encoding = "utf-8", mode = 'a')
-errors_logger_handler_2.setFormatter(logging.Formatter("\n\n%(asctime)s\n%(message)s"))
+errors_logger_handler_1 = queued_logging.file_handler(path + "errors.log", 
+														formatter = logging.Formatter("\n\n%(asctime)s\n%(message)s"))
+errors_logger_handler_2 = queued_logging.file_handler(path + "unresolved_errors.log", 
+														formatter = logging.Formatter("\n\n%(asctime)s\n%(message)s"))
 errors_logger.addHandler(errors_logger_handler_1)
 errors_logger.addHandler(errors_logger_handler_2)
 
@@ -58,44 +64,60 @@ sys.excepthook = log_exception
 # discord.py log
 discord_logger = logging.getLogger("discord")
 discord_logger.setLevel(logging.INFO)
-discord_handler = logging.handlers.TimedRotatingFileHandler(filename = path + "discord/discord.log", when = "midnight", backupCount = 3650000, encoding = "utf-8")
-discord_handler.setFormatter(logging.Formatter("%(asctime)s:%(levelname)s:%(name)s: %(message)s"))
+discord_handler = queued_logging.file_handler(path + "discord/discord.log", when = "midnight", compress = True, 
+												formatter = logging.Formatter("%(asctime)s:%(levelname)s:%(name)s: %(message)s"))
 discord_logger.addHandler(discord_handler)
 
 # chat log
 chat_logger = logging.getLogger("chat")
 chat_logger.setLevel(logging.DEBUG)
-chat_logger_handler = logging.handlers.TimedRotatingFileHandler(filename = path + "chat/chat.log", when = "midnight", backupCount = 3650000, encoding = "utf-8")
+chat_logger_handler = queued_logging.file_handler(path + "chat/chat.log", when = "midnight", compress = True)
 chat_logger.addHandler(chat_logger_handler)
 
+def chat_log_entry(message):
+	'''
+	Chat log entry
+	Formatted on the event loop, as the message can change before the log writer gets to it
+	'''
+	log_entry = "{0.created_at}: [{0.id}] {0.author.display_name} ({0.author}) ({0.author.id}) in ".format(message)
+	if message.guild is None:
+		log_entry += "Direct Message"
+	else:
+		log_entry += "#{0.channel.name} ({0.channel.id}) [{0.guild.name} ({0.guild.id})]".format(message)
+	return log_entry + f": {message.content} {[embed.to_dict() for embed in message.embeds]}"
+
+def stop():
+	'''Write queued log records and stop the log writer'''
+	queued_logging.writer.stop()
+
 # handler to output to console
 console_handler = logging.StreamHandler(sys.stdout)
 
 # aiohttp server access log
 aiohttp_access_logger = logging.getLogger("aiohttp.access")
 aiohttp_access_logger.setLevel(logging.DEBUG)
-aiohttp_access_logger_handler = logging.FileHandler(filename = path + "aiohttp/access.log", encoding = "utf-8", mode = 'a')
-aiohttp_access_logger_handler.setFormatter(logging.Formatter("%(asctime)s: %(message)s"))
+aiohttp_access_logger_handler = queued_logging.file_handler(path + "aiohttp/access.log", 
+																formatter = logging.Formatter("%(asctime)s: %(message)s"))
 aiohttp_access_logger.addHandler(aiohttp_access_logger_handler)
 
 # aiohttp client log
 aiohttp_client_logger = logging.getLogger("aiohttp.client")
-aiohttp_client_logger_handler = logging.FileHandler(filename = path + "aiohttp/client.log", encoding = "utf-8", mode = 'a')
-aiohttp_client_logger_handler.setFormatter(logging.Formatter("%(asctime)s: %(message)s"))
+aiohttp_client_logger_handler = queued_logging.file_handler(path + "aiohttp/client.log", 
+																formatter = logging.Formatter("%(asctime)s: %(message)s"))
 aiohttp_client_logger.addHandler(aiohttp_client_logger_handler)
 
 # aiohttp server log
 aiohttp_server_logger = logging.getLogger("aiohttp.server")
 aiohttp_server_logger.setLevel(logging.DEBUG)
-aiohttp_server_logger_handler = logging.FileHandler(filename = path + "aiohttp/server.log", encoding = "utf-8", mode = 'a')
-aiohttp_server_logger_handler.setFormatter(logging.Formatter("%(asctime)s: %(message)s"))
+aiohttp_server_logger_handler = queued_logging.file_handler(path + "aiohttp/server.log", 
+																formatter = logging.Formatter("%(asctime)s: %(message)s"))
 aiohttp_server_logger.addHandler(aiohttp_server_logger_handler)
 ## aiohttp_server_logger.addHandler(console_handler)
 
 # aiohttp web log
 aiohttp_web_logger = logging.getLogger("aiohttp.web")
 aiohttp_web_logger.setLevel(logging.DEBUG)  # Necessary?
-aiohttp_web_logger_handler = logging.FileHandler(filename = path + "aiohttp/web.log", encoding = "utf-8", mode = 'a')
-aiohttp_web_logger_handler.setFormatter(logging.Formatter("%(asctime)s: %(message)s"))
+aiohttp_web_logger_handler = queued_logging.file_handler(path + "aiohttp/web.log", 
+																formatter = logging.Formatter("%(asctime)s: %(message)s"))
 aiohttp_web_logger.addHandler(aiohttp_web_logger_handler)
 
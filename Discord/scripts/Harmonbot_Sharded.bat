@@ -0,0 +1,4 @@
+cd ..\
+:loop
+py -3.7 launcher.py
+goto loop
\ No newline at end of file
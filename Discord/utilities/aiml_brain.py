@@ -0,0 +1,99 @@
+
+import asyncio
+import concurrent.futures
+import hashlib
+import os
+
+import aiml
+
+class AIMLBrain:
+	
+	'''
+	AIML kernel loaded in the background
+	The brain snapshot is rebuilt only when the AIML source files change
+	Loading and responding run in a dedicated thread, off the event loop
+	'''
+	
+	def __init__(self, loop, path, predicates, *, console_message_prefix = ""):
+		self.loop = loop
+		self.path = path
+		self.brain_path = path + "/aiml_brain.brn"
+		self.hash_path = path + "/aiml_brain.sha256"
+		self.predicates = predicates
+		self.console_message_prefix = console_message_prefix
+		self.kernel = aiml.Kernel()
+		# The kernel isn't thread-safe, so it's only used from this executor
+		self.executor = concurrent.futures.ThreadPoolExecutor(max_workers = 1, thread_name_prefix = "AIML")
+		self.ready = False
+		self.loading = None
+	
+	@property
+	def warming_up(self):
+		'''Whether the brain is still loading, as opposed to having failed to load'''
+		return not self.ready and self.loading is not None and not self.loading.done()
+	
+	def source_hash(self):
+		'''Hash of the AIML source files, or None if there are none'''
+		sha256 = hashlib.sha256()
+		found = False
+		for directory, _, files in sorted(os.walk(self.path)):
+			for file in sorted(files):
+				if file.endswith((".aiml", ".xml")):
+					file_path = os.path.join(directory, file)
+					sha256.update(os.path.relpath(file_path, self.path).encode())
+					with open(file_path, "rb") as source_file:
+						sha256.update(source_file.read())
+					found = True
+		return sha256.hexdigest() if found else None
+	
+	def _load(self):
+		for predicate, value in self.predicates.items():
+			self.kernel.setBotPredicate(predicate, value)
+		source_hash = self.source_hash()
+		try:
+			with open(self.hash_path, 'r') as hash_file:
+				brain_hash = hash_file.read().strip()
+		except FileNotFoundError:
+			brain_hash = None
+		brain_current = os.path.isfile(self.brain_path) and (source_hash is None or source_hash == brain_hash)
+		if not brain_current and os.path.isfile(self.path + "/std-startup.xml"):
+			self.kernel.resetBrain()
+			self.kernel.bootstrap(learnFiles = self.path + "/std-startup.xml", commands = "load aiml b")
+			if not self.kernel.numCategories():
+				raise RuntimeError("No AIML categories learned from std-startup.xml")
+			self.kernel.saveBrain(self.brain_path)
+			with open(self.hash_path, 'w') as hash_file:
+				hash_file.write(source_hash)
+		elif os.path.isfile(self.brain_path):
+			# Out of date if the source files changed but can't be relearned without std-startup.xml
+			self.kernel.bootstrap(brainFile = self.brain_path)
+		else:
+			raise FileNotFoundError(f"No AIML brain or std-startup.xml in {self.path}")
+	
+	async def load(self):
+		'''
+		Load the brain, or wait for it to finish loading if it already is
+		Returns whether it loaded, with failures logged
+		'''
+		if self.loading is None or self.loading.done():
+			self.loading = self.loop.run_in_executor(self.executor, self._load)
+		try:
+			await asyncio.shield(self.loading)
+		except asyncio.CancelledError:
+			raise
+		except Exception as e:
+			print(f"{self.console_message_prefix}Failed to load AIML brain: {type(e).__name__}: {e}")
+			return False
+		self.ready = True
+		return True
+	
+	async def unload(self):
+		self.ready = False
+		await self.loop.run_in_executor(self.executor, self.kernel.resetBrain)
+	
+	async def respond(self, text, session_id = "_global"):
+		'''Respond to text, or return None if the brain isn't ready yet'''
+		if not self.ready:
+			return None
+		return await self.loop.run_in_executor(self.executor, self.kernel.respond, text, session_id)
+
@@ -0,0 +1,157 @@
+
+import asyncio
+import collections
+import json
+import os
+
+from utilities.document_store import write_json
+
+class AudioCache:
+	
+	'''
+	Downloaded audio files shared by all players, keyed by extractor and video ID
+	Files in use are reference counted and never evicted
+	Others are evicted least recently used once the cache is over its size cap
+	The index is written atomically, and files missing from it, e.g. after a crash mid-download, are removed on load
+	'''
+	
+	def __init__(self, loop, path, *, max_size = 10 * 2 ** 30, console_message_prefix = ""):
+		self.loop = loop
+		self.path = path
+		self.index_path = path + "/index.json"
+		self.max_size = max_size  # bytes
+		self.console_message_prefix = console_message_prefix
+		# Key: {"filename": filename, "size": size}, least recently used first
+		self.entries = collections.OrderedDict()
+		# Filename: key
+		self.keys = {}
+		# Key: number of players using the file
+		self.references = collections.Counter()
+		# Key: download task
+		self.downloads = {}
+		self.size = 0
+		self.hits = 0
+		self.misses = 0
+		self.coalesced = 0
+		self.evictions = 0
+		self.load()
+	
+	@staticmethod
+	def key(info):
+		return f"{info.get('extractor_key') or info.get('extractor')}:{info['id']}"
+	
+	def load(self):
+		os.makedirs(self.path, exist_ok = True)
+		try:
+			with open(self.index_path, 'r') as index_file:
+				index = json.load(index_file)
+		except (FileNotFoundError, ValueError):
+			index = {}
+		for key, entry in index.items():
+			filename = os.path.join(self.path, entry["filename"])
+			if os.path.isfile(filename):
+				self.entries[key] = {"filename": filename, "size": os.path.getsize(filename)}
+				self.keys[filename] = key
+				self.size += self.entries[key]["size"]
+		for name in os.listdir(self.path):
+			filename = os.path.join(self.path, name)
+			if filename not in self.keys and filename != self.index_path and os.path.isfile(filename):
+				self.remove_file(filename)
+		self.save()
+	
+	def save(self):
+		write_json(self.index_path, {key: {"filename": os.path.basename(entry["filename"]), "size": entry["size"]}
+										for key, entry in self.entries.items()})
+	
+	async def get(self, info, download):
+		'''
+		Filename for info's audio, downloaded with the download coroutine function if not cached
+		Concurrent downloads of the same audio are coalesced
+		Acquires a reference, which must be released when the file is no longer in use
+		'''
+		key = self.key(info)
+		entry = self.entries.get(key)
+		if entry and not os.path.isfile(entry["filename"]):
+			self.remove(key)
+			entry = None
+		if entry:
+			self.hits += 1
+		else:
+			if key in self.downloads:
+				self.coalesced += 1
+			else:
+				self.misses += 1
+				self.downloads[key] = self.loop.create_task(self.download(key, download))
+			# Completed and indexed even if this waiter is cancelled
+			await asyncio.shield(self.downloads[key])
+		filename = self.acquire(key)
+		self.evict()
+		return filename
+	
+	async def download(self, key, download):
+		try:
+			filename = await download()
+		finally:
+			del self.downloads[key]
+		if key in self.entries:
+			self.size -= self.entries[key]["size"]
+		self.entries[key] = {"filename": filename, "size": os.path.getsize(filename)}
+		self.keys[filename] = key
+		self.size += self.entries[key]["size"]
+		self.save()
+		return filename
+	
+	def acquire(self, key):
+		self.references[key] += 1
+		self.entries.move_to_end(key)
+		return self.entries[key]["filename"]
+	
+	def release(self, filename):
+		'''Release a reference to a file from get, making it evictable once unused'''
+		key = self.keys.get(filename)
+		if key is None or not self.references[key]:
+			return
+		self.references[key] -= 1
+		if not self.references[key]:
+			del self.references[key]
+			self.evict()
+	
+	def evict(self):
+		if self.size <= self.max_size:
+			return
+		for key in list(self.entries):
+			if self.size <= self.max_size:
+				break
+			if key not in self.references:
+				self.remove(key)
+				self.evictions += 1
+		self.save()
+	
+	def remove(self, key):
+		entry = self.entries.pop(key)
+		self.keys.pop(entry["filename"], None)
+		self.size -= entry["size"]
+		self.remove_file(entry["filename"])
+	
+	def remove_file(self, filename):
+		try:
+			os.remove(filename)
+		except FileNotFoundError:
+			pass
+		except PermissionError as e:
+			print(f"{self.console_message_prefix}Failed to remove cached audio file: {e}")
+	
+	def render(self):
+		'''Render in the Prometheus text exposition format'''
+		return '\n'.join(("# HELP harmonbot_audio_cache_lookups_total Audio cache lookups by result",
+							"# TYPE harmonbot_audio_cache_lookups_total counter",
+							f'harmonbot_audio_cache_lookups_total{{result="hit"}} {self.hits}',
+							f'harmonbot_audio_cache_lookups_total{{result="miss"}} {self.misses}',
+							f'harmonbot_audio_cache_lookups_total{{result="coalesced"}} {self.coalesced}',
+							"# HELP harmonbot_audio_cache_evictions_total Files evicted from the audio cache",
+							"# TYPE harmonbot_audio_cache_evictions_total counter",
+							f"harmonbot_audio_cache_evictions_total {self.evictions}",
+							"# HELP harmonbot_audio_cache_bytes Size of the audio cache",
+							"# TYPE harmonbot_audio_cache_bytes gauge",
+							f"harmonbot_audio_cache_bytes {self.size}")) + '\n'
+
@@ -3,22 +3,18 @@ import discord
 
 import asyncio
 import functools
-import json
+import itertools
 import logging
 import os
 import random
 import speech_recognition
 import subprocess
-import youtube_dl
+import time
 
 import clients
 from modules import utilities
 from utilities import errors
-
-playlist_logger = logging.getLogger("playlist")
-playlist_logger.setLevel(logging.DEBUG)
-handler = logging.FileHandler(filename = "data/temp/playlist_info.json", encoding = "utf-8", mode = 'w')
-playlist_logger.addHandler(handler)
+from utilities.playlist import Playlist
 
 class AudioPlayer:
 	
@@ -26,15 +22,16 @@ class AudioPlayer:
 		self.bot = client
 		self.text_channel = text_channel
 		self.server = text_channel.guild
-		self.queue = asyncio.Queue()
+		self.queue = Playlist()
 		self.current = None
 		self.play_next_song = asyncio.Event()
 		self.ytdl_options = {"default_search": "auto", "noplaylist": True, "quiet": True, 
 			"format": "webm[abr>0]/bestaudio/best", "prefer_ffmpeg": True}
 		self.ytdl_download_options = {"default_search": "auto", "noplaylist": True, "quiet": True, 
-			"format": "bestaudio/best", "extractaudio": True, "outtmpl": "data/audio_cache/%(id)s-%(title)s.%(ext)s", "restrictfilenames": True} # "audioformat": "mp3" ?
-		self.ytdl_playlist_options = {"default_search": "auto", "extract_flat": True, "forcejson": True, "quiet": True, 
-			"logger": playlist_logger}
+			"format": "bestaudio/best", "extractaudio": True, "outtmpl": self.bot.audio_cache.path + "/%(extractor_key)s-%(id)s.%(ext)s", "restrictfilenames": True} # "audioformat": "mp3" ?
+		self.ytdl_playlist_options = {"default_search": "auto", "extract_flat": True, "quiet": True}
+		self.playlist_concurrency = 4
+		self.playlist_progress_interval = 5.0  # seconds between progress message edits
 		self.default_volume = 100.0
 		self.skip_votes_required = 0
 		self.skip_votes = set()
@@ -70,12 +67,14 @@ class AudioPlayer:
 			if self.current and self.current["stream"].is_playing():
 				self.current["stream"].stop()
 			self.player.cancel()
+			self.bot.audio_prefetcher.cancel(self.server.id)
 			await self.server.voice_client.disconnect()
 			return True
 	
 	async def add_song(self, song, requester, timestamp, *, stream = False):
 		info = await self._get_song_info(song)
 		await self.queue.put({"info": info, "requester": requester, "timestamp": timestamp, "stream": stream})
+		self.prefetch_upcoming()
 		return info["title"], info["webpage_url"]
 	
 	async def add_song_interrupt(self, videoid, requester, timestamp):
@@ -84,71 +83,93 @@ class AudioPlayer:
 	
 	async def insert_song(self, song, requester, timestamp, position):
 		info = await self._get_song_info(song)
-		self.queue._queue.insert(position - 1, {"info": info, "requester": requester, "timestamp": timestamp})
-		await self.queue.put(None) # trigger get
-		self.queue._queue.pop()
+		await self.queue.put({"info": info, "requester": requester, "timestamp": timestamp}, position - 1)
+		self.prefetch_upcoming()
 		return info["title"]
 	
 	async def _get_song_info(self, song):
-		ydl = youtube_dl.YoutubeDL(self.ytdl_options)
-		func = functools.partial(ydl.extract_info, song, download = False)
-		info = await self.bot.loop.run_in_executor(None, func)
+		info = await self.bot.ytdl_resolver.extract_info(song, self.ytdl_options)
 		if "entries" in info:
 			info = info["entries"][0]
 		logging.getLogger("discord").info("playing URL {}".format(song))
 		return info
 	
-	async def _download_song(self, song):
-		ydl = youtube_dl.YoutubeDL(self.ytdl_download_options)
-		func = functools.partial(ydl.extract_info, song, download = True)
-		info = await self.bot.loop.run_in_executor(None, func)
-		return ydl.prepare_filename(info)
+	async def _download_song(self, info):
+		'''Download a song to the audio cache, returning its filename, which must be released after playing'''
+		return await self.bot.audio_cache.get(info, functools.partial(self._download_file, info["webpage_url"]))
+	
+	async def _download_file(self, song):
+		return await self.bot.ytdl_resolver.download(song, self.ytdl_download_options)
+	
+	def prefetch_upcoming(self):
+		'''Prefetch the next downloaded songs in the queue, and cancel prefetches of songs no longer next'''
+		upcoming = [song for song in itertools.islice(self.queue, self.bot.audio_prefetcher.lookahead) 
+					if not (song["info"].get("is_live") or song.get("stream"))]
+		self.bot.audio_prefetcher.update(self.server.id, upcoming, 
+											lambda song: self._download_song(song["info"]))
 	
 	def _play_next_song(self):
 		self.bot.loop.call_soon_threadsafe(self.play_next_song.set)
 
 	async def player_task(self):
 		filename = None
-		while True:
-			self.play_next_song.clear()
+		prefetch = None
+		try:
+			while True:
+				self.play_next_song.clear()
+				if filename:
+					self.bot.audio_cache.release(filename)
+					filename = None
+				current = await self.queue.get()
+				# Taken before anything else awaits, so it isn't cancelled by queue changes
+				prefetch = self.bot.audio_prefetcher.take(self.server.id, current)
+				await self.not_interrupted.wait()
+				track_changed = time.monotonic()
+				if current["info"].get("is_live") or current.get("stream"):
+					with open("data/logs/ffmpeg.log", 'a') as ffmpeg_log:
+						stream = self.server.voice_client.create_ffmpeg_player(current["info"]["url"], after = self._play_next_song, stderr = ffmpeg_log)
+					stream.volume = self.default_volume / 1000
+					self.current = current
+					self.current["stream"] = stream
+					self.current["stream"].start()
+					self.bot.audio_prefetcher.track_started("stream", track_changed)
+					await self.bot.send_embed(self.text_channel, ":arrow_forward: Now Playing", title = current["info"].get("title", "N/A"), title_url = current["info"].get("webpage_url"), timestamp = current["timestamp"], footer_text = current["requester"].display_name, footer_icon_url = current["requester"].avatar_url or current["requester"].default_avatar_url, thumbnail_url = current["info"].get("thumbnail"))
+				else:
+					embed = discord.Embed(title = current["info"].get("title", "N/A"), url = current["info"].get("webpage_url"), description = ":arrow_down: Downloading..", timestamp = current["timestamp"], color = clients.bot_color)
+					embed.set_footer(text = current["requester"].display_name, icon_url = current["requester"].avatar_url or current["requester"].default_avatar_url)
+					thumbnail = current["info"].get("thumbnail")
+					if thumbnail: embed.set_thumbnail(url = thumbnail)
+					now_playing_message = await self.bot.send_message(self.text_channel, embed = embed)
+					filename = await self.bot.audio_prefetcher.result(prefetch)
+					prefetch = None
+					source = "prefetched" if filename else "downloaded"
+					if not filename:
+						filename = await self._download_song(current["info"]) #
+					before_options = None
+					if current["info"].get("start_time"): before_options = "-ss {}".format(current["info"]["start_time"])
+					self.previous_played_time = current["info"].get("start_time") if current["info"].get("start_time") else 0
+					with open("data/logs/ffmpeg.log", 'a') as ffmpeg_log:
+						stream = self.server.voice_client.create_ffmpeg_player(filename, before_options = before_options, after = self._play_next_song, stderr = ffmpeg_log)
+					stream.volume = self.default_volume / 1000
+					self.current = current
+					self.current["stream"] = stream
+					self.current["filename"] = filename
+					self.current["stream"].start()
+					self.bot.audio_prefetcher.track_started(source, track_changed)
+					embed.description = ":arrow_forward: Now playing"
+					await self.bot.edit_message(now_playing_message, embed = embed)
+				## stream.buff.read(stream.frame_size * 100 / stream.delay)
+				self.prefetch_upcoming()
+				number_of_listeners = len(self.server.voice_client.channel.voice_members) - 1
+				self.skip_votes_required = number_of_listeners // 2 + number_of_listeners % 2
+				self.skip_votes.clear()
+				await self.play_next_song.wait()
+		finally:
+			# References held when cancelled, e.g. on leaving the voice channel
 			if filename:
-				try:
-					os.remove(filename)
-				except PermissionError as e:
-					print(str(e))
-			current = await self.queue.get()
-			await self.not_interrupted.wait()
-			if current["info"].get("is_live") or current.get("stream"):
-				with open("data/logs/ffmpeg.log", 'a') as ffmpeg_log:
-					stream = self.server.voice_client.create_ffmpeg_player(current["info"]["url"], after = self._play_next_song, stderr = ffmpeg_log)
-				stream.volume = self.default_volume / 1000
-				self.current = current
-				self.current["stream"] = stream
-				self.current["stream"].start()
-				await self.bot.send_embed(self.text_channel, ":arrow_forward: Now Playing", title = current["info"].get("title", "N/A"), title_url = current["info"].get("webpage_url"), timestamp = current["timestamp"], footer_text = current["requester"].display_name, footer_icon_url = current["requester"].avatar_url or current["requester"].default_avatar_url, thumbnail_url = current["info"].get("thumbnail"))
-			else:
-				embed = discord.Embed(title = current["info"].get("title", "N/A"), url = current["info"].get("webpage_url"), description = ":arrow_down: Downloading..", timestamp = current["timestamp"], color = clients.bot_color)
-				embed.set_footer(text = current["requester"].display_name, icon_url = current["requester"].avatar_url or current["requester"].default_avatar_url)
-				thumbnail = current["info"].get("thumbnail")
-				if thumbnail: embed.set_thumbnail(url = thumbnail)
-				now_playing_message = await self.bot.send_message(self.text_channel, embed = embed)
-				filename = await self._download_song(current["info"]["webpage_url"]) #
-				before_options = None
-				if current["info"].get("start_time"): before_options = "-ss {}".format(current["info"]["start_time"])
-				self.previous_played_time = current["info"].get("start_time") if current["info"].get("start_time") else 0
-				with open("data/logs/ffmpeg.log", 'a') as ffmpeg_log:
-					stream = self.server.voice_client.create_ffmpeg_player(filename, before_options = before_options, after = self._play_next_song, stderr = ffmpeg_log)
-				stream.volume = self.default_volume / 1000
-				self.current = current
-				self.current["stream"] = stream
-				self.current["stream"].start()
-				embed.description = ":arrow_forward: Now playing"
-				await self.bot.edit_message(now_playing_message, embed = embed)
-			## stream.buff.read(stream.frame_size * 100 / stream.delay)
-			number_of_listeners = len(self.server.voice_client.channel.voice_members) - 1
-			self.skip_votes_required = number_of_listeners // 2 + number_of_listeners % 2
-			self.skip_votes.clear()
-			await self.play_next_song.wait()
+				self.bot.audio_cache.release(filename)
+			if prefetch:
+				self.bot.audio_prefetcher.discard(prefetch)
 	
 	def pause(self):
 		if not self.current or self.current["stream"].is_done():
@@ -183,35 +204,36 @@ class AudioPlayer:
 		self.skip()
 	
 	async def skip_specific(self, number):
-		if not 1 <= number <= self.queue.qsize():
+		if not 1 <= number <= len(self.queue):
 			raise errors.AudioNotPlaying
-		self.queue._queue.rotate(-(number - 1))
-		song = await self.queue.get()
-		self.queue._queue.rotate(number - 1)
+		song = self.queue.pop(number - 1)
+		self.prefetch_upcoming()
 		return song
 	
 	async def skip_to_song(self, number):
-		if not 1 <= number <= self.queue.qsize():
+		if not 1 <= number <= len(self.queue):
 			raise errors.AudioNotPlaying
-		songs = []
-		for i in range(number - 1):
-			songs.append(await self.queue.get())
+		songs = [self.queue.popleft() for _ in range(number - 1)]
 		self.skip()
+		self.prefetch_upcoming()
 		return songs
 	
 	async def replay(self):
 		if not self.current or not self.current.get("info").get("url"):
 			return False
-		with open("data/logs/ffmpeg.log", 'a') as ffmpeg_log:
-			stream = self.server.voice_client.create_ffmpeg_player(self.current["info"]["url"], after = self._play_next_song, stderr = ffmpeg_log)
-		stream.volume = self.default_volume / 1000
 		duplicate = self.current.copy()
-		duplicate["stream"] = stream
+		if self.current.get("filename"):
+			# Played again from the audio cache
+			duplicate["stream"] = False
+		else:
+			with open("data/logs/ffmpeg.log", 'a') as ffmpeg_log:
+				stream = self.server.voice_client.create_ffmpeg_player(self.current["info"]["url"], after = self._play_next_song, stderr = ffmpeg_log)
+			stream.volume = self.default_volume / 1000
+			duplicate["stream"] = stream
 		if not self.current["stream"].is_done():
 			self.skip()
-		self.queue._queue.appendleft(duplicate)
-		await self.queue.put(None) # trigger get
-		self.queue._queue.pop()
+		await self.queue.put(duplicate, 0)
+		self.prefetch_upcoming()
 		return True
 	
 	def get_volume(self):
@@ -265,30 +287,24 @@ class AudioPlayer:
 			return discord.Embed(title = ":radio: Radio is currently on", color = self.bot.bot_color)
 		elif self.library_flag:
 			return discord.Embed(title = ":notes: Playing songs from my library", color = self.bot.bot_color)
-		elif self.queue.qsize() == 0:
+		elif not self.queue:
 			return discord.Embed(title = ":hole: The queue is currently empty", color = self.bot.bot_color)
 		else:
 			queue_string = ""
-			for number, stream in enumerate(list(self.queue._queue)[:10], start = 1):
+			for number, stream in enumerate(self.queue[:10], start = 1):
 				queue_string += ":{}: **[{}]({})** (Added by: {})\n".format("keycap_ten" if number == 10 else clients.inflect_engine.number_to_words(number), stream["info"].get("title", "N/A"), stream["info"].get("webpage_url", "N/A"), stream["requester"].display_name)
-			if self.queue.qsize() > 10:
-				more_songs = self.queue.qsize() - 10
+			if len(self.queue) > 10:
+				more_songs = len(self.queue) - 10
 				queue_string += ":arrow_right: There {} {} more {} in the queue".format(clients.inflect_engine.plural("is", more_songs), more_songs, clients.inflect_engine.plural("song", more_songs))
 			return discord.Embed(title = ":musical_score: Queue:", description = queue_string, color = self.bot.bot_color)
 	
 	async def empty_queue(self):
-		while not self.queue.empty():
-			song = await self.queue.get()
-			del song
-		# self.queue._queue.clear() ?
+		self.queue.clear()
+		self.prefetch_upcoming()
 	
 	async def shuffle_queue(self):
-		song_list = []
-		while not self.queue.empty():
-			song_list.append(await self.queue.get())
-		random.shuffle(song_list)
-		for song in song_list:
-			await self.queue.put(song)
+		self.queue.shuffle()
+		self.prefetch_upcoming()
 	
 	async def play_tts(self, message, requester, *, timestamp = None, amplitude = 100, pitch = 50, speed = 150, word_gap = 0, voice = "en-us+f1"):
 		if not self.not_interrupted.is_set():
@@ -373,25 +389,36 @@ class AudioPlayer:
 		self.bot.loop.call_soon_threadsafe(self.resume_flag.set)
 	
 	async def add_playlist(self, playlist, requester, timestamp):
-		response = await ctx.embed_reply(":cd: Loading..")
-		ydl = youtube_dl.YoutubeDL(self.ytdl_playlist_options)
-		func = functools.partial(ydl.extract_info, playlist, download = False)
-		await self.bot.loop.run_in_executor(None, func)
-		with open("data/temp/playlist_info.json", "r+") as playlist_info_file:
-			videos = [json.loads(line) for line in playlist_info_file if line.startswith('{')]
-			playlist_info_file.seek(0)
-			playlist_info_file.truncate()
+		response = await self.bot.send_embed(self.text_channel, ":cd: Loading..")
 		embed = response.embeds[0]
-		for position, video in enumerate(videos, start = 1):
-			embed.description = ":cd: Loading {}/{}".format(position, len(videos))
-			await self.bot.edit_message(response, embed = embed)
-			try:
-				await self.add_song(video["url"], requester, timestamp)
-			except Exception as e:
+		info = await self.bot.ytdl_resolver.extract_info(playlist, self.ytdl_playlist_options, timeout = 300)
+		videos = [video for video in info.get("entries", ()) if video]
+		# Resolved concurrently, but queued in order as they resolve, so the first can play while the rest load
+		semaphore = asyncio.Semaphore(self.playlist_concurrency)
+		async def resolve(video):
+			async with semaphore:
+				return await self._get_song_info(video["url"])
+		tasks = [self.bot.loop.create_task(resolve(video)) for video in videos]
+		last_edit = 0
+		try:
+			for position, (video, task) in enumerate(zip(videos, tasks), start = 1):
 				try:
-					await self.bot.send_embed(self.text_channel, "{}: :warning: Error loading video {} (<{}>) from <{}>\n{}: {}".format(requester.mention, position, "https://www.youtube.com/watch?v=" + video["id"], playlist, type(e).__name__, e))
-				except discord.errors.HTTPException:
-					await self.bot.send_embed(self.text_channel, "{}: :warning: Error loading video {} (<{}>) from <{}>".format(requester.mention, position, "https://www.youtube.com/watch?v=" + video["id"], playlist))
+					info = await task
+				except Exception as e:
+					try:
+						await self.bot.send_embed(self.text_channel, "{}: :warning: Error loading video {} (<{}>) from <{}>\n{}: {}".format(requester.mention, position, "https://www.youtube.com/watch?v=" + video["id"], playlist, type(e).__name__, e))
+					except discord.errors.HTTPException:
+						await self.bot.send_embed(self.text_channel, "{}: :warning: Error loading video {} (<{}>) from <{}>".format(requester.mention, position, "https://www.youtube.com/watch?v=" + video["id"], playlist))
+				else:
+					await self.queue.put({"info": info, "requester": requester, "timestamp": timestamp, "stream": False})
+					self.prefetch_upcoming()
+				if time.monotonic() - last_edit >= self.playlist_progress_interval:
+					embed.description = ":cd: Loading {}/{}".format(position, len(videos))
+					await self.bot.edit_message(response, embed = embed)
+					last_edit = time.monotonic()
+		finally:
+			for task in tasks:
+				task.cancel()
 		embed.description = ":ballot_box_with_check: Your songs have been added to the queue"
 		await self.bot.edit_message(response, embed = embed)
 	
@@ -501,8 +528,7 @@ class AudioPlayer:
 		except speech_recognition.RequestError as e:
 			await self.bot.send_embed(self.text_channel, ":warning: Could not request results from Google Speech Recognition service; {}".format(e))
 		else:
-			response = self.bot.aiml_kernel.respond(text)
-			# TODO: Handle brain not loaded?
+			response = await self.bot.aiml_brain.respond(text)
 			if not response:
 				games_cog = client.get_cog("Games")
 				if not games_cog: return
@@ -0,0 +1,177 @@
+
+import asyncio
+import collections
+import os
+import time
+
+from utilities.metrics import Histogram
+
+class AudioPrefetcher:
+	
+	'''
+	Downloads the next tracks in guilds' queues in the background, while the current track plays
+	Concurrency is capped per guild and globally, and prefetched files not yet playing are capped by a disk budget
+	Downloads return files from the audio cache, released here if their prefetch is discarded
+	'''
+	
+	def __init__(self, loop, release, *, lookahead = 2, max_concurrent = 4, max_concurrent_per_guild = 1,
+					max_size = 2 ** 30, console_message_prefix = ""):
+		self.loop = loop
+		self.release = release  # Function called with a downloaded filename no longer needed
+		self.lookahead = lookahead
+		self.max_concurrent_per_guild = max_concurrent_per_guild
+		self.max_size = max_size  # bytes
+		self.console_message_prefix = console_message_prefix
+		self.semaphore = asyncio.Semaphore(max_concurrent, loop = loop)
+		# Guild ID: semaphore
+		self.guild_semaphores = {}
+		# Guild ID: number of its slots held, until their downloads finish
+		self.held_slots = collections.Counter()
+		# Guild ID: {entry ID: (entry, task)}
+		self.tasks = {}
+		# Filename: size, for prefetched files not yet taken by a player
+		self.files = {}
+		# Source (prefetched, downloaded, or stream): time from a track change to the start of its audio
+		self.time_to_first_audio = {}
+		self.prefetched = 0
+		self.cancelled = 0
+		self.failed = 0
+	
+	@property
+	def size(self):
+		return sum(self.files.values())
+	
+	def update(self, guild_id, upcoming, download):
+		'''
+		Prefetch the first entries of upcoming, cancelling prefetches of entries no longer among them
+		download is a coroutine function called with an entry, returning the downloaded filename
+		'''
+		tasks = self.tasks.setdefault(guild_id, {})
+		upcoming = upcoming[:self.lookahead]
+		upcoming_ids = {id(entry) for entry in upcoming}
+		for entry_id in list(tasks):
+			if entry_id not in upcoming_ids:
+				self.discard(tasks.pop(entry_id)[1])
+		for entry in upcoming:
+			if id(entry) not in tasks:
+				tasks[id(entry)] = (entry, self.loop.create_task(self.prefetch(guild_id, entry, download)))
+	
+	async def prefetch(self, guild_id, entry, download):
+		if guild_id not in self.guild_semaphores:
+			self.guild_semaphores[guild_id] = asyncio.Semaphore(self.max_concurrent_per_guild, loop = self.loop)
+		guild_semaphore = self.guild_semaphores[guild_id]
+		# Per guild first, so a guild waiting on itself doesn't hold a global slot
+		await guild_semaphore.acquire()
+		self.held_slots[guild_id] += 1
+		try:
+			await self.semaphore.acquire()
+		except asyncio.CancelledError:
+			self.release_guild_slot(guild_id, guild_semaphore)
+			raise
+		if self.size >= self.max_size:
+			self.release_slots(guild_id, guild_semaphore)
+			# Downloaded when it's played instead
+			return None
+		download_task = self.loop.create_task(download(entry))
+		# The download itself can't be interrupted in its worker thread,
+		# so its slots are held until it finishes, even if this prefetch is cancelled
+		download_task.add_done_callback(lambda task: self.release_slots(guild_id, guild_semaphore))
+		try:
+			filename = await asyncio.shield(download_task)
+		except asyncio.CancelledError:
+			download_task.add_done_callback(self.remove_download)
+			raise
+		self.files[filename] = os.path.getsize(filename) if os.path.exists(filename) else 0
+		self.prefetched += 1
+		return filename
+	
+	def take(self, guild_id, entry):
+		'''
+		Take an entry that's now playing, so its prefetch is no longer cancelled by updates
+		Returns its prefetch task, or None if it wasn't being prefetched
+		'''
+		entry_task = self.tasks.get(guild_id, {}).pop(id(entry), None)
+		return entry_task[1] if entry_task else None
+	
+	async def result(self, task):
+		'''Filename from a taken prefetch task, or None if it failed or was skipped'''
+		if task is None:
+			return None
+		try:
+			# Shielded to tell the prefetch being cancelled apart from the caller being cancelled
+			filename = await asyncio.shield(task)
+		except asyncio.CancelledError:
+			if not task.cancelled():
+				raise
+			return None
+		except Exception as e:
+			self.failed += 1
+			print(f"{self.console_message_prefix}Audio prefetch failed: {type(e).__name__}: {e}")
+			return None
+		if filename is None:
+			return None
+		self.files.pop(filename, None)
+		return filename
+	
+	def discard(self, task):
+		if task.done():
+			if not task.cancelled() and not task.exception() and task.result():
+				self.release_file(task.result())
+		else:
+			task.cancel()
+			self.cancelled += 1
+	
+	def cancel(self, guild_id):
+		'''Cancel all of a guild's prefetches, e.g. when its player leaves'''
+		for _, task in self.tasks.pop(guild_id, {}).values():
+			self.discard(task)
+		# Otherwise kept until cancelled downloads release their slots
+		if not self.held_slots[guild_id]:
+			self.guild_semaphores.pop(guild_id, None)
+	
+	def release_slots(self, guild_id, guild_semaphore):
+		self.semaphore.release()
+		self.release_guild_slot(guild_id, guild_semaphore)
+	
+	def release_guild_slot(self, guild_id, guild_semaphore):
+		guild_semaphore.release()
+		self.held_slots[guild_id] -= 1
+		if not self.held_slots[guild_id]:
+			del self.held_slots[guild_id]
+			if guild_id not in self.tasks and self.guild_semaphores.get(guild_id) is guild_semaphore:
+				self.guild_semaphores.pop(guild_id)
+	
+	def remove_download(self, download_task):
+		if not download_task.cancelled() and not download_task.exception():
+			self.release_file(download_task.result())
+	
+	def release_file(self, filename):
+		self.files.pop(filename, None)
+		self.release(filename)
+	
+	def track_started(self, source, track_changed):
+		'''Record time to first audio since a monotonic track change time'''
+		if source not in self.time_to_first_audio:
+			self.time_to_first_audio[source] = Histogram()
+		self.time_to_first_audio[source].observe(time.monotonic() - track_changed)
+	
+	def render(self):
+		'''Render in the Prometheus text exposition format'''
+		lines = ["# HELP harmonbot_audio_time_to_first_audio_seconds Time from a track change to the start of its audio",
+					"# TYPE harmonbot_audio_time_to_first_audio_seconds histogram"]
+		for source, histogram in sorted(self.time_to_first_audio.items()):
+			bounds = [str(bound) for bound in histogram.buckets] + ["+Inf"]
+			for bound, cumulative_count in zip(bounds, histogram.cumulative_counts()):
+				lines.append(f'harmonbot_audio_time_to_first_audio_seconds_bucket{{source="{source}",le="{bound}"}} {cumulative_count}')
+			lines.append(f'harmonbot_audio_time_to_first_audio_seconds_sum{{source="{source}"}} {histogram.sum}')
+			lines.append(f'harmonbot_audio_time_to_first_audio_seconds_count{{source="{source}"}} {histogram.count}')
+		lines.extend(("# HELP harmonbot_audio_prefetches_total Audio prefetches by outcome",
+						"# TYPE harmonbot_audio_prefetches_total counter",
+						f'harmonbot_audio_prefetches_total{{outcome="downloaded"}} {self.prefetched}',
+						f'harmonbot_audio_prefetches_total{{outcome="cancelled"}} {self.cancelled}',
+						f'harmonbot_audio_prefetches_total{{outcome="failed"}} {self.failed}',
+						"# HELP harmonbot_audio_prefetched_bytes Size of prefetched audio files not yet playing",
+						"# TYPE harmonbot_audio_prefetched_bytes gauge",
+						f"harmonbot_audio_prefetched_bytes {self.size}"))
+		return '\n'.join(lines) + '\n'
+
@@ -132,7 +132,7 @@ class YTDLSource(ModifiedPCMVolumeTransformer):
 	
 	async def get_info(self):
 		func = functools.partial(self.bot.ytdl_info.extract_info, self.url, download = False)
-		info = await self.bot.loop.run_in_executor(None, func)
+		info = await self.bot.executors.run("youtube_dl", func)
 		self.set_info(info)
 	
 	def set_info(self, info):
@@ -147,15 +147,18 @@ class YTDLSource(ModifiedPCMVolumeTransformer):
 		if self.stream:
 			super().__init__(ModifiedFFmpegPCMAudio(self.info["url"]), volume)
 		else:
-			func = functools.partial(self.bot.ytdl_download.extract_info, self.info["webpage_url"], download = True)
-			info = await self.bot.loop.run_in_executor(None, func)
-			self.filename = self.bot.ytdl_download.prepare_filename(info)
+			self.filename = await self.bot.audio_cache.get(self.info, self.download)
 			
 			before_options = "-ss {}".format(self.info["start_time"]) if self.info.get("start_time") else None
 			self.previous_played_time = self.info.get("start_time") if self.info.get("start_time") else 0
 			super().__init__(ModifiedFFmpegPCMAudio(self.filename, before_options = before_options), volume)
 		self.initialized = True
 	
+	async def download(self):
+		func = functools.partial(self.bot.ytdl_download.extract_info, self.info["webpage_url"], download = True)
+		info = await self.bot.executors.run("youtube_dl", func, timeout = 600)
+		return self.bot.ytdl_download.prepare_filename(info)
+	
 	@classmethod
 	async def replay(cls, original):
 		source = cls(original.ctx, original.url, original.stream, original.title_prefix)
@@ -165,9 +168,8 @@ class YTDLSource(ModifiedPCMVolumeTransformer):
 	
 	def cleanup(self):
 		if self.initialized: super().cleanup()
-		if self.filename and os.path.exists(self.filename):
-			try:
-				os.remove(self.filename)
-			except PermissionError as e: # TODO: Fix
-				print(str(e))
+		if self.filename:
+			# Kept in the audio cache for replays and repeat requests
+			self.bot.audio_cache.release(self.filename)
+			self.filename = None
 
@@ -136,12 +136,13 @@ def is_permitted_check(ctx):
 	'''Check if permitted'''
 	if isinstance(ctx.channel, discord.DMChannel):
 		return True
+	guild_permissions = ctx.bot.permission_index.get(ctx.guild)
 	command = ctx.command
-	permitted = ctx.get_permission(command.name, id = ctx.author.id)
+	permitted = guild_permissions.get_user_permission(ctx.author, command.name)
 	while command.parent is not None and not permitted:
 		# permitted is None instead?
 		command = command.parent
-		permitted = ctx.get_permission(command.name, id = ctx.author.id)
+		permitted = guild_permissions.get_user_permission(ctx.author, command.name)
 		# include non-final parent commands?
 	return permitted or is_server_owner_check(ctx)
 
@@ -155,6 +156,16 @@ def is_permitted():
 	
 	return commands.check(predicate)
 
+def external_client_available(name):
+	'''For commands using an external client that may have failed to initialize'''
+	
+	def predicate(ctx):
+		if name in ctx.bot.degraded_clients:
+			raise errors.ServiceUnavailable(name)
+		return True
+	
+	return commands.check(predicate)
+
 # Functions
 
 def has_permissions_and_capability_check(ctx, channel = None, guild = False, **permissions):
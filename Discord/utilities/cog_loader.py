@@ -0,0 +1,188 @@
+
+from discord.ext import commands
+
+import json
+import os
+import time
+
+from utilities import errors
+from utilities.document_store import write_json
+
+async def deferred_callback(ctx):
+	pass
+
+class DeferredCommand(commands.Command):
+	
+	'''
+	Placeholder for a command in a cog that hasn't been loaded yet
+	Loads the cog and invokes the real command on first invocation
+	'''
+	
+	def __init__(self, loader, extension, metadata):
+		super().__init__(name = metadata["name"], callback = deferred_callback,
+							aliases = metadata["aliases"], help = metadata["help"], brief = metadata["brief"],
+							usage = metadata["usage"], description = metadata["description"],
+							hidden = metadata["hidden"])
+		self.loader = loader
+		self.extension = extension
+	
+	async def invoke(self, ctx):
+		try:
+			command = self.loader.resolve(self)
+		except Exception as e:
+			raise commands.CommandInvokeError(e) from e
+		if command is None:
+			raise commands.CommandNotFound(f"Command \"{ctx.invoked_with}\" is not found")
+		ctx.command = command
+		await command.invoke(ctx)
+
+class DeferredGroup(DeferredCommand, commands.Group):
+	
+	'''
+	Placeholder for a group in a cog that hasn't been loaded yet
+	Also loads the cog when its subcommands are looked up, e.g. by get_command or help
+	'''
+	
+	@property
+	def all_commands(self):
+		group = self.loader.resolve(self)
+		return group.all_commands if group else {}
+	
+	@all_commands.setter
+	def all_commands(self, value):
+		# Set by GroupMixin.__init__, but the subcommands are the real group's
+		pass
+
+class CogLoader:
+	
+	'''
+	Cog loader with per-cog load times
+	In lazy mode, cogs in the manifest are deferred until one of their commands is invoked,
+	one of their groups' subcommands is looked up, or the cog itself is looked up with the bot's get_cog
+	'''
+	
+	# Incremented when the recorded metadata changes, so older manifests are rebuilt
+	manifest_version = 2
+	
+	def __init__(self, bot, manifest_path, *, eager = ()):
+		self.bot = bot
+		self.manifest_path = manifest_path
+		# Extensions that other cogs or the bot depend on being loaded
+		self.eager = set(eager)
+		try:
+			with open(self.manifest_path, 'r') as manifest_file:
+				manifest = json.load(manifest_file)
+		except (FileNotFoundError, ValueError):
+			manifest = {}
+		# Extension: entry
+		self.manifest = manifest.get("extensions", {}) if manifest.get("version") == self.manifest_version else {}
+		self.manifest_changed = False
+		self.load_times = {}
+		# Extension: placeholder commands
+		self.deferred = {}
+		# Cog name: extension
+		self.deferred_cogs = {}
+		# Extension: exception
+		self.failed = {}
+	
+	def source_mtime(self, extension):
+		return os.stat(extension.replace('.', '/') + ".py").st_mtime
+	
+	def load_all(self, extensions, *, lazy = False):
+		for extension in extensions:
+			entry = self.manifest.get(extension)
+			if lazy and entry and entry["deferrable"] and entry["mtime"] == self.source_mtime(extension):
+				self.defer(extension, entry)
+			else:
+				try:
+					self.load(extension)
+				except errors.ServiceUnavailable as e:
+					# Skipped, so a cog with an unavailable external client doesn't stop startup
+					# Other errors still do, e.g. so CI fails on a broken cog
+					self.failed[extension] = e
+					print(f"{self.bot.console_message_prefix}Failed to load {extension}: {type(e).__name__}: {e}")
+		self.write_manifest()
+	
+	def defer(self, extension, entry):
+		placeholders = self.deferred[extension] = []
+		for metadata in entry["commands"]:
+			placeholder_type = DeferredGroup if metadata["group"] else DeferredCommand
+			placeholder = placeholder_type(self, extension, metadata)
+			try:
+				self.bot.add_command(placeholder)
+			except commands.ClientException:
+				continue
+			placeholders.append(placeholder)
+		for cog_name in entry["cogs"]:
+			self.deferred_cogs[cog_name] = extension
+	
+	def remove_placeholders(self, extension):
+		for placeholder in self.deferred.pop(extension, ()):
+			if self.bot.all_commands.get(placeholder.name) is placeholder:
+				self.bot.remove_command(placeholder.name)
+		for cog_name, cog_extension in list(self.deferred_cogs.items()):
+			if cog_extension == extension:
+				del self.deferred_cogs[cog_name]
+	
+	def resolve(self, placeholder):
+		'''Load a placeholder's cog, returning the real command, or None if the cog no longer has it'''
+		self.load(placeholder.extension)
+		self.write_manifest()
+		command = self.bot.all_commands.get(placeholder.name)
+		return None if command is None or isinstance(command, DeferredCommand) else command
+	
+	def deferred_cog(self, name):
+		'''Load a deferred cog by name, returning it, or None if it isn't deferred'''
+		extension = self.deferred_cogs.get(name)
+		if extension is None:
+			return None
+		self.load(extension)
+		self.write_manifest()
+		return self.bot.cogs.get(name)
+	
+	def load(self, extension):
+		'''Load a cog, recording its load time and the commands it registers'''
+		self.remove_placeholders(extension)
+		if extension in self.bot.extensions:
+			return
+		commands_before = set(self.bot.all_commands.values())
+		listeners_before = sum(len(listeners) for listeners in self.bot.extra_events.values())
+		start = time.perf_counter()
+		self.bot.load_extension(extension)
+		self.load_times[extension] = time.perf_counter() - start
+		self.failed.pop(extension, None)
+		new_commands = set(self.bot.all_commands.values()) - commands_before
+		listeners = sum(len(listeners) for listeners in self.bot.extra_events.values())
+		cogs = [cog for cog in self.bot.cogs.values() if type(cog).__module__ == extension]
+		# Cogs with listeners or unload hooks (usually for background tasks) can't be deferred
+		deferrable = (extension not in self.eager and listeners == listeners_before and
+						not any(hasattr(cog, f"_{type(cog).__name__}__unload") for cog in cogs))
+		entry = {"mtime": self.source_mtime(extension), "deferrable": deferrable,
+					"cogs": sorted(type(cog).__name__ for cog in cogs),
+					"commands": [{"name": command.name, "aliases": list(command.aliases),
+									"help": command.help, "brief": command.brief, "usage": command.usage,
+									"description": command.description, "hidden": command.hidden,
+									"group": isinstance(command, commands.Group)}
+									for command in sorted(new_commands, key = lambda command: command.name)]}
+		if self.manifest.get(extension) != entry:
+			self.manifest[extension] = entry
+			self.manifest_changed = True
+	
+	def unload(self, extension):
+		self.remove_placeholders(extension)
+		self.bot.unload_extension(extension)
+	
+	def write_manifest(self):
+		if self.manifest_changed:
+			write_json(self.manifest_path, {"version": self.manifest_version, "extensions": self.manifest}, indent = 4)
+			self.manifest_changed = False
+	
+	def report(self, limit = 5):
+		total = sum(self.load_times.values())
+		slowest = sorted(self.load_times.items(), key = lambda item: item[1], reverse = True)[:limit]
+		report = (f"Loaded {len(self.load_times)} cogs in {total:.2f}s, deferred {len(self.deferred)}; slowest: " +
+					", ".join(f"{extension[5:]} ({load_time:.2f}s)" for extension, load_time in slowest))
+		if self.failed:
+			report += "; failed: " + ", ".join(extension[5:] for extension in self.failed)
+		return report
+
@@ -2,9 +2,6 @@
 import discord
 from discord.ext import commands
 
-import collections
-import json
-
 from modules import utilities
 from utilities import errors
 
@@ -47,36 +44,18 @@ class Context(commands.Context):
 	def whisper(self, *args, **kwargs):
 		return self.author.send(*args, **kwargs)
 	
-	# TODO: Improve + Optimize
 	def get_permission(self, permission, *, type = "user", id = None):
-		try:
-			with open(f"{self.bot.data_path}/permissions/{self.guild.id}.json", "x+") as permissions_file:
-				json.dump({"name" : self.guild.name}, permissions_file, indent = 4)
-		except FileExistsError:
-			pass
-		else:
-			return None
-		with open(f"{self.bot.data_path}/permissions/{self.guild.id}.json", 'r') as permissions_file:
-			permissions_data = json.load(permissions_file)
+		guild_permissions = self.bot.permission_index.get(self.guild)
 		if type == "everyone":
-			return permissions_data.get("everyone", {}).get(permission)
+			return guild_permissions.get_everyone_permission(permission)
 		elif type == "role":
-			role_setting = permissions_data.get("roles", {}).get(str(id), {}).get(permission)
-			if role_setting is not None:
-				return role_setting
-			return permissions_data.get("everyone", {}).get(permission)
+			return guild_permissions.get_role_permission(id, permission)
 		elif type == "user":
-			user_setting = permissions_data.get("users", {}).get(str(id), {}).get(permission)
-			if user_setting is not None:
-				return user_setting
-			user = discord.utils.get(self.guild.members, id = id)
-			role_positions = {}
-			for role in user.roles:
-				role_positions[role.position] = role
-			sorted_role_positions = collections.OrderedDict(sorted(role_positions.items(), reverse = True))
-			for role_position, role in sorted_role_positions.items():
-				role_setting = permissions_data.get("roles", {}).get(str(role.id), {}).get(permission)
-				if role_setting is not None:
-					return role_setting
-			return permissions_data.get("everyone", {}).get(permission)
+			member = self.guild.get_member(id)
+			if member is None:
+				user_setting = guild_permissions.users.get(id, {}).get(permission)
+				if user_setting is not None:
+					return user_setting
+				return guild_permissions.get_everyone_permission(permission)
+			return guild_permissions.get_user_permission(member, permission)
 
@@ -0,0 +1,471 @@
+
+import datetime
+import json
+import os
+
+class Repository:
+	
+	'''
+	PostgreSQL repository for prefixes, guild settings, permissions, tags, pokes, and user stats
+	Queries go through the connection pool's prepared statement cache
+	The JSON data tree is imported once, when the database is first initialized
+	'''
+	
+	def __init__(self, bot):
+		self.bot = bot
+	
+	async def initialize_database(self):
+		await self.bot.connect_to_database()
+		for schema in ("guilds", "meta", "permissions", "tags", "users"):
+			await self.bot.db.execute(f"CREATE SCHEMA IF NOT EXISTS {schema}")
+		await self.bot.db.execute(
+			"""
+			CREATE TABLE IF NOT EXISTS guilds.prefixes (
+				id			BIGINT PRIMARY KEY,
+				prefixes	TEXT [] NOT NULL
+			)
+			"""
+		)
+		await self.bot.db.execute(
+			"""
+			CREATE TABLE IF NOT EXISTS guilds.settings (
+				guild_id	BIGINT,
+				setting		TEXT,
+				value		JSONB,
+				PRIMARY KEY (guild_id, setting)
+			)
+			"""
+		)
+		await self.bot.db.execute(
+			"""
+			CREATE TABLE IF NOT EXISTS permissions.settings (
+				guild_id	BIGINT,
+				type		TEXT,
+				object_id	BIGINT,
+				permission	TEXT,
+				setting		BOOL,
+				PRIMARY KEY (guild_id, type, object_id, permission)
+			)
+			"""
+		)
+		await self.bot.db.execute(
+			"""
+			CREATE INDEX IF NOT EXISTS settings_guild_id_permission_index
+			ON permissions.settings (guild_id, permission)
+			"""
+		)
+		await self.bot.db.execute(
+			"""
+			CREATE TABLE IF NOT EXISTS tags.global (
+				tag				TEXT PRIMARY KEY,
+				response		TEXT,
+				owner			BIGINT,
+				created_at		TIMESTAMPTZ DEFAULT NOW(),
+				usage_counter	BIGINT DEFAULT 0
+			)
+			"""
+		)
+		# Missing from tables created before global tags had owners
+		await self.bot.db.execute(
+			"""
+			ALTER TABLE tags.global
+			ADD COLUMN IF NOT EXISTS owner BIGINT,
+			ADD COLUMN IF NOT EXISTS created_at TIMESTAMPTZ DEFAULT NOW()
+			"""
+		)
+		await self.bot.db.execute(
+			"""
+			CREATE TABLE IF NOT EXISTS tags.individual (
+				user_id		BIGINT,
+				tag			TEXT,
+				content		TEXT,
+				PRIMARY KEY (user_id, tag)
+			)
+			"""
+		)
+		await self.bot.db.execute(
+			"""
+			CREATE TABLE IF NOT EXISTS users.pokes (
+				user_id		BIGINT,
+				target_id	BIGINT,
+				pokes		BIGINT DEFAULT 0,
+				PRIMARY KEY (user_id, target_id)
+			)
+			"""
+		)
+		await self.bot.db.execute(
+			"""
+			CREATE TABLE IF NOT EXISTS users.stats (
+				user_id				BIGINT PRIMARY KEY,
+				commands_executed	BIGINT DEFAULT 0,
+				points				BIGINT DEFAULT 0,
+				respects_paid		BIGINT DEFAULT 0
+			)
+			"""
+		)
+		await self.bot.db.execute(
+			"""
+			CREATE TABLE IF NOT EXISTS meta.imports (
+				name			TEXT PRIMARY KEY,
+				imported_at		TIMESTAMPTZ DEFAULT NOW()
+			)
+			"""
+		)
+		if not await self.bot.db.fetchval("SELECT EXISTS (SELECT 1 FROM meta.imports WHERE name = 'json_data')"):
+			counts = await self.import_json_data(self.bot.data_path, initial = True)
+			if counts:
+				print(f"{self.bot.console_message_prefix}Imported JSON data: " + 
+						", ".join(f"{count:,} {table}" for table, count in counts.items()))
+	
+	# Prefixes
+	
+	async def get_all_prefixes(self):
+		records = await self.bot.db.fetch("SELECT id, prefixes FROM guilds.prefixes")
+		return {record["id"]: record["prefixes"] for record in records}
+	
+	async def get_prefixes(self, id):
+		return await self.bot.db.fetchval("SELECT prefixes FROM guilds.prefixes WHERE id = $1", id)
+	
+	async def set_prefixes(self, id, prefixes):
+		await self.bot.db.execute(
+			"""
+			INSERT INTO guilds.prefixes (id, prefixes)
+			VALUES ($1, $2)
+			ON CONFLICT (id) DO
+			UPDATE SET prefixes = $2
+			""", id, list(prefixes)
+		)
+	
+	# Guild settings
+	
+	async def get_all_guild_settings(self):
+		records = await self.bot.db.fetch("SELECT guild_id, setting, value FROM guilds.settings")
+		settings = {}
+		for record in records:
+			settings.setdefault(record["guild_id"], {})[record["setting"]] = json.loads(record["value"])
+		return settings
+	
+	async def get_guild_settings(self, guild_id):
+		records = await self.bot.db.fetch("SELECT setting, value FROM guilds.settings WHERE guild_id = $1", guild_id)
+		return {record["setting"]: json.loads(record["value"]) for record in records}
+	
+	async def set_guild_setting(self, guild_id, setting, value):
+		await self.bot.db.execute(
+			"""
+			INSERT INTO guilds.settings (guild_id, setting, value)
+			VALUES ($1, $2, $3)
+			ON CONFLICT (guild_id, setting) DO
+			UPDATE SET value = $3
+			""", guild_id, setting, json.dumps(value)
+		)
+	
+	# Permissions
+	
+	@staticmethod
+	def add_permission_record(data, record):
+		'''Add a permission record to a guild's permissions, in the same format as the permissions files'''
+		if record["type"] == "everyone":
+			data.setdefault("everyone", {})[record["permission"]] = record["setting"]
+		else:
+			settings = data.setdefault(record["type"], {}).setdefault(str(record["object_id"]), {})
+			settings[record["permission"]] = record["setting"]
+	
+	async def get_all_permissions(self):
+		'''Get permissions for all guilds, by guild ID'''
+		records = await self.bot.db.fetch("SELECT guild_id, type, object_id, permission, setting FROM permissions.settings")
+		permissions = {}
+		for record in records:
+			self.add_permission_record(permissions.setdefault(record["guild_id"], {}), record)
+		return permissions
+	
+	async def get_permissions(self, guild_id):
+		'''Get permissions for a guild, in the same format as the permissions files'''
+		records = await self.bot.db.fetch(
+			"SELECT type, object_id, permission, setting FROM permissions.settings WHERE guild_id = $1", guild_id
+		)
+		data = {}
+		for record in records:
+			self.add_permission_record(data, record)
+		return data
+	
+	async def set_permission(self, guild_id, permission, setting, *, type = "everyone", object_id = 0):
+		await self.bot.db.execute(
+			"""
+			INSERT INTO permissions.settings (guild_id, type, object_id, permission, setting)
+			VALUES ($1, $2, $3, $4, $5)
+			ON CONFLICT (guild_id, type, object_id, permission) DO
+			UPDATE SET setting = $5
+			""", guild_id, type, object_id, permission, setting
+		)
+	
+	# Tags
+	
+	async def get_tag(self, user_id, tag):
+		return await self.bot.db.fetchval("SELECT content FROM tags.individual WHERE user_id = $1 AND tag = $2",
+											user_id, tag)
+	
+	async def get_tags(self, user_id):
+		'''Names of a user's tags, sorted'''
+		records = await self.bot.db.fetch("SELECT tag FROM tags.individual WHERE user_id = $1 ORDER BY tag", user_id)
+		return [record["tag"] for record in records]
+	
+	async def add_tag(self, user_id, tag, content):
+		'''Add a tag, returning whether it was added, i.e. the user didn't already have it'''
+		return bool(await self.bot.db.fetchval(
+			"""
+			INSERT INTO tags.individual (user_id, tag, content)
+			VALUES ($1, $2, $3)
+			ON CONFLICT (user_id, tag) DO NOTHING
+			RETURNING TRUE
+			""", user_id, tag, content
+		))
+	
+	async def set_tag(self, user_id, tag, content):
+		await self.bot.db.execute(
+			"""
+			INSERT INTO tags.individual (user_id, tag, content)
+			VALUES ($1, $2, $3)
+			ON CONFLICT (user_id, tag) DO
+			UPDATE SET content = $3
+			""", user_id, tag, content
+		)
+	
+	async def delete_tag(self, user_id, tag):
+		'''Delete a tag, returning whether it existed'''
+		return bool(await self.bot.db.fetchval(
+			"DELETE FROM tags.individual WHERE user_id = $1 AND tag = $2 RETURNING TRUE", user_id, tag
+		))
+	
+	async def get_global_tag(self, tag):
+		return await self.bot.db.fetchrow(
+			"SELECT response, owner, created_at, usage_counter FROM tags.global WHERE tag = $1", tag
+		)
+	
+	async def get_global_tag_names(self):
+		records = await self.bot.db.fetch("SELECT tag FROM tags.global")
+		return [record["tag"] for record in records]
+	
+	async def use_global_tag(self, tag):
+		return await self.bot.db.fetchval(
+			"""
+			UPDATE tags.global
+			SET usage_counter = usage_counter + 1
+			WHERE tag = $1
+			RETURNING response
+			""", tag
+		)
+	
+	async def add_global_tag(self, tag, response, owner):
+		'''Add a global tag, returning whether it was added, i.e. it didn't already exist'''
+		return bool(await self.bot.db.fetchval(
+			"""
+			INSERT INTO tags.global (tag, response, owner)
+			VALUES ($1, $2, $3)
+			ON CONFLICT (tag) DO NOTHING
+			RETURNING TRUE
+			""", tag, response, owner
+		))
+	
+	async def set_global_tag(self, tag, response):
+		await self.bot.db.execute("UPDATE tags.global SET response = $2 WHERE tag = $1", tag, response)
+	
+	async def delete_global_tag(self, tag):
+		await self.bot.db.execute("DELETE FROM tags.global WHERE tag = $1", tag)
+	
+	async def globalize_tag(self, user_id, tag):
+		'''Move a user's tag to a global tag they own, returning whether it was moved, i.e. the global tag didn't already exist'''
+		async with self.bot.database_connection_pool.acquire() as connection:
+			async with connection.transaction():
+				globalized = await connection.fetchval(
+					"""
+					INSERT INTO tags.global (tag, response, owner)
+					SELECT tag, content, user_id FROM tags.individual
+					WHERE user_id = $1 AND tag = $2
+					ON CONFLICT (tag) DO NOTHING
+					RETURNING TRUE
+					""", user_id, tag
+				)
+				if globalized:
+					await connection.execute("DELETE FROM tags.individual WHERE user_id = $1 AND tag = $2", user_id, tag)
+		return bool(globalized)
+	
+	# Pokes
+	
+	async def poke(self, user_id, target_id):
+		'''Increment and return the number of times a user has poked the target'''
+		return await self.bot.db.fetchval(
+			"""
+			INSERT INTO users.pokes (user_id, target_id, pokes)
+			VALUES ($1, $2, 1)
+			ON CONFLICT (user_id, target_id) DO
+			UPDATE SET pokes = users.pokes.pokes + 1
+			RETURNING pokes
+			""", user_id, target_id
+		)
+	
+	# User stats
+	
+	async def get_user_stats(self, user_id):
+		record = await self.bot.db.fetchrow(
+			"SELECT commands_executed, points, respects_paid FROM users.stats WHERE user_id = $1", user_id
+		)
+		return dict(record) if record else {"commands_executed": 0, "points": 0, "respects_paid": 0}
+	
+	async def increment_user_stats(self, records):
+		'''Batch upsert of (user_id, commands_executed, points, respects_paid) deltas'''
+		await self.bot.db.executemany(
+			"""
+			INSERT INTO users.stats (user_id, commands_executed, points, respects_paid)
+			VALUES ($1, $2, $3, $4)
+			ON CONFLICT (user_id) DO
+			UPDATE SET commands_executed = users.stats.commands_executed + $2,
+						points = users.stats.points + $3,
+						respects_paid = users.stats.respects_paid + $4
+			""", records
+		)
+	
+	# JSON import
+	
+	def read_json_data(self, path):
+		'''Read the JSON data tree into records for each table'''
+		records = {"prefixes": [], "settings": [], "permissions": [], "global_tags": [], "tags": [],
+					"pokes": [], "stats": []}
+		
+		def load(file_path):
+			try:
+				with open(file_path, 'r') as json_file:
+					return json.load(json_file)
+			except (OSError, ValueError):
+				return None
+		
+		def parse_id(name, location, extension = ""):
+			'''ID a file or key is named by, or None if it isn't, e.g. a backup or .DS_Store, so it's skipped'''
+			id = name[:len(name) - len(extension)]
+			if name.endswith(extension) and id.isdigit():
+				return int(id)
+			print(f"{self.bot.console_message_prefix}Skipping {location}/{name} in JSON import, as it isn't named by an ID")
+			return None
+		
+		for id, prefixes in (load(path + "/prefixes.json") or {}).items():
+			id = parse_id(id, "prefixes.json")
+			if prefixes and id is not None:
+				records["prefixes"].append((id, list(prefixes)))
+		if os.path.isdir(path + "/server_data"):
+			for directory in os.listdir(path + "/server_data"):
+				guild_id = parse_id(directory, "server_data")
+				if guild_id is None:
+					continue
+				for setting, value in (load(f"{path}/server_data/{directory}/settings.json") or {}).items():
+					records["settings"].append((guild_id, setting, json.dumps(value)))
+		if os.path.isdir(path + "/permissions"):
+			for file in os.listdir(path + "/permissions"):
+				guild_id = parse_id(file, "permissions", ".json")
+				if guild_id is None:
+					continue
+				data = load(f"{path}/permissions/{file}") or {}
+				for permission, setting in data.get("everyone", {}).items():
+					records["permissions"].append((guild_id, "everyone", 0, permission, setting))
+				for type in ("roles", "users"):
+					for object_id, settings in data.get(type, {}).items():
+						object_id = parse_id(object_id, f"permissions/{file}")
+						if object_id is None:
+							continue
+						for permission, setting in settings.items():
+							if permission != "name":
+								records["permissions"].append((guild_id, type, object_id, permission, setting))
+		tags_data = load(path + "/tags.json") or {}
+		for tag, info in tags_data.pop("global", {}).items():
+			owner = int(info["owner"]) if info.get("owner") else None
+			created_at = datetime.datetime.fromtimestamp(info.get("created_at", 0), datetime.timezone.utc)
+			records["global_tags"].append((tag, info["response"], owner, created_at, info.get("usage_counter", 0)))
+		for user_id, info in tags_data.items():
+			user_id = parse_id(user_id, "tags.json")
+			if user_id is None:
+				continue
+			for tag, content in info.get("tags", {}).items():
+				records["tags"].append((user_id, tag, content))
+		if os.path.isdir(path + "/user_data"):
+			for directory in os.listdir(path + "/user_data"):
+				user_id = parse_id(directory, "user_data")
+				if user_id is None:
+					continue
+				for target_id, pokes in (load(f"{path}/user_data/{directory}/pokes.json") or {}).items():
+					target_id = parse_id(target_id, f"user_data/{directory}/pokes.json")
+					if target_id is not None:
+						records["pokes"].append((user_id, target_id, pokes))
+				stats = load(f"{path}/user_data/{directory}/stats.json")
+				if stats:
+					records["stats"].append((user_id, stats.get("commands_executed", 0),
+												stats.get("points", 0), stats.get("respects_paid", 0)))
+		return records
+	
+	async def import_json_data(self, path, *, initial = False):
+		'''
+		Import the JSON data tree, overwriting existing rows
+		With initial set, skipped if it's already been imported, e.g. by another cluster starting at the same time
+		'''
+		await self.bot.connect_to_database()
+		records = await self.bot.loop.run_in_executor(None, self.read_json_data, path)
+		async with self.bot.database_connection_pool.acquire() as connection:
+			async with connection.transaction():
+				# Held until the end of the transaction, so concurrent imports are serialized
+				await connection.execute("LOCK TABLE meta.imports IN EXCLUSIVE MODE")
+				if initial and await connection.fetchval(
+					"SELECT EXISTS (SELECT 1 FROM meta.imports WHERE name = 'json_data')"
+				):
+					return None
+				await connection.executemany(
+					"""
+					INSERT INTO guilds.prefixes (id, prefixes) VALUES ($1, $2)
+					ON CONFLICT (id) DO UPDATE SET prefixes = $2
+					""", records["prefixes"]
+				)
+				await connection.executemany(
+					"""
+					INSERT INTO guilds.settings (guild_id, setting, value) VALUES ($1, $2, $3)
+					ON CONFLICT (guild_id, setting) DO UPDATE SET value = $3
+					""", records["settings"]
+				)
+				await connection.executemany(
+					"""
+					INSERT INTO permissions.settings (guild_id, type, object_id, permission, setting)
+					VALUES ($1, $2, $3, $4, $5)
+					ON CONFLICT (guild_id, type, object_id, permission) DO UPDATE SET setting = $5
+					""", records["permissions"]
+				)
+				await connection.executemany(
+					"""
+					INSERT INTO tags.global (tag, response, owner, created_at, usage_counter)
+					VALUES ($1, $2, $3, $4, $5)
+					ON CONFLICT (tag) DO
+					UPDATE SET response = $2, owner = $3, created_at = $4, usage_counter = $5
+					""", records["global_tags"]
+				)
+				await connection.executemany(
+					"""
+					INSERT INTO tags.individual (user_id, tag, content) VALUES ($1, $2, $3)
+					ON CONFLICT (user_id, tag) DO UPDATE SET content = $3
+					""", records["tags"]
+				)
+				await connection.executemany(
+					"""
+					INSERT INTO users.pokes (user_id, target_id, pokes) VALUES ($1, $2, $3)
+					ON CONFLICT (user_id, target_id) DO UPDATE SET pokes = $3
+					""", records["pokes"]
+				)
+				await connection.executemany(
+					"""
+					INSERT INTO users.stats (user_id, commands_executed, points, respects_paid)
+					VALUES ($1, $2, $3, $4)
+					ON CONFLICT (user_id) DO
+					UPDATE SET commands_executed = $2, points = $3, respects_paid = $4
+					""", records["stats"]
+				)
+				await connection.execute(
+					"""
+					INSERT INTO meta.imports (name) VALUES ('json_data')
+					ON CONFLICT (name) DO UPDATE SET imported_at = NOW()
+					"""
+				)
+		return {table: len(table_records) for table, table_records in records.items()}
+
@@ -0,0 +1,251 @@
+
+import asyncio
+import collections.abc
+import contextlib
+import copy
+import itertools
+import json
+import os
+
+try:
+	import fcntl
+except ImportError:
+	# Windows
+	fcntl = None
+	import msvcrt
+
+def write_text(path, text):
+	'''Atomically write text to path by writing a temporary file and renaming it over the original'''
+	temp_path = path + ".tmp"
+	with open(temp_path, 'w') as temp_file:
+		temp_file.write(text)
+	os.replace(temp_path, path)
+
+def write_json(path, data, *, indent = None):
+	write_text(path, json.dumps(data, indent = indent))
+
+@contextlib.contextmanager
+def file_lock(path):
+	'''Exclusive lock on path across processes, held on a lock file beside it'''
+	with open(path + ".lock", 'a+') as lock_file:
+		if fcntl:
+			fcntl.flock(lock_file, fcntl.LOCK_EX)
+		else:
+			lock_file.seek(0)
+			msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+		try:
+			yield
+		finally:
+			if fcntl:
+				fcntl.flock(lock_file, fcntl.LOCK_UN)
+			else:
+				lock_file.seek(0)
+				msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+def file_signature(path):
+	try:
+		stat = os.stat(path)
+	except FileNotFoundError:
+		return None
+	return stat.st_mtime_ns, stat.st_size
+
+MISSING = object()
+
+def merge(base, local, remote):
+	'''
+	Three-way merge of JSON data, applying local's changes from base over remote's
+	Integers changed on both sides are treated as counters, so both changes are kept
+	Otherwise, local changes win conflicts
+	'''
+	if remote == base:
+		return local
+	if local == base or local == remote:
+		return remote
+	if local is MISSING:
+		return MISSING
+	if remote is MISSING:
+		return local
+	if isinstance(local, dict) and isinstance(remote, dict):
+		if not isinstance(base, dict):
+			base = {}
+		merged = {}
+		for key in itertools.chain(remote, (key for key in local if key not in remote)):
+			value = merge(base.get(key, MISSING), local.get(key, MISSING), remote.get(key, MISSING))
+			if value is not MISSING:
+				merged[key] = value
+		return merged
+	if isinstance(local, list) and isinstance(remote, list):
+		if isinstance(base, list) and len(base) == len(local) == len(remote):
+			# Merged by position, e.g. trivia [correct, incorrect, money]
+			return [merge(*values) for values in zip(base, local, remote)]
+		if not isinstance(base, list):
+			base = []
+		# Merged as a collection, e.g. followed feeds
+		return ([item for item in remote if item in local or item not in base] +
+				[item for item in local if item not in base and item not in remote])
+	if all(isinstance(value, int) and not isinstance(value, bool) for value in (local, remote)):
+		return local + remote - (base if isinstance(base, int) and not isinstance(base, bool) else 0)
+	return local
+
+class Document(collections.abc.MutableMapping):
+	
+	'''
+	JSON document held in memory and written behind
+	Call mark_dirty after mutating nested values
+	Changes to the file by other processes, e.g. other clusters, are merged in on writes and periodic checks
+	'''
+	
+	def __init__(self, store, path, data, *, indent = None):
+		self.store = store
+		self.path = path
+		self.data = data
+		self.indent = indent
+		self.dirty = False
+		self.flush_handle = None
+		# Data as last read from or written to the file, for merging
+		self.base = copy.deepcopy(data)
+		self.signature = file_signature(path)
+		# Serializes merges, so each is against the base the last one left
+		self.lock = asyncio.Lock(loop = store.loop)
+		# Functions called with the document after changes from another process are merged in
+		self.listeners = []
+	
+	def __getitem__(self, key):
+		return self.data[key]
+	
+	def __setitem__(self, key, value):
+		self.data[key] = value
+		self.mark_dirty()
+	
+	def __delitem__(self, key):
+		del self.data[key]
+		self.mark_dirty()
+	
+	def __iter__(self):
+		return iter(self.data)
+	
+	def __len__(self):
+		return len(self.data)
+	
+	def __repr__(self):
+		return f"<Document path={self.path!r} dirty={self.dirty}>"
+	
+	def mark_dirty(self):
+		self.dirty = True
+		self.store.schedule(self)
+	
+	def snapshot(self):
+		self.dirty = False
+		return json.dumps(self.data)
+	
+	def read(self):
+		with file_lock(self.path):
+			with open(self.path, 'r') as document_file:
+				data = json.load(document_file)
+			return data, file_signature(self.path)
+	
+	def write(self, text):
+		'''Merge a snapshot into the file's current data and write the result'''
+		local = json.loads(text)
+		with file_lock(self.path):
+			try:
+				with open(self.path, 'r') as document_file:
+					remote = json.load(document_file)
+			except FileNotFoundError:
+				remote = self.base
+			merged = merge(self.base, local, remote)
+			write_json(self.path, merged, indent = self.indent)
+			return local, merged, file_signature(self.path)
+	
+	def apply(self, base, remote, signature):
+		'''Merge remote, the file's data, into the current data, with base the data it was last merged from'''
+		changed = remote != base
+		# Copied so mutating the data can't change the base
+		self.data = merge(base, self.data, copy.deepcopy(remote))
+		self.base = remote
+		self.signature = signature
+		if changed:
+			for listener in self.listeners:
+				listener(self)
+
+class DocumentStore:
+	
+	'''
+	Write-behind JSON document store
+	Coalesces writes to each document within the debounce interval
+	Checks documents' files for changes by other processes on an interval
+	'''
+	
+	def __init__(self, loop, *, debounce = 5.0, check_interval = 10.0):
+		self.loop = loop
+		self.debounce = debounce
+		self.check_interval = check_interval
+		self.documents = {}
+		self.task = self.loop.create_task(self.check_task())
+	
+	def open(self, path, *, default = None, indent = None):
+		document = self.documents.get(path)
+		if document is not None:
+			return document
+		os.makedirs(os.path.dirname(path) or '.', exist_ok = True)
+		with file_lock(path):
+			try:
+				with open(path, 'r') as document_file:
+					data = json.load(document_file)
+			except FileNotFoundError:
+				data = copy.deepcopy(default) if default is not None else {}
+				write_json(path, data, indent = indent)
+		document = self.documents[path] = Document(self, path, data, indent = indent)
+		return document
+	
+	def schedule(self, document):
+		if document.flush_handle is None:
+			document.flush_handle = self.loop.call_later(self.debounce, self.start_write, document)
+	
+	def start_write(self, document):
+		document.flush_handle = None
+		if document.dirty:
+			self.loop.create_task(self.write(document))
+	
+	async def write(self, document):
+		async with document.lock:
+			if not document.dirty:
+				return
+			# Serialize on the event loop for a consistent snapshot, then merge and write in the executor
+			text = document.snapshot()
+			try:
+				local, merged, signature = await self.loop.run_in_executor(None, document.write, text)
+			except (OSError, ValueError) as e:
+				print(f"Failed to write {document.path}: {e}")
+				document.mark_dirty()
+				return
+			# Changes made while writing are kept over the merged data
+			document.apply(local, merged, signature)
+	
+	async def refresh(self, document):
+		'''Merge in changes to the file by other processes'''
+		signature = file_signature(document.path)
+		if signature is None or signature == document.signature:
+			return
+		async with document.lock:
+			try:
+				remote, signature = await self.loop.run_in_executor(None, document.read)
+			except (OSError, ValueError) as e:
+				print(f"Failed to read {document.path}: {e}")
+				return
+			document.apply(document.base, remote, signature)
+	
+	async def check_task(self):
+		while True:
+			await asyncio.sleep(self.check_interval)
+			for document in list(self.documents.values()):
+				await self.refresh(document)
+	
+	async def flush_all(self):
+		'''Write all dirty documents, e.g. at shutdown'''
+		for document in self.documents.values():
+			if document.flush_handle:
+				document.flush_handle.cancel()
+				document.flush_handle = None
+			await self.write(document)
+
@@ -42,3 +42,11 @@ class AudioAlreadyDone(AudioError):
 	'''Audio Already Done playing'''
 	pass
 
+class SDKTimeout(CommandError):
+	'''Third-party SDK call timed out'''
+	pass
+
+class ServiceUnavailable(CommandError):
+	'''External client unavailable'''
+	pass
+
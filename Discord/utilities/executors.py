@@ -0,0 +1,116 @@
+
+import asyncio
+import concurrent.futures
+import functools
+import threading
+import time
+
+from utilities import errors
+
+class BoundedExecutor:
+	
+	'''
+	Named, bounded thread pool for a synchronous SDK
+	Calls past the concurrency cap wait in the pool's queue, and their timeouts start once they're running
+	'''
+	
+	def __init__(self, loop, name, *, max_workers = 4, timeout = 30.0):
+		self.loop = loop
+		self.name = name
+		self.max_workers = max_workers
+		self.timeout = timeout
+		self.executor = concurrent.futures.ThreadPoolExecutor(max_workers = max_workers,
+																thread_name_prefix = name)
+		self.lock = threading.Lock()
+		self.queued = 0
+		self.active = 0
+		self.max_queued = 0
+		self.calls = 0
+		self.completed = 0
+		self.cancelled = 0
+		self.failures = 0
+		self.timeouts = 0
+		self.total_time = 0.0
+	
+	def call(self, func, started):
+		with self.lock:
+			self.queued -= 1
+			self.active += 1
+		self.loop.call_soon_threadsafe(self.set_started, started)
+		start = time.perf_counter()
+		try:
+			return func()
+		finally:
+			with self.lock:
+				self.active -= 1
+				self.completed += 1
+				self.total_time += time.perf_counter() - start
+	
+	@staticmethod
+	def set_started(started):
+		if not started.done():
+			started.set_result(None)
+	
+	def call_done(self, future):
+		# Calls cancelled while still queued never run
+		if future.cancelled():
+			with self.lock:
+				self.queued -= 1
+				self.cancelled += 1
+	
+	async def run(self, func, *args, timeout = None, **kwargs):
+		'''
+		Run func in the pool
+		Raises SDKTimeout if it doesn't finish within the timeout once running, though the call itself can't be interrupted
+		'''
+		with self.lock:
+			self.queued += 1
+			self.max_queued = max(self.max_queued, self.queued)
+			self.calls += 1
+		started = self.loop.create_future()
+		concurrent_future = self.executor.submit(self.call, functools.partial(func, *args, **kwargs), started)
+		concurrent_future.add_done_callback(self.call_done)
+		future = asyncio.wrap_future(concurrent_future, loop = self.loop)
+		try:
+			# Time queued behind other calls doesn't count towards the timeout
+			await asyncio.wait((started, future), return_when = asyncio.FIRST_COMPLETED)
+			return await asyncio.wait_for(future, timeout or self.timeout)
+		except asyncio.CancelledError:
+			# Removed from the queue if it hasn't started yet
+			future.cancel()
+			raise
+		except asyncio.TimeoutError:
+			self.timeouts += 1
+			raise errors.SDKTimeout(self.name) from None
+		except Exception:
+			self.failures += 1
+			raise
+	
+	@property
+	def average_time(self):
+		return self.total_time / self.completed if self.completed else 0.0
+
+class ExecutorGateway:
+	
+	'''
+	Offloads synchronous third-party SDK calls to a bounded pool per SDK
+	So one slow provider can't exhaust the default executor
+	'''
+	
+	# Name: (concurrency cap, default per-call timeout in seconds)
+	pools = {"clarifai": (4, 30.0), "imgur": (4, 30.0), "owm": (2, 15.0), "tweepy": (4, 30.0),
+				"wolfram_alpha": (4, 30.0), "wordnik": (4, 15.0), "youtube_dl": (8, 60.0)}
+	
+	def __init__(self, loop):
+		self.executors = {name: BoundedExecutor(loop, name, max_workers = max_workers, timeout = timeout)
+							for name, (max_workers, timeout) in self.pools.items()}
+	
+	def __getitem__(self, name):
+		return self.executors[name]
+	
+	def __iter__(self):
+		return iter(self.executors.values())
+	
+	async def run(self, name, func, *args, **kwargs):
+		return await self.executors[name].run(func, *args, **kwargs)
+
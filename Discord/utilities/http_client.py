@@ -0,0 +1,262 @@
+
+import asyncio
+import collections
+import concurrent.futures
+import hashlib
+import json
+import re
+import sqlite3
+import time
+import urllib.parse
+
+# (host, path pattern, TTL in seconds), first match applies
+# None TTL means immutable; unmatched URLs aren't cached
+default_rules = (
+	("pokeapi.co", r"/api/v2/", None),
+	("xkcd.com", r"/\d+/info\.0\.json", None),
+	("xkcd.com", r"/info\.0\.json", 600),
+	("data.fixer.io", r"/api/\d{4}-\d{2}-\d{2}", None),
+	("data.fixer.io", r"/api/symbols", 86400),
+	("data.fixer.io", r"/api/latest", 3600),
+	("api.coindesk.com", r"/v1/bpi/supported-currencies\.json", 86400),
+	("api.coindesk.com", r"/v1/bpi/currentprice", 60),
+	("api.arcsecond.io", r"/", 86400),
+	("overwatch-api.net", r"/", 86400),
+	("owapi.net", r"/", 600),
+	("lichess.org", r"/api/user/", 60),
+	("en.lichess.org", r"/api/user/", 60),
+	("maps.googleapis.com", r"/maps/api/geocode/", 86400),
+	("api.open-notify.org", r"/astros\.json", 3600),
+	("thecatapi.com", r"/api/categories/list", 86400),
+	("dog.ceo", r"/api/breeds/list/all", 86400),
+	("sandipbgt.com", r"/theastrologer/api/sunsigns", 86400),
+	("api.steampowered.com", r"/ISteamApps/GetAppList/", 3600),
+	("cve.circl.lu", r"/api/cve/", 86400),
+)
+
+class CachedResponse:
+	
+	'''Fully read HTTP response, with a similar interface to aiohttp.ClientResponse'''
+	
+	__slots__ = ("url", "status", "headers", "body", "expires")
+	
+	def __init__(self, url, status, headers, body, expires = None):
+		self.url = url
+		self.status = status
+		self.headers = headers
+		self.body = body
+		self.expires = expires  # None if immutable
+	
+	@property
+	def etag(self):
+		return self.headers.get("ETag")
+	
+	@property
+	def last_modified(self):
+		return self.headers.get("Last-Modified")
+	
+	@property
+	def charset(self):
+		match = re.search(r"charset=([\w-]+)", self.headers.get("Content-Type", ""))
+		return match.group(1) if match else None
+	
+	def fresh(self, now):
+		return self.expires is None or now < self.expires
+	
+	async def read(self):
+		return self.body
+	
+	async def text(self, encoding = None):
+		return self.body.decode(encoding or self.charset or "UTF-8")
+	
+	async def json(self, *, content_type = None, loads = json.loads):
+		# Content type isn't checked, as the content_type argument is only used to permit mismatches
+		text = await self.text()
+		return loads(text) if text.strip() else None
+
+class RequestContextManager:
+	
+	'''Allows both await client.get(...) and async with client.get(...) as resp'''
+	
+	def __init__(self, coroutine):
+		self.coroutine = coroutine
+	
+	def __await__(self):
+		return self.coroutine.__await__()
+	
+	async def __aenter__(self):
+		return await self.coroutine
+	
+	async def __aexit__(self, exc_type, exc, traceback):
+		pass
+
+class HostStats:
+	
+	__slots__ = ("hits", "disk_hits", "revalidated", "misses", "coalesced", "uncached")
+	
+	def __init__(self):
+		self.hits = self.disk_hits = self.revalidated = self.misses = self.coalesced = self.uncached = 0
+	
+	@property
+	def hit_rate(self):
+		cacheable = self.hits + self.disk_hits + self.revalidated + self.misses + self.coalesced
+		return (cacheable - self.misses) / cacheable if cacheable else 0.0
+
+class ResponseDatabase:
+	
+	'''On-disk SQLite cache tier, used from a single thread'''
+	
+	def __init__(self, path):
+		self.path = path
+		self.connection = None
+	
+	def connect(self):
+		self.connection = sqlite3.connect(self.path)
+		self.connection.execute(
+			"""
+			CREATE TABLE IF NOT EXISTS responses (
+				key		TEXT PRIMARY KEY,
+				url		TEXT,
+				status	INTEGER,
+				headers	TEXT,
+				body	BLOB,
+				expires	REAL
+			)
+			"""
+		)
+		self.connection.commit()
+	
+	def get(self, key):
+		if self.connection is None:
+			self.connect()
+		row = self.connection.execute("SELECT url, status, headers, body, expires FROM responses WHERE key = ?",
+										(key,)).fetchone()
+		if row:
+			url, status, headers, body, expires = row
+			return CachedResponse(url, status, json.loads(headers), body, expires)
+	
+	def set(self, key, response):
+		try:
+			if self.connection is None:
+				self.connect()
+			self.connection.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+									(key, response.url, response.status, json.dumps(response.headers), response.body,
+										response.expires))
+			self.connection.commit()
+		except sqlite3.Error as e:
+			print(f"Failed to store HTTP response for {response.url}: {e}")
+
+class CachingHTTPClient:
+	
+	'''
+	HTTP client with an in-memory LRU cache and an optional on-disk SQLite tier
+	TTLs are set per endpoint by rules, and stale responses are revalidated with ETag/Last-Modified
+	Identical concurrent requests for cacheable URLs are coalesced into one
+	'''
+	
+	def __init__(self, session, *, rules = default_rules, database_path = None,
+					max_entries = 1024, max_size = 64 * 2 ** 20, rate_limiter = None, max_retry_delay = 10.0):
+		self.session = session
+		self.rate_limiter = rate_limiter
+		self.max_retry_delay = max_retry_delay
+		self.rules = [(host, re.compile(pattern), ttl) for host, pattern, ttl in rules]
+		self.max_entries = max_entries
+		self.max_size = max_size
+		# Key: CachedResponse, in least to most recently used order
+		self.cache = collections.OrderedDict()
+		self.size = 0
+		self.in_flight = {}
+		self.stats = collections.defaultdict(HostStats)
+		self.database = ResponseDatabase(database_path) if database_path else None
+		self.database_executor = concurrent.futures.ThreadPoolExecutor(max_workers = 1, thread_name_prefix = "HTTPCache")
+	
+	def get(self, url, *, params = None, headers = None):
+		return RequestContextManager(self.fetch(url, params = params, headers = headers))
+	
+	def ttl(self, url):
+		'''TTL for a URL, None if immutable, or False if it shouldn't be cached'''
+		parsed = urllib.parse.urlsplit(url)
+		for host, pattern, ttl in self.rules:
+			if parsed.hostname == host and pattern.match(parsed.path):
+				return ttl
+		return False
+	
+	@staticmethod
+	def cache_key(url, params):
+		if params:
+			url += ('&' if '?' in url else '?') + urllib.parse.urlencode(sorted(params.items()))
+		# Hashed, as query parameters can include API keys
+		return hashlib.sha256(url.encode()).hexdigest()
+	
+	async def fetch(self, url, *, params = None, headers = None):
+		host = urllib.parse.urlsplit(url).hostname
+		ttl = self.ttl(url)
+		if ttl is False:
+			self.stats[host].uncached += 1
+			return await self.request(url, params, headers)
+		key = self.cache_key(url, params)
+		response = self.cache.get(key)
+		if response is not None and response.fresh(time.time()):
+			self.cache.move_to_end(key)
+			self.stats[host].hits += 1
+			return response
+		in_flight = self.in_flight.get(key)
+		if in_flight is not None:
+			self.stats[host].coalesced += 1
+			return await asyncio.shield(in_flight)
+		task = self.in_flight[key] = asyncio.ensure_future(self.fetch_cacheable(key, host, url, params, headers, ttl,
+																				response))
+		task.add_done_callback(lambda task: self.in_flight.pop(key, None))
+		# Shielded, so that a cancelled caller doesn't cancel the request for other callers
+		return await asyncio.shield(task)
+	
+	async def fetch_cacheable(self, key, host, url, params, headers, ttl, cached):
+		loop = asyncio.get_event_loop()
+		if cached is None and self.database:
+			cached = await loop.run_in_executor(self.database_executor, self.database.get, key)
+			if cached is not None and cached.fresh(time.time()):
+				self.stats[host].disk_hits += 1
+				self.store(key, cached)
+				return cached
+		if cached is not None:
+			# Revalidate
+			headers = dict(headers or {})
+			if cached.etag:
+				headers["If-None-Match"] = cached.etag
+			if cached.last_modified:
+				headers["If-Modified-Since"] = cached.last_modified
+		response = await self.request(url, params, headers)
+		expires = None if ttl is None else time.time() + ttl
+		if response.status == 304 and cached is not None:
+			self.stats[host].revalidated += 1
+			response = CachedResponse(cached.url, cached.status, cached.headers, cached.body, expires)
+		else:
+			self.stats[host].misses += 1
+			if response.status != 200:
+				return response
+			response.expires = expires
+		self.store(key, response)
+		if self.database:
+			loop.run_in_executor(self.database_executor, self.database.set, key, response)
+		return response
+	
+	async def request(self, url, params, headers, *, retries = 2):
+		async with self.session.get(url, params = params, headers = headers) as resp:
+			body = await resp.read()
+			response = CachedResponse(str(resp.url), resp.status, dict(resp.headers), body)
+		# The rate limiter pauses the host on 429, so a retry waits out Retry-After
+		if (response.status == 429 and retries and self.rate_limiter and 
+			self.rate_limiter.delay(url) <= self.max_retry_delay):
+			return await self.request(url, params, headers, retries = retries - 1)
+		return response
+	
+	def store(self, key, response):
+		previous = self.cache.pop(key, None)
+		if previous is not None:
+			self.size -= len(previous.body)
+		self.cache[key] = response
+		self.size += len(response.body)
+		while self.cache and (len(self.cache) > self.max_entries or self.size > self.max_size):
+			_, evicted = self.cache.popitem(last = False)
+			self.size -= len(evicted.body)
+
@@ -0,0 +1,214 @@
+
+import asyncio
+import itertools
+import json
+
+# Newline-delimited JSON messages over local TCP connections to a broker run by the launcher
+# Requests and notifications are forwarded to every other cluster, and the broker gathers responses to requests
+
+def encode(message):
+	return (json.dumps(message) + '\n').encode("UTF-8")
+
+class IPCBroker:
+	
+	'''Relays messages between cluster processes'''
+	
+	def __init__(self, host = "127.0.0.1", port = 8765):
+		self.host = host
+		self.port = port
+		self.server = None
+		# Cluster ID: StreamWriter
+		self.clusters = {}
+		# Request ID: [requester ID, set of cluster IDs not yet responded, {cluster ID: data}]
+		self.requests = {}
+	
+	async def start(self):
+		self.server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+	
+	async def stop(self):
+		self.server.close()
+		await self.server.wait_closed()
+	
+	def send(self, cluster_id, message):
+		writer = self.clusters.get(cluster_id)
+		if writer is not None:
+			writer.write(encode(message))
+	
+	async def handle_connection(self, reader, writer):
+		line = await reader.readline()
+		try:
+			cluster_id = json.loads(line)["cluster"]
+		except (ValueError, KeyError, TypeError):
+			writer.close()
+			return
+		self.clusters[cluster_id] = writer
+		try:
+			while True:
+				line = await reader.readline()
+				if not line:
+					break
+				self.handle_message(cluster_id, json.loads(line))
+		except (ConnectionError, ValueError):
+			pass
+		finally:
+			if self.clusters.get(cluster_id) is writer:
+				del self.clusters[cluster_id]
+			writer.close()
+			# Don't wait on a cluster that's gone
+			for request_id, (_, waiting, _) in list(self.requests.items()):
+				waiting.discard(cluster_id)
+				self.complete(request_id)
+	
+	def handle_message(self, cluster_id, message):
+		op = message.get("op")
+		if op == "request":
+			request_id = f"{cluster_id}:{message['id']}"
+			others = set(self.clusters) - {cluster_id}
+			self.requests[request_id] = [cluster_id, others, {}]
+			for other in others:
+				self.send(other, {"op": "request", "id": request_id, "command": message["command"],
+									"args": message.get("args", {})})
+			self.complete(request_id)
+		elif op == "response":
+			request = self.requests.get(message["id"])
+			if request is not None:
+				request[1].discard(cluster_id)
+				request[2][cluster_id] = message.get("data")
+				self.complete(message["id"])
+		elif op == "notify":
+			for other in set(self.clusters) - {cluster_id}:
+				self.send(other, message)
+	
+	def complete(self, request_id):
+		requester, waiting, responses = self.requests[request_id]
+		if waiting:
+			return
+		del self.requests[request_id]
+		self.send(requester, {"op": "response", "id": request_id.split(':', 1)[1], "data": responses})
+
+class IPCClient:
+	
+	'''
+	Connection from a cluster process to the broker
+	Handlers are coroutine functions called with a request's or notification's arguments
+	'''
+	
+	def __init__(self, loop, cluster_id, *, host = "127.0.0.1", port = 8765, timeout = 10.0,
+					console_message_prefix = ""):
+		self.loop = loop
+		self.cluster_id = cluster_id
+		self.host = host
+		self.port = port
+		self.timeout = timeout
+		self.console_message_prefix = console_message_prefix
+		# Command: coroutine function
+		self.handlers = {}
+		# Request ID: future
+		self.pending = {}
+		self.request_ids = itertools.count()
+		self.writer = None
+		self.task = None
+	
+	@property
+	def connected(self):
+		return self.writer is not None
+	
+	def start(self):
+		self.task = self.loop.create_task(self.run())
+	
+	async def stop(self):
+		'''Disconnect, after writing any buffered messages'''
+		if self.task:
+			self.task.cancel()
+		writer = self.writer
+		if writer:
+			# Closing the transport flushes its buffer first
+			writer.close()
+			try:
+				await asyncio.wait_for(writer.wait_closed(), self.timeout)
+			except (ConnectionError, asyncio.TimeoutError):
+				pass
+	
+	async def run(self):
+		delay = 1
+		while True:
+			try:
+				reader, writer = await asyncio.open_connection(self.host, self.port)
+			except OSError as e:
+				print(f"{self.console_message_prefix}Failed to connect to IPC broker: {e}")
+				await asyncio.sleep(delay)
+				delay = min(delay * 2, 60)
+				continue
+			delay = 1
+			writer.write(encode({"cluster": self.cluster_id}))
+			self.writer = writer
+			try:
+				while True:
+					line = await reader.readline()
+					if not line:
+						break
+					self.handle_message(json.loads(line))
+			except (ConnectionError, ValueError) as e:
+				print(f"{self.console_message_prefix}IPC connection error: {e}")
+			finally:
+				self.writer = None
+				writer.close()
+				for future in self.pending.values():
+					if not future.done():
+						future.set_result({})
+				self.pending.clear()
+	
+	def handle_message(self, message):
+		op = message.get("op")
+		if op == "response":
+			future = self.pending.pop(message["id"], None)
+			if future is not None and not future.done():
+				# JSON object keys are strings
+				future.set_result({int(cluster_id): data for cluster_id, data in message["data"].items()})
+		elif op in ("request", "notify"):
+			self.loop.create_task(self.handle_command(message))
+	
+	async def handle_command(self, message):
+		handler = self.handlers.get(message["command"])
+		try:
+			if handler is None:
+				raise KeyError(f"No IPC handler for {message['command']}")
+			data = await handler(**message.get("args", {}))
+		except Exception as e:
+			print(f"{self.console_message_prefix}IPC {message['command']} failed: {type(e).__name__}: {e}")
+			data = {"error": f"{type(e).__name__}: {e}"}
+		if message["op"] == "request" and self.writer is not None:
+			self.writer.write(encode({"op": "response", "id": message["id"], "data": data}))
+	
+	async def request(self, command, **args):
+		'''
+		Send a request to every other cluster
+		Returns a dictionary of cluster ID: response, empty if not connected
+		'''
+		if self.writer is None:
+			return {}
+		request_id = str(next(self.request_ids))
+		future = self.pending[request_id] = self.loop.create_future()
+		self.writer.write(encode({"op": "request", "id": request_id, "command": command, "args": args}))
+		try:
+			return await asyncio.wait_for(future, self.timeout)
+		except asyncio.TimeoutError:
+			self.pending.pop(request_id, None)
+			return {}
+	
+	def notify(self, command, **args):
+		'''Send a notification to every other cluster, without waiting for responses'''
+		if self.writer is not None:
+			self.writer.write(encode({"op": "notify", "command": command, "args": args}))
+	
+	async def send(self, command, **args):
+		'''
+		Send a notification to every other cluster, waiting for it to be written to the connection
+		Raises ConnectionError if not connected, so the caller can keep what it was sending
+		'''
+		writer = self.writer
+		if writer is None:
+			raise ConnectionError("Not connected to the IPC broker")
+		writer.write(encode({"op": "notify", "command": command, "args": args}))
+		await writer.drain()
+
@@ -0,0 +1,94 @@
+
+import asyncio
+import datetime
+import json
+
+import aiohttp
+
+class ListingStatsUpdater:
+	
+	'''
+	Debounced updater for stats on sites listing Discord bots
+	Changes within the delay are coalesced into one update, posted to all sites concurrently
+	'''
+	
+	def __init__(self, bot, session, *, delay = 60.0, timeout = 10.0, retries = 3, backoff = 5.0):
+		self.bot = bot
+		self.session = session
+		self.delay = delay
+		self.timeout = timeout
+		self.retries = retries
+		self.backoff = backoff  # seconds, doubled after each attempt
+		self.pending = None
+		# Site: datetime
+		self.last_success = {}
+		# Site: response or error
+		self.last_response = {}
+	
+	def local_counts(self):
+		return {"guilds": len(self.bot.guilds), "users": len(self.bot.users),
+				"voice_connections": len(self.bot.voice_clients)}
+	
+	async def counts(self):
+		'''Counts across all clusters'''
+		counts = self.local_counts()
+		if self.bot.ipc:
+			for cluster_counts in (await self.bot.ipc.request("counts")).values():
+				for name in counts:
+					counts[name] += cluster_counts.get(name, 0)
+		return counts
+	
+	def schedule(self, delay = None):
+		'''Update all sites after the delay, unless an update is already pending'''
+		if not self.bot.cluster.primary:
+			# Posted by the primary cluster
+			if self.bot.ipc:
+				self.bot.ipc.notify("schedule_listing_stats")
+			return
+		if self.pending is None or self.pending.done():
+			self.pending = self.bot.loop.create_task(self.update_all(self.delay if delay is None else delay))
+	
+	async def update_all(self, delay = 0):
+		'''Update all sites concurrently, returning a dictionary of site: response'''
+		await asyncio.sleep(delay)
+		# Changes from here on schedule another update
+		if self.pending is asyncio.current_task():
+			self.pending = None
+		sites = list(self.bot.listing_sites)
+		counts = await self.counts()
+		responses = await asyncio.gather(*(self.update(site, counts) for site in sites))
+		return dict(zip(sites, responses))
+	
+	async def update(self, site_name, counts = None):
+		site = self.bot.listing_sites.get(site_name)
+		if not site:
+			return "Site not found"
+		if not site["token"]:
+			return "Site token not found"
+		headers = {"authorization": site["token"], "content-type": "application/json"}
+		counts = counts or await self.counts()
+		data = json.dumps({name: counts[count] for name, count in site["counts"].items()})
+		for attempt in range(self.retries):
+			try:
+				status, response = await asyncio.wait_for(self.post(site["url"], headers, data), self.timeout)
+			except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+				status, response = None, f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+			if status is not None and 200 <= status < 300:
+				self.last_success[site_name] = datetime.datetime.utcnow()
+				self.last_response[site_name] = response
+				return response
+			self.last_response[site_name] = response
+			# Only retry on rate limits, server errors, and connection errors and timeouts
+			if status is not None and status != 429 and status < 500:
+				break
+			if attempt < self.retries - 1:
+				await asyncio.sleep(self.backoff * 2 ** attempt)
+		print(f"{self.bot.console_message_prefix}Failed to update stats on {site_name}: {response}")
+		return response
+	
+	async def post(self, url, headers, data):
+		async with self.session.post(url, headers = headers, data = data) as resp:
+			if resp.status == 204:
+				return resp.status, "204 No Content"
+			return resp.status, await resp.text()
+
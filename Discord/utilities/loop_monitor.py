@@ -0,0 +1,99 @@
+
+import asyncio
+import collections
+import sys
+import threading
+import time
+import traceback
+
+class Stall:
+	
+	__slots__ = ("started", "duration", "command", "stack")
+	
+	def __init__(self, started, command, stack):
+		self.started = started
+		self.duration = None  # Set once the loop resumes
+		self.command = command
+		self.stack = stack
+
+class LoopMonitor:
+	
+	'''
+	Event loop lag monitor and blocking call detector
+	A watchdog thread captures the stack of the loop thread when it's blocked past the threshold
+	'''
+	
+	def __init__(self, loop, *, interval = 0.25, threshold = 0.5, samples = 4096, stalls = 50,
+					console_message_prefix = ""):
+		self.loop = loop
+		self.interval = interval
+		self.threshold = threshold
+		self.console_message_prefix = console_message_prefix
+		self.lags = collections.deque(maxlen = samples)
+		self.stalls = collections.deque(maxlen = stalls)
+		self.stall_count = 0
+		# Task: command name, for attributing stalls
+		self.running_commands = {}
+		self.heartbeat = time.monotonic()
+		self.loop_thread_id = None
+		self.pending_stall = None
+		self.stopped = threading.Event()
+		self.watchdog = threading.Thread(target = self.watch, name = "LoopWatchdog", daemon = True)
+		self.task = self.loop.create_task(self.monitor())
+	
+	def command_started(self, name):
+		self.running_commands[asyncio.current_task(self.loop)] = name
+	
+	def command_finished(self):
+		self.running_commands.pop(asyncio.current_task(self.loop), None)
+	
+	async def monitor(self):
+		self.loop_thread_id = threading.get_ident()
+		self.watchdog.start()
+		try:
+			while True:
+				self.heartbeat = before = time.monotonic()
+				await asyncio.sleep(self.interval)
+				now = time.monotonic()
+				self.heartbeat = now
+				lag = now - before - self.interval
+				self.lags.append(lag)
+				stall = self.pending_stall
+				if stall is not None:
+					stall.duration = now - stall.started
+					self.pending_stall = None
+		finally:
+			self.stopped.set()
+	
+	def watch(self):
+		while not self.stopped.wait(self.threshold / 2):
+			heartbeat = self.heartbeat
+			blocked = time.monotonic() - heartbeat - self.interval
+			if blocked < self.threshold or self.pending_stall is not None:
+				continue
+			frame = sys._current_frames().get(self.loop_thread_id)
+			if frame is None:
+				continue
+			stack = ''.join(traceback.format_stack(frame))
+			# Reading the current task from another thread is only a dictionary lookup
+			task = asyncio.current_task(self.loop)
+			command = self.running_commands.get(task)
+			if heartbeat != self.heartbeat:
+				# Unblocked while capturing
+				continue
+			stall = self.pending_stall = Stall(heartbeat + self.interval, command, stack)
+			self.stalls.append(stall)
+			self.stall_count += 1
+			print(f"{self.console_message_prefix}Event loop blocked for over {blocked:.2f}s" +
+					(f" by {command} command" if command else "") + f"\n{stack}")
+	
+	def percentile(self, percentile):
+		if not self.lags:
+			return 0.0
+		lags = sorted(self.lags)
+		return lags[min(int(len(lags) * percentile), len(lags) - 1)]
+	
+	def stop(self):
+		self.task.cancel()
+		self.stopped.set()
+
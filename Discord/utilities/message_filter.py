@@ -0,0 +1,102 @@
+
+import gzip
+import re
+import time
+
+# Chat log entries, as written by logging.chat_log_entry
+chat_log_entry_start = re.compile(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}(?:\.\d+)?: \[\d+\] ")
+chat_log_entry_location = re.compile(r" in (?:Direct Message|#.*? \(\d+\) \[.*? \((\d+)\)\]): ", re.DOTALL)
+
+def read_chat_log(path, limit = None):
+	'''Read (guild ID or None, content) entries from a chat log'''
+	entries = []
+	open_function = gzip.open if path.endswith(".gz") else open
+	with open_function(path, "rt", encoding = "UTF-8", errors = "replace") as chat_log:
+		entry = None
+		for line in chat_log:
+			if chat_log_entry_start.match(line):
+				if entry is not None:
+					entries.append(entry)
+					if limit and len(entries) >= limit:
+						entry = None
+						break
+				entry = line.rstrip('\n')
+			elif entry is not None:
+				entry += '\n' + line.rstrip('\n')
+		if entry is not None:
+			entries.append(entry)
+	parsed = []
+	for entry in entries:
+		match = chat_log_entry_location.search(entry)
+		if not match:
+			continue
+		content = entry[match.end():]
+		# Strip embeds
+		content = content[:-3] if content.endswith(" []") else content.split(" [{", 1)[0]
+		parsed.append((int(match.group(1)) if match.group(1) else None, content))
+	return parsed
+
+class MessageFilter:
+	
+	'''
+	Cheap classification of incoming messages, before building a Context
+	Plain chat that can't be a command, a conversion, a mention, :8ball:, or f is skipped
+	'''
+	
+	def __init__(self, bot, *, max_patterns = 1024):
+		self.bot = bot
+		self.max_patterns = max_patterns
+		# Prefixes: compiled pattern
+		self.patterns = {}
+		self.mentions = None
+		self.checked = 0
+		self.skipped = 0
+	
+	def pattern(self, prefixes):
+		prefixes = (prefixes,) if isinstance(prefixes, str) else tuple(prefixes)
+		pattern = self.patterns.get(prefixes)
+		if pattern is None:
+			if len(self.patterns) >= self.max_patterns:
+				self.patterns.clear()
+			alternatives = '|'.join(map(re.escape, prefixes))
+			pattern = self.patterns[prefixes] = re.compile(f"(?:{alternatives}|\N{BILLIARDS}|[fF]\\Z)")
+		return pattern
+	
+	def prefixes(self, message):
+		prefixes = self.bot.command_prefix
+		return prefixes(self.bot, message) if callable(prefixes) else prefixes
+	
+	def matches(self, content, prefixes):
+		'''Whether content could be a command, a conversion, a mention of the bot, :8ball:, or f'''
+		if not content:
+			return False
+		if self.pattern(prefixes).match(content):
+			return True
+		if self.mentions is None and self.bot.user is not None:
+			self.mentions = (f"<@{self.bot.user.id}>", f"<@!{self.bot.user.id}>")
+		return self.mentions is not None and (self.mentions[0] in content or self.mentions[1] in content)
+	
+	def relevant(self, message):
+		'''Whether on_message needs to build a Context for the message'''
+		self.checked += 1
+		# DMs are forwarded
+		if message.guild is None or self.matches(message.content, self.prefixes(message)):
+			return True
+		# Mention spam is checked for
+		if message.mentions and len(message.mentions) > self.bot.guild_settings.get(message.guild.id).mention_spam_threshold:
+			return True
+		self.skipped += 1
+		return False
+	
+	def replay(self, entries):
+		'''
+		Classify (guild ID or None, content) entries, e.g. from read_chat_log
+		Returns the number of relevant entries and the time taken in seconds
+		'''
+		relevant = 0
+		start = time.perf_counter()
+		for guild_id, content in entries:
+			if guild_id is None or self.matches(content, self.bot.prefix_resolver.get(guild_id)):
+				relevant += 1
+		return relevant, time.perf_counter() - start
+
@@ -0,0 +1,134 @@
+
+import bisect
+import contextvars
+import time
+
+import aiohttp
+
+# Measurement for the command being invoked in the current task
+current_measurement = contextvars.ContextVar("current_measurement", default = None)
+
+class Histogram:
+	
+	'''Fixed-bucket histogram'''
+	
+	buckets = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+	
+	def __init__(self):
+		# Last count is the +Inf bucket
+		self.counts = [0] * (len(self.buckets) + 1)
+		self.sum = 0.0
+		self.count = 0
+	
+	def observe(self, value):
+		self.counts[bisect.bisect_left(self.buckets, value)] += 1
+		self.sum += value
+		self.count += 1
+	
+	def merge(self, other):
+		for index, count in enumerate(other.counts):
+			self.counts[index] += count
+		self.sum += other.sum
+		self.count += other.count
+	
+	def cumulative_counts(self):
+		total = 0
+		for count in self.counts:
+			total += count
+			yield total
+	
+	def quantile(self, q):
+		'''Estimate a quantile by linear interpolation within its bucket, as Prometheus does'''
+		if not self.count:
+			return 0.0
+		rank = q * self.count
+		lower_bound = lower_count = 0
+		for upper_bound, cumulative_count in zip(self.buckets, self.cumulative_counts()):
+			if cumulative_count >= rank and cumulative_count > lower_count:
+				bucket_count = cumulative_count - lower_count
+				return lower_bound + (upper_bound - lower_bound) * (rank - lower_count) / bucket_count
+			lower_bound, lower_count = upper_bound, cumulative_count
+		return self.buckets[-1]
+
+class CommandMeasurement:
+	
+	__slots__ = ("start", "http_requests")
+	
+	def __init__(self):
+		self.start = time.perf_counter()
+		self.http_requests = 0
+
+def escape_label_value(value):
+	return str(value).replace('\\', "\\\\").replace('"', "\\\"").replace('\n', "\\n")
+
+class CommandMetrics:
+	
+	'''
+	Per-command latency histograms and HTTP request counts
+	Keyed by command, cog, and outcome
+	'''
+	
+	def __init__(self):
+		# (command, cog, outcome): Histogram
+		self.histograms = {}
+		# (command, cog): HTTP requests made by aiohttp sessions using the trace config
+		self.http_requests = {}
+		self.trace_config = aiohttp.TraceConfig()
+		self.trace_config.on_request_start.append(self.on_request_start)
+	
+	async def on_request_start(self, session, trace_config_ctx, params):
+		measurement = current_measurement.get()
+		if measurement is not None:
+			measurement.http_requests += 1
+	
+	def start(self):
+		measurement = CommandMeasurement()
+		current_measurement.set(measurement)
+		return measurement
+	
+	def finish(self, measurement, command, outcome):
+		duration = time.perf_counter() - measurement.start
+		cog = command.cog_name or "No Category"
+		key = (command.qualified_name, cog, outcome)
+		histogram = self.histograms.get(key)
+		if histogram is None:
+			histogram = self.histograms[key] = Histogram()
+		histogram.observe(duration)
+		if measurement.http_requests:
+			key = (command.qualified_name, cog)
+			self.http_requests[key] = self.http_requests.get(key, 0) + measurement.http_requests
+	
+	def summary(self, group_by = "command"):
+		'''Aggregate histograms by command or cog'''
+		index = 0 if group_by == "command" else 1
+		histograms = {}
+		errors = {}
+		http_requests = {}
+		for key, histogram in self.histograms.items():
+			histograms.setdefault(key[index], Histogram()).merge(histogram)
+			if key[2] != "success":
+				errors[key[index]] = errors.get(key[index], 0) + histogram.count
+		for key, count in self.http_requests.items():
+			http_requests[key[index]] = http_requests.get(key[index], 0) + count
+		return {name: (histogram, errors.get(name, 0), http_requests.get(name, 0))
+				for name, histogram in histograms.items()}
+	
+	def render(self):
+		'''Render in the Prometheus text exposition format'''
+		lines = ["# HELP harmonbot_command_duration_seconds Command invocation duration",
+					"# TYPE harmonbot_command_duration_seconds histogram"]
+		for (command, cog, outcome), histogram in sorted(self.histograms.items()):
+			labels = (f'command="{escape_label_value(command)}",cog="{escape_label_value(cog)}",'
+						f'outcome="{outcome}"')
+			bounds = [str(bound) for bound in histogram.buckets] + ["+Inf"]
+			for bound, cumulative_count in zip(bounds, histogram.cumulative_counts()):
+				lines.append(f'harmonbot_command_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative_count}')
+			lines.append(f"harmonbot_command_duration_seconds_sum{{{labels}}} {histogram.sum}")
+			lines.append(f"harmonbot_command_duration_seconds_count{{{labels}}} {histogram.count}")
+		lines.extend(("# HELP harmonbot_command_http_requests_total HTTP requests made by commands",
+						"# TYPE harmonbot_command_http_requests_total counter"))
+		for (command, cog), count in sorted(self.http_requests.items()):
+			lines.append(f'harmonbot_command_http_requests_total{{command="{escape_label_value(command)}",'
+							f'cog="{escape_label_value(cog)}"}} {count}')
+		return '\n'.join(lines) + '\n'
+
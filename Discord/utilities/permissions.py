@@ -0,0 +1,99 @@
+
+class GuildPermissions:
+	
+	'''
+	Compiled permission settings for a guild
+	Effective user permissions are memoized
+	'''
+	
+	def __init__(self, data):
+		self.everyone = data.get("everyone", {})
+		self.roles = {int(id): settings for id, settings in data.get("roles", {}).items()}
+		self.users = {int(id): settings for id, settings in data.get("users", {}).items()}
+		# Member ID: Role IDs, sorted by position in descending order
+		self.member_roles = {}
+		# Member ID: {permission: setting}
+		self.resolved = {}
+	
+	def get_everyone_permission(self, permission):
+		return self.everyone.get(permission)
+	
+	def get_role_permission(self, role_id, permission):
+		role_setting = self.roles.get(role_id, {}).get(permission)
+		if role_setting is not None:
+			return role_setting
+		return self.everyone.get(permission)
+	
+	def get_user_permission(self, member, permission):
+		resolved = self.resolved.setdefault(member.id, {})
+		if permission in resolved:
+			return resolved[permission]
+		setting = self.users.get(member.id, {}).get(permission)
+		if setting is None:
+			role_ids = self.member_roles.get(member.id)
+			if role_ids is None:
+				roles = sorted(getattr(member, "roles", ()), key = lambda role: role.position, reverse = True)
+				role_ids = self.member_roles[member.id] = [role.id for role in roles if role.id in self.roles]
+			for role_id in role_ids:
+				setting = self.roles[role_id].get(permission)
+				if setting is not None:
+					break
+			else:
+				setting = self.everyone.get(permission)
+		resolved[permission] = setting
+		return setting
+	
+	def invalidate_member(self, member_id):
+		self.member_roles.pop(member_id, None)
+		self.resolved.pop(member_id, None)
+	
+	def invalidate_roles(self):
+		self.member_roles.clear()
+		self.resolved.clear()
+
+class PermissionIndex:
+	
+	'''
+	Per-guild compiled permission index
+	Permission settings are loaded from the database once, and compiled lazily per guild
+	'''
+	
+	def __init__(self, repository):
+		self.repository = repository
+		# Guild ID: permission settings, in the same format as the permissions files
+		self.data = {}
+		# Guild ID: GuildPermissions
+		self.guilds = {}
+	
+	async def load(self):
+		self.data = await self.repository.get_all_permissions()
+		self.guilds.clear()
+	
+	def get(self, guild):
+		guild_permissions = self.guilds.get(guild.id)
+		if guild_permissions is None:
+			guild_permissions = self.guilds[guild.id] = GuildPermissions(self.data.get(guild.id, {}))
+		return guild_permissions
+	
+	async def set(self, guild, permission, setting, *, type = "everyone", object = None):
+		'''Set a permission for everyone, a role, or a user and write it through'''
+		await self.repository.set_permission(guild.id, permission, setting, type = type, 
+												object_id = object.id if object else 0)
+		data = self.data.setdefault(guild.id, {})
+		if type == "everyone":
+			data.setdefault("everyone", {})[permission] = setting
+		else:
+			data.setdefault(type, {}).setdefault(str(object.id), {})[permission] = setting
+		self.invalidate(guild.id)
+	
+	def invalidate(self, guild_id):
+		self.guilds.pop(guild_id, None)
+	
+	def invalidate_member(self, guild_id, member_id):
+		if guild_id in self.guilds:
+			self.guilds[guild_id].invalidate_member(member_id)
+	
+	def invalidate_roles(self, guild_id):
+		if guild_id in self.guilds:
+			self.guilds[guild_id].invalidate_roles()
+
@@ -0,0 +1,168 @@
+
+import asyncio
+import collections
+import itertools
+import random
+
+class Playlist:
+	
+	'''
+	Indexed queue of songs for a player
+	Items are held in bounded chunks, with a Fenwick tree of chunk lengths for positional lookups
+	Appending and popping from the front are amortized O(1), and inserting, removing, moving and indexing are O(log n)
+	Adding items with put wakes a player task waiting in get
+	'''
+	
+	chunk_size = 64
+	
+	def __init__(self, items = (), *, history_size = 100):
+		self.condition = asyncio.Condition()
+		# Played items, most recent last
+		self.history = collections.deque(maxlen = history_size)
+		self.load(items)
+	
+	def load(self, items):
+		items = list(items)
+		self.chunks = [items[start:start + self.chunk_size] for start in range(0, len(items), self.chunk_size)]
+		self.length = len(items)
+		self.rebuild()
+	
+	def rebuild(self):
+		# 1-indexed, with each node the sum of the lengths of the chunks in its range
+		self.tree = [0] * (len(self.chunks) + 1)
+		for number, chunk in enumerate(self.chunks, start = 1):
+			self.tree[number] += len(chunk)
+			parent = number + (number & -number)
+			if parent < len(self.tree):
+				self.tree[parent] += self.tree[number]
+	
+	def update(self, chunk_index, change):
+		number = chunk_index + 1
+		while number < len(self.tree):
+			self.tree[number] += change
+			number += number & -number
+	
+	def prefix(self, count):
+		'''Number of items in the first count chunks'''
+		total = 0
+		while count > 0:
+			total += self.tree[count]
+			count -= count & -count
+		return total
+	
+	def locate(self, index):
+		'''Chunk index and offset within it of an item index'''
+		position = 0
+		step = 1 << (len(self.tree) - 1).bit_length()
+		while step:
+			if position + step < len(self.tree) and self.tree[position + step] <= index:
+				position += step
+				index -= self.tree[position]
+			step >>= 1
+		return position, index
+	
+	def normalize_index(self, index):
+		if index < 0:
+			index += self.length
+		if not 0 <= index < self.length:
+			raise IndexError("playlist index out of range")
+		return index
+	
+	def __len__(self):
+		return self.length
+	
+	def __iter__(self):
+		for chunk in self.chunks:
+			yield from chunk
+	
+	def __getitem__(self, index):
+		if isinstance(index, slice):
+			return list(itertools.islice(self, *index.indices(self.length)))
+		chunk_index, offset = self.locate(self.normalize_index(index))
+		return self.chunks[chunk_index][offset]
+	
+	def append(self, item):
+		if self.chunks and len(self.chunks[-1]) < self.chunk_size:
+			self.chunks[-1].append(item)
+			self.update(len(self.chunks) - 1, 1)
+		else:
+			self.chunks.append([item])
+			number = len(self.chunks)
+			# New node covers the chunks after the prefix it excludes
+			self.tree.append(self.prefix(number - 1) - self.prefix(number - (number & -number)) + 1)
+		self.length += 1
+	
+	def insert(self, index, item):
+		'''Insert before index, clamped to the playlist like list.insert'''
+		if index < 0:
+			index = max(index + self.length, 0)
+		if index >= self.length:
+			self.append(item)
+			return
+		chunk_index, offset = self.locate(index)
+		chunk = self.chunks[chunk_index]
+		chunk.insert(offset, item)
+		self.length += 1
+		if len(chunk) > 2 * self.chunk_size:
+			self.chunks.insert(chunk_index + 1, chunk[self.chunk_size:])
+			del chunk[self.chunk_size:]
+			self.rebuild()
+		else:
+			self.update(chunk_index, 1)
+	
+	def pop(self, index = -1):
+		chunk_index, offset = self.locate(self.normalize_index(index))
+		chunk = self.chunks[chunk_index]
+		item = chunk.pop(offset)
+		self.length -= 1
+		if chunk:
+			self.update(chunk_index, -1)
+		else:
+			del self.chunks[chunk_index]
+			self.rebuild()
+		return item
+	
+	def popleft(self):
+		return self.pop(0)
+	
+	def move(self, source, destination):
+		'''Move the item at source to destination'''
+		self.insert(destination, self.pop(source))
+	
+	def clear(self):
+		self.load(())
+	
+	def shuffle(self):
+		items = list(self)
+		random.shuffle(items)
+		self.load(items)
+	
+	async def put(self, item, index = None):
+		'''Append, or insert before index, and wake a waiting get'''
+		async with self.condition:
+			if index is None:
+				self.append(item)
+			else:
+				self.insert(index, item)
+			self.condition.notify()
+	
+	async def get(self):
+		'''Wait for and pop the first item, recording it in the history'''
+		async with self.condition:
+			await self.condition.wait_for(lambda: self.length)
+			item = self.popleft()
+		self.history.append(item)
+		return item
+	
+	def snapshot(self):
+		'''Copy of the items and history, for restore'''
+		return list(self), list(self.history)
+	
+	async def restore(self, snapshot):
+		items, history = snapshot
+		async with self.condition:
+			self.load(items)
+			self.history.clear()
+			self.history.extend(history)
+			self.condition.notify_all()
+
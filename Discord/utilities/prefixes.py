@@ -0,0 +1,45 @@
+
+class PrefixResolver:
+	
+	'''
+	In-memory prefix resolver
+	Loads prefixes from the database once and writes through on changes
+	Guild prefixes are only changed from the cluster with the guild, so don't need to be reloaded
+	'''
+	
+	def __init__(self, repository, *, default = '!'):
+		self.repository = repository
+		self.default = default
+		# Guild or DM channel ID: prefixes
+		self.prefixes = {}
+		# Lookups of IDs with and without custom prefixes cached
+		self.hits = 0
+		self.misses = 0
+	
+	def __call__(self, bot, message):
+		# Usable directly as command_prefix
+		return self.get(message.channel.id if message.guild is None else message.guild.id)
+	
+	def __len__(self):
+		return len(self.prefixes)
+	
+	@property
+	def hit_rate(self):
+		lookups = self.hits + self.misses
+		return self.hits / lookups if lookups else 0.0
+	
+	async def load(self):
+		self.prefixes = await self.repository.get_all_prefixes()
+	
+	def get(self, id):
+		prefixes = self.prefixes.get(id)
+		if prefixes:
+			self.hits += 1
+			return prefixes
+		self.misses += 1
+		return self.default
+	
+	async def set(self, id, prefixes):
+		await self.repository.set_prefixes(id, prefixes)
+		self.prefixes[id] = list(prefixes)
+
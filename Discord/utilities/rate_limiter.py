@@ -0,0 +1,171 @@
+
+import collections
+import contextvars
+import email.utils
+import time
+import urllib.parse
+
+import aiohttp
+
+# Queue that requests made in the current task wait in, e.g. per guild, so no single guild can starve the others
+current_owner = contextvars.ContextVar("request_owner", default = None)
+
+def parse_retry_after(value):
+	'''Parse a Retry-After header, in seconds or as an HTTP date, into seconds from now'''
+	try:
+		return max(float(value), 0.0)
+	except ValueError:
+		pass
+	try:
+		return max(email.utils.parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+	except (TypeError, ValueError):
+		return None
+
+class TokenBucket:
+	
+	'''
+	Token bucket rate limit for a host
+	Waiting requests are granted tokens round-robin across owners
+	'''
+	
+	def __init__(self, loop, host, rate, burst):
+		self.loop = loop
+		self.host = host
+		self.rate = rate  # Tokens per second
+		self.burst = burst
+		self.tokens = burst
+		self.updated = time.monotonic()
+		self.blocked_until = 0.0  # Set by Retry-After and rate limit headers
+		# Owner: deque of futures
+		self.queues = collections.OrderedDict()
+		self.handle = None
+		self.requests = 0
+		self.waited = 0
+		self.total_wait = 0.0
+		self.max_wait = 0.0
+		self.rate_limited = 0
+	
+	def refill(self, now):
+		self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+		self.updated = now
+	
+	def delay(self, now):
+		'''Seconds until a token is available'''
+		return max(self.blocked_until - now, (1 - self.tokens) / self.rate, 0.0)
+	
+	async def acquire(self):
+		now = time.monotonic()
+		self.refill(now)
+		self.requests += 1
+		if not self.queues and self.delay(now) == 0:
+			self.tokens -= 1
+			return
+		future = self.loop.create_future()
+		self.queues.setdefault(current_owner.get(), collections.deque()).append(future)
+		self.schedule(now)
+		await future
+		wait = time.monotonic() - now
+		self.waited += 1
+		self.total_wait += wait
+		self.max_wait = max(self.max_wait, wait)
+	
+	def schedule(self, now):
+		if self.handle is None:
+			self.handle = self.loop.call_later(self.delay(now), self.release)
+	
+	def release(self):
+		self.handle = None
+		now = time.monotonic()
+		self.refill(now)
+		while self.queues and self.delay(now) == 0:
+			owner, queue = next(iter(self.queues.items()))
+			future = queue.popleft()
+			if queue:
+				self.queues.move_to_end(owner)
+			else:
+				del self.queues[owner]
+			if not future.done():  # Skip cancelled requests
+				future.set_result(None)
+				self.tokens -= 1
+		if self.queues:
+			self.schedule(now)
+	
+	def block(self, seconds):
+		self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+class RateLimiter:
+	
+	'''
+	Per-host outbound rate limiter
+	Hooks into aiohttp sessions as a trace config, so every request through them waits for a token,
+	and Retry-After and rate limit headers on responses pause the host
+	'''
+	
+	# Host: (requests per second, burst)
+	limits = {"api.twitch.tv": (1.0, 5), "www.googleapis.com": (1.0, 5), "lichess.org": (1.0, 1),
+				"en.lichess.org": (1.0, 1), "pokeapi.co": (1.5, 10), "owapi.net": (1.0, 3),
+				"api.arcsecond.io": (2.0, 5), "data.fixer.io": (1.0, 3), "haveibeenpwned.com": (0.5, 1)}
+	default_limit = (10.0, 20)
+	# Backoff for a 429 response without a Retry-After header
+	default_backoff = 60.0
+	
+	def __init__(self, loop):
+		self.loop = loop
+		self.buckets = {}
+		self.trace_config = aiohttp.TraceConfig()
+		self.trace_config.on_request_start.append(self.on_request_start)
+		self.trace_config.on_request_end.append(self.on_request_end)
+	
+	def bucket(self, host):
+		bucket = self.buckets.get(host)
+		if bucket is None:
+			rate, burst = self.limits.get(host, self.default_limit)
+			bucket = self.buckets[host] = TokenBucket(self.loop, host, rate, burst)
+		return bucket
+	
+	def delay(self, url):
+		'''Seconds until a request to the URL's host can be made'''
+		bucket = self.buckets.get(urllib.parse.urlsplit(str(url)).hostname)
+		return bucket.delay(time.monotonic()) if bucket else 0.0
+	
+	async def on_request_start(self, session, trace_config_ctx, params):
+		await self.bucket(params.url.host).acquire()
+	
+	async def on_request_end(self, session, trace_config_ctx, params):
+		response = params.response
+		bucket = self.bucket(params.url.host)
+		retry_after = response.headers.get("Retry-After")
+		if retry_after is not None:
+			seconds = parse_retry_after(retry_after)
+			if seconds is not None:
+				bucket.block(seconds)
+		elif response.headers.get("X-RateLimit-Remaining") == '0' and "X-RateLimit-Reset" in response.headers:
+			try:
+				reset = float(response.headers["X-RateLimit-Reset"])
+			except ValueError:
+				pass
+			else:
+				# Either an epoch timestamp or seconds until reset
+				bucket.block(reset - time.time() if reset > 10 ** 9 else reset)
+		if response.status == 429:
+			bucket.rate_limited += 1
+			if retry_after is None:
+				bucket.block(self.default_backoff)
+	
+	def render(self):
+		'''Render wait time metrics in the Prometheus text exposition format'''
+		lines = []
+		for name, attribute, metric_type, description in (
+			("requests_total", "requests", "counter", "Outbound HTTP requests"),
+			("waits_total", "waited", "counter", "Outbound HTTP requests that waited for the rate limit"),
+			("wait_seconds_total", "total_wait", "counter", "Time spent waiting for the rate limit"),
+			("rate_limited_total", "rate_limited", "counter", "429 responses"),
+			("queued", None, "gauge", "Requests waiting for the rate limit")
+		):
+			lines.append(f"# HELP harmonbot_http_{name} {description}")
+			lines.append(f"# TYPE harmonbot_http_{name} {metric_type}")
+			for host, bucket in sorted(self.buckets.items()):
+				value = getattr(bucket, attribute) if attribute else sum(map(len, bucket.queues.values()))
+				lines.append(f'harmonbot_http_{name}{{host="{host}"}} {value}')
+		return '\n'.join(lines) + '\n'
+
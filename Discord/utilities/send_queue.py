@@ -0,0 +1,49 @@
+
+import asyncio
+
+class SendQueue:
+	
+	'''
+	Bounded queue of messages sent in order by a background task
+	So senders don't wait on Discord rate limits, and a burst past the bound is dropped
+	'''
+	
+	def __init__(self, loop, send, *, name = "Send queue", max_size = 100, console_message_prefix = ""):
+		self.loop = loop
+		self.send = send  # Coroutine function called with each item's arguments
+		self.name = name
+		self.console_message_prefix = console_message_prefix
+		self.queue = asyncio.Queue(maxsize = max_size, loop = loop)
+		self.task = None
+		self.sent = 0
+		self.dropped = 0
+		self.failed = 0
+	
+	def __len__(self):
+		return self.queue.qsize()
+	
+	def put(self, *args):
+		if self.task is None or self.task.done():
+			self.task = self.loop.create_task(self.worker())
+		try:
+			self.queue.put_nowait(args)
+		except asyncio.QueueFull:
+			self.dropped += 1
+	
+	async def worker(self):
+		while True:
+			args = await self.queue.get()
+			try:
+				await self.send(*args)
+			except asyncio.CancelledError:
+				raise
+			except Exception as e:
+				self.failed += 1
+				print(f"{self.console_message_prefix}{self.name} failed to send: {e}")
+			else:
+				self.sent += 1
+	
+	def stop(self):
+		if self.task:
+			self.task.cancel()
+
@@ -0,0 +1,95 @@
+
+class GuildSettings:
+	
+	'''Typed guild settings'''
+	
+	defaults = {"anti-spam": False, "respond_to_bots": False,
+				"logs_channel": None, "logs_typing": False,
+				"logs_message_send": False, "logs_message_delete": False, "logs_message_edit": False,
+				"logs_reaction_add": False, "logs_reaction_remove": False,
+				"mention_spam_threshold": 10, "mention_spam_window": 3600}
+	
+	def __init__(self, data = None):
+		self.data = dict(self.defaults)
+		if data:
+			self.data.update(data)
+	
+	def __contains__(self, setting):
+		return setting in self.data
+	
+	def __getitem__(self, setting):
+		return self.data[setting]
+	
+	@property
+	def anti_spam(self):
+		return bool(self.data["anti-spam"])
+	
+	@property
+	def respond_to_bots(self):
+		return bool(self.data["respond_to_bots"])
+	
+	@property
+	def logs_channel(self):
+		return int(self.data["logs_channel"]) if self.data["logs_channel"] else None
+	
+	@property
+	def mention_spam_threshold(self):
+		'''More mentions than this in one message is mention spam'''
+		return int(self.data["mention_spam_threshold"])
+	
+	@property
+	def mention_spam_window(self):
+		'''Seconds a mention spam warning lasts'''
+		return float(self.data["mention_spam_window"])
+
+class SettingsCache:
+	
+	'''
+	Per-guild settings cache
+	Settings are loaded from the database once, and compiled lazily per guild
+	Writes through on changes
+	'''
+	
+	def __init__(self, repository):
+		self.repository = repository
+		# Guild ID: {setting: value}
+		self.data = {}
+		# Guild ID: GuildSettings
+		self.settings = {}
+		self.hits = 0
+		self.misses = 0
+	
+	def __len__(self):
+		return len(self.settings)
+	
+	@property
+	def hit_rate(self):
+		lookups = self.hits + self.misses
+		return self.hits / lookups if lookups else 0.0
+	
+	async def load(self):
+		self.data = await self.repository.get_all_guild_settings()
+		self.invalidate()
+	
+	def get(self, guild_id):
+		settings = self.settings.get(guild_id)
+		if settings is not None:
+			self.hits += 1
+			return settings
+		self.misses += 1
+		settings = self.settings[guild_id] = GuildSettings(self.data.get(guild_id))
+		return settings
+	
+	async def set(self, guild_id, setting, value):
+		if setting not in GuildSettings.defaults:
+			raise KeyError(setting)
+		await self.repository.set_guild_setting(guild_id, setting, value)
+		self.data.setdefault(guild_id, {})[setting] = value
+		self.invalidate(guild_id)
+	
+	def invalidate(self, guild_id = None):
+		if guild_id is None:
+			self.settings.clear()
+		else:
+			self.settings.pop(guild_id, None)
+
@@ -0,0 +1,71 @@
+
+import discord
+
+import os
+
+class Cluster:
+	
+	'''
+	The shards run by this process, as set by the launcher through environment variables
+	Without them, a single unsharded process
+	'''
+	
+	def __init__(self, id = 0, count = 1, *, shard_ids = None, shard_count = None, ipc_port = None, feed_cluster = 0):
+		self.id = id
+		self.count = count
+		self.shard_ids = shard_ids
+		self.shard_count = shard_count
+		self.ipc_port = ipc_port
+		self.feed_cluster = feed_cluster
+	
+	@classmethod
+	def from_environment(cls):
+		if "CLUSTER_ID" not in os.environ:
+			return cls()
+		return cls(int(os.environ["CLUSTER_ID"]), int(os.environ["CLUSTER_COUNT"]),
+					shard_ids = [int(shard_id) for shard_id in os.environ["SHARD_IDS"].split(',')],
+					shard_count = int(os.environ["SHARD_COUNT"]),
+					ipc_port = int(os.environ["IPC_PORT"]) if os.getenv("IPC_PORT") else None,
+					feed_cluster = int(os.getenv("FEED_CLUSTER", 0)))
+	
+	@property
+	def sharded(self):
+		return self.shard_count is not None
+	
+	@property
+	def primary(self):
+		'''Whether this cluster owns global state, e.g. stats and listing site updates'''
+		return self.id == 0
+	
+	@property
+	def feeds(self):
+		'''Whether this cluster runs the feed pollers'''
+		return self.id == self.feed_cluster
+	
+	def __str__(self):
+		if not self.sharded:
+			return "Unsharded"
+		return f"Cluster {self.id}/{self.count} (shards {', '.join(map(str, self.shard_ids))} of {self.shard_count})"
+
+class RemoteChannel(discord.abc.Messageable):
+	
+	'''
+	Text channel in a guild on another cluster
+	Messages can still be sent, fetched and edited through the REST API
+	'''
+	
+	def __init__(self, bot, id):
+		self._state = bot._connection
+		self.id = id
+		self.guild = None
+	
+	async def _get_channel(self):
+		return self
+	
+	def __str__(self):
+		return f"<#{self.id}>"
+	
+	@property
+	def mention(self):
+		return f"<#{self.id}>"
+
@@ -0,0 +1,53 @@
+
+import heapq
+import time
+
+class MentionSpamTracker:
+	
+	'''
+	Mention spam offenders per guild, each expiring after the guild's window
+	Expired offenders are removed in bulk from a heap, rather than by a sleeping task per offender
+	'''
+	
+	def __init__(self):
+		# (guild ID, user ID): expiry
+		self.offenders = {}
+		# Heap of (expiry, guild ID, user ID), with entries superseded by a later offense skipped on expiry
+		self.expiries = []
+	
+	def __contains__(self, key):
+		expiry = self.offenders.get(key)
+		return expiry is not None and expiry > time.monotonic()
+	
+	def __len__(self):
+		self.expire()
+		return len(self.offenders)
+	
+	def add(self, guild_id, user_id, window):
+		expiry = time.monotonic() + window
+		self.offenders[(guild_id, user_id)] = expiry
+		heapq.heappush(self.expiries, (expiry, guild_id, user_id))
+	
+	def remove(self, guild_id, user_id):
+		# Its heap entry is skipped on expiry
+		self.offenders.pop((guild_id, user_id), None)
+	
+	def expire(self):
+		now = time.monotonic()
+		expiries = self.expiries
+		while expiries and expiries[0][0] <= now:
+			expiry, guild_id, user_id = heapq.heappop(expiries)
+			if self.offenders.get((guild_id, user_id)) == expiry:
+				del self.offenders[(guild_id, user_id)]
+	
+	def offend(self, guild_id, user_id, window):
+		'''
+		Record an offense
+		Returns whether the user already offended in the guild within the window
+		'''
+		self.expire()
+		if (guild_id, user_id) in self:
+			return True
+		self.add(guild_id, user_id, window)
+		return False
+
@@ -0,0 +1,150 @@
+
+import asyncio
+import collections
+import copy
+import json
+import threading
+
+from utilities.document_store import write_json
+
+class StatsAggregator:
+	
+	'''
+	Write-behind stats aggregator
+	Counts in memory and flushes to stats.json, and user stats to the database,
+	on an interval and at shutdown
+	With forward set, e.g. on a secondary cluster, counts are instead sent as deltas to be merged elsewhere
+	'''
+	
+	defaults = {"uptime": 0, "restarts": 0, "cogs_reloaded": 0, "commands_executed": 0,
+				"commands_usage": {}, "reaction_responses": 0}
+	user_stats = ("commands_executed", "points", "respects_paid")
+	
+	def __init__(self, loop, path, repository, *, flush_interval = 60.0, forward = None):
+		self.loop = loop
+		self.path = path
+		self.repository = repository
+		self.flush_interval = flush_interval
+		self.forward = forward  # Coroutine function called with (stats, users) snapshots
+		self.stats = copy.deepcopy(self.defaults)
+		if forward is None:
+			try:
+				with open(self.path + "/stats.json", 'r') as stats_file:
+					self.stats.update(json.load(stats_file))
+			except FileNotFoundError:
+				pass
+		self.dirty = False
+		# User ID: [name, Counter of stat deltas]
+		self.pending_users = {}
+		self.flushing_users = {}
+		self.write_lock = threading.Lock()
+		self.flushing = None
+		self.task = self.loop.create_task(self.flush_task())
+	
+	def increment(self, stat, amount = 1):
+		self.stats[stat] = self.stats.get(stat, 0) + amount
+		self.dirty = True
+	
+	def increment_user(self, user, stat, amount = 1):
+		name, deltas = self.pending_users.setdefault(user.id, [user.name, collections.Counter()])
+		deltas[stat] += amount
+	
+	def command_executed(self, ctx):
+		self.stats["commands_executed"] += 1
+		usage = self.stats["commands_usage"]
+		usage[ctx.command.name] = usage.get(ctx.command.name, 0) + 1
+		self.dirty = True
+		self.increment_user(ctx.author, "commands_executed")
+		self.increment_user(ctx.author, "points")
+	
+	async def get_user_stats(self, user_id):
+		stats = await self.repository.get_user_stats(user_id)
+		for pending in (self.flushing_users, self.pending_users):
+			if user_id in pending:
+				for stat, amount in pending[user_id][1].items():
+					stats[stat] = stats.get(stat, 0) + amount
+		return stats
+	
+	def take_snapshot(self):
+		stats = copy.deepcopy(self.stats) if self.dirty else None
+		if self.forward and self.dirty:
+			# Forwarded as deltas
+			self.stats = copy.deepcopy(self.defaults)
+		self.dirty = False
+		self.flushing_users, self.pending_users = self.pending_users, {}
+		return stats, self.flushing_users
+	
+	def restore_snapshot(self, snapshot):
+		'''Merge back a snapshot that failed to flush, so it's retried on the next flush'''
+		stats, users = snapshot
+		if stats is not None:
+			if self.forward:
+				# Reset after the snapshot, so merged back as deltas
+				self.merge(stats, {})
+			self.dirty = True
+		for user_id, (name, deltas) in users.items():
+			self.pending_users.setdefault(user_id, [name, collections.Counter()])[1].update(deltas)
+		self.flushing_users = {}
+	
+	def write(self, stats):
+		with self.write_lock:
+			write_json(self.path + "/stats.json", stats, indent = 4)
+	
+	async def flush(self):
+		snapshot = self.take_snapshot()
+		stats, users = snapshot
+		try:
+			if self.forward:
+				await self.forward(*snapshot)
+			else:
+				if stats is not None:
+					await self.loop.run_in_executor(None, self.write, stats)
+				if users:
+					await self.repository.increment_user_stats(
+						[(user_id, *(deltas[stat] for stat in self.user_stats)) for user_id, (name, deltas) in users.items()]
+					)
+		except (asyncio.CancelledError, Exception):
+			# Including cancellation, as a cancelled database query isn't committed
+			self.restore_snapshot(snapshot)
+			raise
+		self.flushing_users = {}
+	
+	def merge(self, stats, users):
+		'''Merge forwarded stat deltas'''
+		if stats:
+			for stat, value in stats.items():
+				if isinstance(value, dict):
+					counts = self.stats.setdefault(stat, {})
+					for key, amount in value.items():
+						counts[key] = counts.get(key, 0) + amount
+				else:
+					self.stats[stat] = self.stats.get(stat, 0) + value
+			self.dirty = True
+		for user_id, (name, deltas) in users.items():
+			# JSON object keys are strings
+			self.pending_users.setdefault(int(user_id), [name, collections.Counter()])[1].update(deltas)
+	
+	async def flush_task(self):
+		while True:
+			await asyncio.sleep(self.flush_interval)
+			# Shielded, so that stopping waits for an in-flight flush instead of cancelling it
+			self.flushing = self.loop.create_task(self.flush())
+			try:
+				await asyncio.shield(self.flushing)
+			except asyncio.CancelledError:
+				raise
+			except Exception as e:
+				# e.g. OSError or asyncpg.PostgresError
+				print(f"Failed to flush stats, retrying next interval: {type(e).__name__}: {e}")
+	
+	async def stop(self):
+		'''Stop flushing on the interval, after any in-flight flush, then flush, e.g. at shutdown'''
+		self.task.cancel()
+		if self.flushing and not self.flushing.done():
+			try:
+				await self.flushing
+			except Exception:
+				# Merged back, so flushed again below
+				pass
+		await self.flush()
+
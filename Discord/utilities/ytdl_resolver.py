@@ -0,0 +1,124 @@
+
+import asyncio
+import collections
+import re
+import threading
+import time
+import urllib.parse
+
+import youtube_dl
+
+class YTDLResolver:
+	
+	'''
+	youtube_dl metadata resolver
+	YoutubeDL instances are long-lived, one per option set per worker thread, as they aren't thread-safe
+	Results are cached by normalized query or URL, until their stream URLs expire, and concurrent identical lookups are coalesced
+	Cached info is shared, so shouldn't be mutated
+	'''
+	
+	# Query parameters that don't change what's resolved
+	ignored_parameters = {"feature", "si", "utm_source", "utm_medium", "utm_campaign"}
+	# Margin before stream URL expiry, so a stream started from cached info doesn't expire partway
+	expiry_margin = 600.0  # seconds
+	
+	def __init__(self, loop, executor, *, ttl = 3600.0, max_entries = 1024):
+		self.loop = loop
+		self.executor = executor  # Bounded executor for youtube_dl
+		self.ttl = ttl  # seconds
+		self.max_entries = max_entries
+		self.local = threading.local()
+		# (options key, normalized query): (expiry, info), least recently used first
+		self.cache = collections.OrderedDict()
+		# (options key, normalized query): task
+		self.pending = {}
+		self.hits = 0
+		self.misses = 0
+		self.coalesced = 0
+	
+	@staticmethod
+	def options_key(options):
+		return repr(sorted(options.items()))
+	
+	@classmethod
+	def normalize(cls, query):
+		query = query.strip().strip("<>")
+		if not re.match(r"https?://", query, re.IGNORECASE):
+			return ' '.join(query.split()).casefold()
+		url = urllib.parse.urlsplit(query)
+		netloc = url.netloc.lower()
+		if netloc.startswith(("www.", "m.")):
+			netloc = netloc.split('.', 1)[1]
+		path = url.path
+		parameters = [(name, value) for name, value in urllib.parse.parse_qsl(url.query)
+						if name not in cls.ignored_parameters]
+		if netloc == "youtu.be":
+			netloc, path = "youtube.com", "/watch"
+			parameters.append(("v", url.path.lstrip('/')))
+		return urllib.parse.urlunsplit(("https", netloc, path, urllib.parse.urlencode(sorted(parameters)), ""))
+	
+	def expiry(self, info):
+		'''Expiry time for cached info, before the expiry of any stream URL'''
+		expiry = time.time() + self.ttl
+		if "entries" in info:
+			info = next(iter(info["entries"] or ()), None) or {}
+		expire = urllib.parse.parse_qs(urllib.parse.urlsplit(info.get("url", "")).query).get("expire")
+		if expire and expire[0].isdigit():
+			expiry = min(expiry, int(expire[0]) - self.expiry_margin)
+		return expiry
+	
+	def ydl(self, options):
+		'''YoutubeDL instance for the current worker thread'''
+		if not hasattr(self.local, "instances"):
+			self.local.instances = {}
+		key = self.options_key(options)
+		if key not in self.local.instances:
+			self.local.instances[key] = youtube_dl.YoutubeDL(options)
+		return self.local.instances[key]
+	
+	def extract(self, options, query):
+		return self.ydl(options).extract_info(query, download = False)
+	
+	def extract_and_download(self, options, url):
+		ydl = self.ydl(options)
+		info = ydl.extract_info(url, download = True)
+		return ydl.prepare_filename(info)
+	
+	async def extract_info(self, query, options, *, timeout = None):
+		'''Info for a query or URL, as from YoutubeDL.extract_info without downloading'''
+		key = (self.options_key(options), self.normalize(query))
+		cached = self.cache.get(key)
+		if cached and cached[0] > time.time():
+			self.hits += 1
+			self.cache.move_to_end(key)
+			return cached[1]
+		if key in self.pending:
+			self.coalesced += 1
+		else:
+			self.misses += 1
+			self.pending[key] = self.loop.create_task(self.resolve(key, query, options, timeout))
+		# Shielded so a cancelled waiter doesn't cancel the lookup for the others
+		return await asyncio.shield(self.pending[key])
+	
+	async def resolve(self, key, query, options, timeout):
+		try:
+			info = await self.executor.run(self.extract, options, query, timeout = timeout)
+		finally:
+			del self.pending[key]
+		self.cache[key] = (self.expiry(info), info)
+		while len(self.cache) > self.max_entries:
+			self.cache.popitem(last = False)
+		return info
+	
+	async def download(self, url, options, *, timeout = 600):
+		'''Download with youtube_dl, returning the filename'''
+		return await self.executor.run(self.extract_and_download, options, url, timeout = timeout)
+	
+	def render(self):
+		'''Render in the Prometheus text exposition format'''
+		return '\n'.join(("# HELP harmonbot_ytdl_lookups_total youtube_dl metadata lookups by result",
+							"# TYPE harmonbot_ytdl_lookups_total counter",
+							f'harmonbot_ytdl_lookups_total{{result="hit"}} {self.hits}',
+							f'harmonbot_ytdl_lookups_total{{result="miss"}} {self.misses}',
+							f'harmonbot_ytdl_lookups_total{{result="coalesced"}} {self.coalesced}')) + '\n'
+
@@ -6,7 +6,6 @@ import bisect
 import datetime
 import json
 import logging
-import logging.handlers
 import os
 import random
 import re
@@ -23,6 +22,7 @@ import unicodedata2 as unicodedata
 sys.path.insert(0, "..")
 from units.games import eightball
 from units.location import get_geocode_data, get_timezone_data, UnitOutputError
+from units import queued_logging
 sys.path.pop(0)
 
 class TwitchClient(pydle.Client):
@@ -32,9 +32,8 @@ class TwitchClient(pydle.Client):
 		# Pydle logger
 		pydle_logger = logging.getLogger("pydle")
 		pydle_logger.setLevel(logging.DEBUG)
-		pydle_logger_handler = logging.FileHandler(filename = "data/logs/pydle.log", 
-													encoding = "UTF-8", mode = 'a')
-		pydle_logger_handler.setFormatter(logging.Formatter("%(asctime)s: %(message)s"))
+		pydle_logger_handler = queued_logging.file_handler("data/logs/pydle.log", 
+															formatter = logging.Formatter("%(asctime)s: %(message)s"))
 		pydle_logger.addHandler(pydle_logger_handler)
 		# Initialize
 		super().__init__(nickname)
@@ -75,10 +74,9 @@ class TwitchClient(pydle.Client):
 		console_handler = logging.StreamHandler(sys.stdout)
 		console_handler.setLevel(logging.ERROR)
 		console_handler.setFormatter(logging.Formatter("%(asctime)s: %(message)s"))
-		file_handler = logging.handlers.TimedRotatingFileHandler(
-			filename = "data/logs/client/client.log", when = "midnight", 
-			backupCount = 3650000, encoding = "UTF-8")
-		file_handler.setFormatter(logging.Formatter("%(asctime)s:%(levelname)s:%(name)s: %(message)s"))
+		file_handler = queued_logging.file_handler(
+			"data/logs/client/client.log", when = "midnight", compress = True, 
+			formatter = logging.Formatter("%(asctime)s:%(levelname)s:%(name)s: %(message)s"))
 		self.logger.addHandler(console_handler)
 		self.logger.addHandler(file_handler)
 		# Request capabilities
@@ -90,9 +88,8 @@ class TwitchClient(pydle.Client):
 			await self.join('#' + channel)
 			channel_logger = logging.getLogger('#' + channel)
 			channel_logger.setLevel(logging.DEBUG)
-			channel_logger_handler = logging.FileHandler(filename = f"data/logs/channels/{channel}.log", 
-															encoding = "UTF-8", mode = 'a')
-			channel_logger_handler.setFormatter(logging.Formatter("%(asctime)s: %(message)s"))
+			channel_logger_handler = queued_logging.file_handler(f"data/logs/channels/{channel}.log", 
+																	formatter = logging.Formatter("%(asctime)s: %(message)s"))
 			channel_logger.addHandler(channel_logger_handler)
 		# Console output
 		print(f"Started up Twitch Harmonbot | Connected to {' | '.join('#' + channel for channel in self.CHANNELS)}")
@@ -0,0 +1,135 @@
+
+import atexit
+import gzip
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import threading
+
+class BatchedStreamMixin:
+	
+	'''Defers flushing the stream until the end of a batch of writes'''
+	
+	batching = False
+	
+	def flush(self):
+		if not self.batching:
+			super().flush()
+
+class BatchedFileHandler(BatchedStreamMixin, logging.FileHandler):
+	pass
+
+class BatchedTimedRotatingFileHandler(BatchedStreamMixin, logging.handlers.TimedRotatingFileHandler):
+	pass
+
+def gzip_namer(name):
+	return name + ".gz"
+
+def gzip_rotator(source, destination):
+	with open(source, "rb") as source_file, gzip.open(destination, "wb") as destination_file:
+		shutil.copyfileobj(source_file, destination_file)
+	os.remove(source)
+
+class LogWriter(threading.Thread):
+	
+	'''
+	Background log writer
+	Drains queued records in batches and writes them with their target handlers
+	'''
+	
+	def __init__(self, *, batch_size = 1024):
+		super().__init__(name = "LogWriter", daemon = True)
+		self.batch_size = batch_size
+		self.queue = queue.SimpleQueue()
+		self.stopped = threading.Event()
+	
+	def put(self, target, record):
+		self.queue.put((target, record))
+	
+	def run(self):
+		while True:
+			batch = [self.queue.get()]
+			try:
+				while len(batch) < self.batch_size:
+					batch.append(self.queue.get_nowait())
+			except queue.Empty:
+				pass
+			targets = set()
+			for target, record in batch:
+				if target is None:
+					self.flush(targets)
+					self.stopped.set()
+					return
+				if target not in targets:
+					target.batching = True
+					targets.add(target)
+				target.handle(record)
+			self.flush(targets)
+	
+	def flush(self, targets):
+		for target in targets:
+			target.batching = False
+			target.flush()
+	
+	def stop(self, timeout = 5.0):
+		'''Write the records queued so far and stop'''
+		if self.is_alive():
+			self.queue.put((None, None))
+			self.stopped.wait(timeout)
+			self.join(timeout)
+
+writer = LogWriter()
+
+class QueuedHandler(logging.Handler):
+	
+	'''
+	Handler that hands records off to the background log writer
+	Messages are formatted by the writer thread, not the caller
+	'''
+	
+	def __init__(self, target):
+		super().__init__()
+		self.target = target
+		if writer.ident is None:
+			writer.start()
+	
+	def setFormatter(self, formatter):
+		self.target.setFormatter(formatter)
+	
+	def emit(self, record):
+		try:
+			if record.exc_info:
+				# Tracebacks are formatted immediately, as their frames may not outlive the caller
+				record.exc_text = logging.Formatter().formatException(record.exc_info)
+				record.exc_info = None
+			writer.put(self.target, record)
+		except Exception:
+			self.handleError(record)
+	
+	def close(self):
+		super().close()
+		self.target.close()
+
+def file_handler(filename, *, formatter = None, when = None, compress = False, encoding = "UTF-8"):
+	'''
+	Create a queued file handler
+	If when is specified, the file is rotated at that interval, optionally gzip compressing the rotated files
+	'''
+	if when:
+		target = BatchedTimedRotatingFileHandler(filename = filename, when = when,
+													backupCount = 3650000, encoding = encoding)
+		if compress:
+			target.namer = gzip_namer
+			target.rotator = gzip_rotator
+	else:
+		target = BatchedFileHandler(filename = filename, encoding = encoding, mode = 'a')
+	handler = QueuedHandler(target)
+	if formatter:
+		handler.setFormatter(formatter)
+	return handler
+
+# Processes ending with os._exit must call writer.stop themselves
+atexit.register(writer.stop)
+